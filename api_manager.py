@@ -1,9 +1,11 @@
 # File: api_manager.py
 # Purpose: Handles real-time stock & news data requests asynchronously
 
-import aiohttp
 import asyncio
 
+from src.utils.http_session import create_session
+from src.utils.rate_limiter import TokenBucket
+
 # Finnhub & Alpha Vantage API Keys (Replace with your actual API keys)
 FINNHUB_API_KEY = "your_finnhub_api_key"
 ALPHA_VANTAGE_API_KEY = "your_alpha_vantage_api_key"
@@ -15,8 +17,27 @@ ALPHA_VANTAGE_RATE_LIMIT = 75  # 75 requests per minute
 
 class APIManager:
     def __init__(self):
-        self.finnhub_semaphore = asyncio.Semaphore(FINNHUB_RATE_LIMIT)
-        self.alpha_vantage_semaphore = asyncio.Semaphore(ALPHA_VANTAGE_RATE_LIMIT)
+        self.finnhub_limiter = TokenBucket.per_minute(FINNHUB_RATE_LIMIT)
+        self.alpha_vantage_limiter = TokenBucket.per_minute(ALPHA_VANTAGE_RATE_LIMIT)
+        self.session = None  # Shared pooled session, created on first request
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        """Returns the shared pooled session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            self.session = create_session()
+        return self.session
+
+    async def close(self):
+        """Closes the pooled session if it's open."""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
 
     async def fetch(self, session, url, headers=None):
         """Handles API requests with rate limiting"""
@@ -25,30 +46,28 @@ class APIManager:
 
     async def get_stock_data(self, symbol):
         """Fetches stock price data from Finnhub"""
-        async with self.finnhub_semaphore:
-            url = (
-                f"https://finnhub.io/api/v1/quote?symbol={symbol}"
-                f"&token={FINNHUB_API_KEY}"
-            )
-            async with aiohttp.ClientSession() as session:
-                return await self.fetch(session, url)
+        await self.finnhub_limiter.acquire()
+        url = (
+            f"https://finnhub.io/api/v1/quote?symbol={symbol}"
+            f"&token={FINNHUB_API_KEY}"
+        )
+        return await self.fetch(self._get_session(), url)
 
     async def get_news_sentiment(self, symbol):
         """Fetches stock-related news sentiment from Alpha Vantage"""
-        async with self.alpha_vantage_semaphore:
-            url = (
-                f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT"
-                f"&symbol={symbol}&apikey={ALPHA_VANTAGE_API_KEY}"
-            )
-            async with aiohttp.ClientSession() as session:
-                return await self.fetch(session, url)
+        await self.alpha_vantage_limiter.acquire()
+        url = (
+            f"https://www.alphavantage.co/query?function=NEWS_SENTIMENT"
+            f"&symbol={symbol}&apikey={ALPHA_VANTAGE_API_KEY}"
+        )
+        return await self.fetch(self._get_session(), url)
 
 
 async def main():
     """Example usage of APIManager"""
-    api_manager = APIManager()
-    stock_data = await api_manager.get_stock_data("AAPL")
-    news_sentiment = await api_manager.get_news_sentiment("AAPL")
+    async with APIManager() as api_manager:
+        stock_data = await api_manager.get_stock_data("AAPL")
+        news_sentiment = await api_manager.get_news_sentiment("AAPL")
 
     print("Stock Data:", stock_data)
     print("News Sentiment:", news_sentiment)
@@ -1,7 +1,7 @@
+import asyncio
 import os
 import requests
 from dotenv import load_dotenv
-import time
 
 load_dotenv()
 
@@ -20,10 +20,12 @@ class AlertManager:
         response = requests.post(url, json=payload)
         return response.json()
 
-    def monitor_alerts(self):
+    async def monitor_alerts(self, interval=60):
         """Mock monitoring function for alerts (Replace with actual alert logic)"""
         print("Monitoring alerts...")
         while True:
             # Example: Check database or API for alerts
-            time.sleep(60)  # Placeholder: Replace with actual monitoring logic
+            # Placeholder: Replace with actual monitoring logic. Yields to the
+            # event loop so scheduled scans keep running
+            await asyncio.sleep(interval)
 
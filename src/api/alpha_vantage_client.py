@@ -1,59 +1,270 @@
+import asyncio
+import logging
 import os
-import requests
 from dotenv import load_dotenv
 
+from src.utils.error_handling import ClientError, RateLimitError, parse_retry_after
+from src.utils.http_session import (
+    DEFAULT_LIMIT_PER_HOST,
+    DEFAULT_TIMEOUT,
+    create_session,
+)
+from src.utils.rate_limiter import TokenBucket
+from src.utils.resilience import ResiliencePolicy
+from src.utils.stale_while_revalidate import (
+    stale_while_revalidate,
+    with_age,
+    with_staleness,
+)
+
 load_dotenv()
 
+ALPHA_VANTAGE_RATE_LIMIT = 75  # Requests per minute
+NEWS_SWEEP_LIMIT = 1000  # Max feed items Alpha Vantage returns per request
+# Symbols with fewer sweep items than this get their own single-ticker request.
+# Most of a 50-500 name universe only has a handful of recent articles, so
+# any coverage counts; only symbols the sweep missed entirely are fetched
+MIN_SWEEP_ITEMS = 1
+# Cached news is refreshed in the background after the soft TTL and served
+# while Alpha Vantage is failing until the hard TTL (seconds)
+NEWS_SOFT_TTL, NEWS_HARD_TTL = 5 * 60, 30 * 60
+
 
 class AlphaVantageClient:
-    def __init__(self):
-        self.api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
-        self.base_url = "https://www.alphavantage.co/query"
+    def __init__(
+        self,
+        api_key=None,
+        rate_limiter=None,
+        timeout=DEFAULT_TIMEOUT,
+        base_url="https://www.alphavantage.co/query",
+        sweep_limit=NEWS_SWEEP_LIMIT,
+        min_sweep_items=MIN_SWEEP_ITEMS,
+        cache=None,
+        resilience=None,
+    ):
+        self.api_key = api_key or os.getenv("ALPHA_VANTAGE_API_KEY")
+        self.base_url = base_url
+        self.timeout = timeout
+        self.sweep_limit = sweep_limit
+        self.min_sweep_items = min_sweep_items
+        self.cache = cache  # Optional TieredCache shared across processes
+        self.session = None  # Created lazily inside the running event loop
+        self.rate_limiter = rate_limiter or TokenBucket.per_minute(
+            ALPHA_VANTAGE_RATE_LIMIT
+        )
+        # Retries with jittered backoff and a circuit breaker per function
+        self.resilience = resilience or ResiliencePolicy()
+        self._fetch_slots = None  # (loop, Semaphore), created inside the loop
+        self.logger = logging.getLogger(__name__)
 
         if not self.api_key:
             raise ValueError("Missing ALPHA_VANTAGE_API_KEY in .env file!")
 
-    def get_financial_news(self, tickers="AAPL,GOOGL,MSFT"):
-        """Fetches financial news headlines for given stock tickers."""
-        params = {
-            "function": "NEWS_SENTIMENT",
-            "tickers": tickers,
-            "apikey": self.api_key,
-        }
-
-        response = requests.get(self.base_url, params=params)
-        if response.status_code != 200:
-            raise Exception(f"Alpha Vantage API Error: {response.text}")
-
-        return response.json()
-
-    def get_news_sentiment(self, stock_list):
-        """Fetches news sentiment for multiple stock symbols from Alpha Vantage."""
-        news_sentiment_data = {}
-
-        for symbol in stock_list:
-            params = {
-                "function": "NEWS_SENTIMENT",
-                "tickers": symbol,
-                "apikey": self.api_key,
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        """Returns the shared pooled session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            self.session = create_session(timeout=self.timeout)
+        return self.session
+
+    @property
+    def fetch_slots(self):
+        """
+        Bounds concurrent single-ticker fallbacks to the connection pool size.
+        They wait here rather than in the pool, where queueing would count
+        against each request's timeout. One semaphore per event loop, since a
+        semaphore can only be used on the loop it was created for.
+        """
+        loop = asyncio.get_running_loop()
+        if self._fetch_slots is None or self._fetch_slots[0] is not loop:
+            self._fetch_slots = (loop, asyncio.Semaphore(DEFAULT_LIMIT_PER_HOST))
+        return self._fetch_slots[1]
+
+    async def close(self):
+        """Closes the pooled session if it's open."""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+
+    async def _get_json(self, params):
+        await self.rate_limiter.acquire()
+        session = self._get_session()
+        async with session.get(
+            self.base_url, params={**params, "apikey": self.api_key}
+        ) as response:
+            if response.status == 429:
+                raise RateLimitError(
+                    "Alpha Vantage rate limit hit",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                )
+            if 400 <= response.status < 500:
+                # Bad key or request: not retried, not counted against the breaker
+                raise ClientError(
+                    f"Alpha Vantage API Error: {await response.text()}",
+                    status=response.status,
+                )
+            if response.status != 200:
+                raise Exception(f"Alpha Vantage API Error: {await response.text()}")
+            return await response.json(content_type=None)
+
+    async def _query(self, params):
+        """Runs one rate-limited Alpha Vantage query and returns the JSON body."""
+        data = await self.resilience.call(
+            f"alpha_vantage/{params['function']}", self._get_json, params
+        )
+
+        if "feed" not in data:
+            # Quota and usage notices come back as 200s without a feed
+            self.logger.warning(f"Alpha Vantage returned no feed: {data}")
+        return data
+
+    async def get_financial_news(self, tickers="AAPL,GOOGL,MSFT"):
+        """Fetches financial news headlines mentioning all of the given tickers."""
+        return await self._query({"function": "NEWS_SENTIMENT", "tickers": tickers})
+
+    async def _symbol_feed(self, symbol):
+        data = await self._query({"function": "NEWS_SENTIMENT", "tickers": symbol})
+        return data.get("feed", [])
+
+    async def _bounded_symbol_news(self, symbol):
+        async with self.fetch_slots:
+            return await self.get_symbol_news(symbol)
+
+    @stale_while_revalidate(NEWS_SOFT_TTL, NEWS_HARD_TTL)
+    async def get_symbol_news(self, symbol):
+        """Fetches the news feed for a single stock symbol."""
+        if self.cache:
+            cached = await self.cache.get_with_age("news", symbol)
+            if cached is not None:
+                # Ages from the original fetch, possibly in another process
+                return with_age(*cached)
+
+        feed = await self._symbol_feed(symbol)
+        if self.cache:
+            self.cache.set_deferred("news", symbol, feed)
+        return feed
+
+    @staticmethod
+    def fan_out_feed(feed, news_by_symbol):
+        """Appends each feed item to every tracked symbol in its ticker_sentiment."""
+        for item in feed:
+            for ticker in item.get("ticker_sentiment", []):
+                items = news_by_symbol.get(ticker.get("ticker"))
+                if items is not None:
+                    items.append(item)
+        return news_by_symbol
+
+    async def sweep_news(self, stock_list):
+        """
+        Answers what one market-wide request can: symbols with cached news
+        come from the cache, and for the rest the latest feed is fanned out
+        to every tracked symbol each article tags. Returns ``{symbol: [news]}``
+        for every symbol and the set of symbols the sweep covered with fewer
+        than ``min_sweep_items`` articles (by default, only symbols it missed
+        entirely), which still need a ``get_symbol_news`` request.
+        """
+        requested = list(stock_list)
+        cached = {}
+        if self.cache:
+            for symbol, (news, age) in (
+                await self.cache.mget_with_age("news", requested)
+            ).items():
+                # As stale as get_symbol_news would report it
+                cached[symbol] = with_staleness(news, max(0.0, age - NEWS_SOFT_TTL))
+        stock_list = [symbol for symbol in requested if symbol not in cached]
+        news_sentiment_data = {symbol: [] for symbol in stock_list}
+        if not stock_list:
+            return cached, set()
+
+        rate_limited = False
+        try:
+            sweep = await self._query(
+                {
+                    "function": "NEWS_SENTIMENT",
+                    "sort": "LATEST",
+                    "limit": self.sweep_limit,
+                }
+            )
+            self.fan_out_feed(sweep.get("feed", []), news_sentiment_data)
+        except RateLimitError as e:
+            # Single-ticker requests would only pile more 429s on the quota
+            rate_limited = True
+            self.logger.warning(
+                f"News sweep rate limited ({e}); skipping per-symbol requests."
+            )
+        except Exception as e:
+            self.logger.warning(f"Market-wide news sweep failed: {e}")
+
+        swept = [
+            symbol
+            for symbol in stock_list
+            if len(news_sentiment_data[symbol]) >= self.min_sweep_items
+        ]
+        missing = (
+            set()
+            if rate_limited
+            else {
+                symbol
+                for symbol in stock_list
+                if len(news_sentiment_data[symbol]) < self.min_sweep_items
             }
+        )
+        self.logger.info(
+            f"News sweep covered {len(swept)} of {len(stock_list)} symbols; "
+            f"{len(missing)} need their own request."
+        )
+
+        if self.cache and swept:
+            # get_symbol_news caches its own results; failed symbols stay
+            # uncached so the next scan retries them
+            await self.cache.mset(
+                "news", {symbol: news_sentiment_data[symbol] for symbol in swept}
+            )
+        news_sentiment_data.update(cached)
+        return news_sentiment_data, missing
 
-            response = requests.get(self.base_url, params=params)
-            if response.status_code == 200:
-                data = response.json()
-                news_sentiment_data[symbol] = data.get("feed", [])
-            else:
-                news_sentiment_data[symbol] = []  # Handle API failures gracefully
+    async def get_news_sentiment(self, stock_list):
+        """
+        Fetches news sentiment for multiple stock symbols from Alpha Vantage.
 
-        return news_sentiment_data
+        ``sweep_news`` answers most symbols with one market-wide request. The
+        symbols it leaves fall back to single-ticker requests, which run
+        concurrently under the rate limiter through ``get_symbol_news``, so
+        each symbol is served stale on its own while Alpha Vantage is failing.
+        A symbol whose request fails keeps its sweep articles (possibly none)
+        for this call only; nothing is cached for it.
+        """
+        requested = list(stock_list)
+        news_sentiment_data, missing = await self.sweep_news(requested)
+        missing = [symbol for symbol in requested if symbol in missing]
+
+        results = await asyncio.gather(
+            *(self._bounded_symbol_news(symbol) for symbol in missing),
+            return_exceptions=True,
+        )
+        for symbol, result in zip(missing, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Error fetching news for {symbol}: {result}")
+                continue  # Handle API failures gracefully
+            news_sentiment_data[symbol] = result
+        return {symbol: news_sentiment_data[symbol] for symbol in requested}
 
 
 # Example usage
 if __name__ == "__main__":
-    av_client = AlphaVantageClient()
-    news = av_client.get_financial_news()
-    print(news)
 
-    sentiment = av_client.get_news_sentiment(["AAPL", "TSLA"])
-    print(sentiment)
+    async def test():
+        async with AlphaVantageClient() as av_client:
+            news = await av_client.get_financial_news()
+            print(news)
+
+            sentiment = await av_client.get_news_sentiment(["AAPL", "TSLA"])
+            print(sentiment)
 
+    asyncio.run(test())
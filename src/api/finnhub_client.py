@@ -1,39 +1,129 @@
-import aiohttp
+import datetime
 import os
 import finnhub
 from dotenv import load_dotenv
 
+from src.utils.error_handling import RateLimitError, parse_retry_after
+from src.utils.http_session import (
+    DEFAULT_LIMIT_PER_HOST,
+    DEFAULT_POOL_LIMIT,
+    DEFAULT_TIMEOUT,
+    create_session,
+)
+from src.utils.rate_limiter import TokenBucket
+from src.utils.resilience import ResiliencePolicy
+from src.utils.stale_while_revalidate import stale_while_revalidate
+
 load_dotenv()
 
+FINNHUB_RATE_LIMIT = 150  # Requests per minute
+# Seconds before a cached response is refreshed in the background (soft) and
+# the longest it may still be served while the provider is failing (hard)
+QUOTE_SOFT_TTL, QUOTE_HARD_TTL = 5, 60
+NEWS_SOFT_TTL, NEWS_HARD_TTL = 5 * 60, 60 * 60
+NEWS_LOOKBACK_DAYS = 7  # Matches the news scorer's time decay window
+
 
 class FinnhubClient:
-    def __init__(self, api_key=None):
+    def __init__(
+        self,
+        api_key=None,
+        timeout=DEFAULT_TIMEOUT,
+        pool_limit=DEFAULT_POOL_LIMIT,
+        limit_per_host=DEFAULT_LIMIT_PER_HOST,
+        base_url="https://finnhub.io/api/v1",
+        rate_limiter=None,
+        resilience=None,
+    ):
         self.api_key = api_key or os.getenv("FINNHUB_API_KEY")
         if not self.api_key:
             raise ValueError("Missing Finnhub API key! Add it to .env")
 
         self.client = finnhub.Client(api_key=self.api_key)
+        self.base_url = base_url
+        self.timeout = timeout
+        self.pool_limit = pool_limit
+        self.limit_per_host = limit_per_host
+        self.session = None  # Created lazily inside the running event loop
+        self.rate_limiter = rate_limiter or TokenBucket.per_minute(FINNHUB_RATE_LIMIT)
+        # Retries with jittered backoff and a circuit breaker per endpoint
+        self.resilience = resilience or ResiliencePolicy()
+
+    async def __aenter__(self):
+        self._get_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def _get_session(self):
+        """Returns the shared pooled session, creating it on first use."""
+        if self.session is None or self.session.closed:
+            self.session = create_session(
+                timeout=self.timeout,
+                limit=self.pool_limit,
+                limit_per_host=self.limit_per_host,
+            )
+        return self.session
+
+    async def close(self):
+        """Closes the pooled session if it's open."""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
 
     def get_stock_quote(self, symbol):
         """Fetch latest stock quote"""
         return self.client.quote(symbol)
 
-    def get_news_sentiment(self, symbol):
-        """Fetch relevant news for sentiment analysis"""
-        return self.client.company_news(symbol, _from="2024-01-01", to="2024-12-31")
+    async def _get_json(self, endpoint, params):
+        """Runs one rate-limited GET; returns None for client errors like 403."""
+        await self.rate_limiter.acquire()
+        session = self._get_session()
+        async with session.get(
+            f"{self.base_url}{endpoint}", params={**params, "token": self.api_key}
+        ) as response:
+            if response.status == 429:
+                raise RateLimitError(
+                    f"Finnhub rate limit hit on {endpoint} for {params.get('symbol')}",
+                    retry_after=parse_retry_after(response.headers.get("Retry-After")),
+                )
+            if response.status >= 500:
+                # Raised so the request is retried and counts against the breaker
+                raise Exception(f"Finnhub API Error: {await response.text()}")
+            if response.status != 200:
+                return None  # Handle API failures gracefully
+            return await response.json()
+
+    async def _request(self, endpoint, params):
+        """GETs ``endpoint`` with retries, backoff and its circuit breaker."""
+        return await self.resilience.call(
+            f"finnhub{endpoint}", self._get_json, endpoint, params
+        )
+
+    @stale_while_revalidate(NEWS_SOFT_TTL, NEWS_HARD_TTL)
+    async def get_news_sentiment(self, symbol, days=NEWS_LOOKBACK_DAYS):
+        """Fetch relevant news for sentiment analysis from the last ``days`` days."""
+        today = datetime.date.today()
+        params = {
+            "symbol": symbol,
+            "from": (today - datetime.timedelta(days=days)).isoformat(),
+            "to": today.isoformat(),
+        }
+        news = await self._request("/company-news", params)
+        if news is None:
+            raise Exception(f"Finnhub API Error: no company news for {symbol}")
+        return news
 
+    @stale_while_revalidate(QUOTE_SOFT_TTL, QUOTE_HARD_TTL)
     async def get_stock_price(self, symbol):
         """Fetches stock price asynchronously using Finnhub API."""
-        async with aiohttp.ClientSession() as session:
-            url = f"https://finnhub.io/api/v1/quote?symbol={symbol}&token={self.api_key}"
-            async with session.get(url) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return {
-                        "symbol": symbol,
-                        "current_price": data.get("c"),
-                        "high_price": data.get("h"),
-                        "low_price": data.get("l"),
-                    }
-                return None  # Handle API failures gracefully
-
+        data = await self._request("/quote", {"symbol": symbol})
+        if data is None:
+            return None
+        return {
+            "symbol": symbol,
+            "current_price": data.get("c"),
+            "high_price": data.get("h"),
+            "low_price": data.get("l"),
+        }
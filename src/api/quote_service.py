@@ -0,0 +1,140 @@
+import asyncio
+import logging
+import time
+
+DEFAULT_QUOTE_FRESHNESS = 15  # Seconds a fetched quote can be served again
+
+
+class QuoteService:
+    """
+    Shares Finnhub quotes between every component that asks for them.
+
+    Concurrent requests for the same symbol are coalesced into a single
+    in-flight call (single-flight), and completed quotes are kept in a snapshot
+    that answers repeat requests for ``freshness`` seconds. It is a drop-in
+    replacement for ``FinnhubClient`` wherever ``get_stock_price`` is used;
+    other attributes are forwarded to the wrapped client. With a
+    ``TieredCache``, quotes are also shared with other processes and hosts.
+
+    Fetched quotes carry a ``timestamp`` (epoch seconds of the provider
+    call), so a quote another process cached counts as fresh only for what
+    is left of its ``freshness`` window.
+    """
+
+    def __init__(
+        self,
+        finnhub,
+        freshness=DEFAULT_QUOTE_FRESHNESS,
+        clock=time.monotonic,
+        cache=None,
+        wall_clock=time.time,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.finnhub = finnhub
+        self.cache = cache
+        self.freshness = freshness
+        self.clock = clock
+        self.wall_clock = wall_clock  # Stamps quotes shared with other processes
+        self.snapshot = {}  # symbol -> (fetched_at, quote)
+        self.in_flight = {}  # symbol -> task fetching it
+        self.requests = 0
+        self.snapshot_hits = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+
+    def __getattr__(self, name):
+        if name == "finnhub":  # Not set yet, e.g. while unpickling
+            raise AttributeError(name)
+        return getattr(self.finnhub, name)
+
+    @property
+    def fetched(self):
+        """Requests that actually reached the provider."""
+        return self.requests - self.snapshot_hits - self.coalesced - self.cache_hits
+
+    @property
+    def hit_rate(self):
+        """Share of requests answered without a new provider call."""
+        if not self.requests:
+            return 0.0
+        return (self.snapshot_hits + self.coalesced + self.cache_hits) / self.requests
+
+    def peek(self, symbol):
+        """Returns ``symbol``'s quote if the snapshot holds a fresh one, else None."""
+        entry = self.snapshot.get(symbol)
+        if entry and self.clock() - entry[0] < self.freshness:
+            self.requests += 1
+            self.snapshot_hits += 1
+            return entry[1]
+        return None
+
+    def _fetched_at(self, quote):
+        """Converts a quote's wall-clock ``timestamp`` to this service's clock."""
+        age = self.wall_clock() - quote.get("timestamp", self.wall_clock())
+        return self.clock() - max(0.0, age)
+
+    async def prefetch(self, symbols):
+        """Loads quotes other processes cached into the snapshot in one round trip."""
+        if self.cache is None:
+            return
+        now = self.clock()
+        wanted = [
+            symbol
+            for symbol in symbols
+            if symbol not in self.in_flight
+            and now - self.snapshot.get(symbol, (float("-inf"),))[0] >= self.freshness
+        ]
+        if wanted:
+            for symbol, quote in (await self.cache.mget("quote", wanted)).items():
+                self.snapshot[symbol] = (self._fetched_at(quote), quote)
+
+    async def _fetch(self, symbol):
+        try:
+            quote = await self.cache.get("quote", symbol) if self.cache else None
+            if quote:
+                self.cache_hits += 1
+            else:
+                quote = await self.finnhub.get_stock_price(symbol)
+                if quote:
+                    quote.setdefault("timestamp", self.wall_clock())
+                if quote and self.cache:
+                    self.cache.set_deferred("quote", symbol, quote)
+        finally:
+            del self.in_flight[symbol]
+        if quote:  # Failures aren't kept
+            self.snapshot[symbol] = (self._fetched_at(quote), quote)
+        return quote
+
+    async def get_stock_price(self, symbol):
+        """Returns ``symbol``'s quote from the snapshot, an in-flight or a new call."""
+        quote = self.peek(symbol)
+        if quote:
+            return quote
+
+        self.requests += 1
+        task = self.in_flight.get(symbol)
+        if task:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(self._fetch(symbol))
+            self.in_flight[symbol] = task
+        # Shielded so one caller's cancellation doesn't fail the other waiters
+        return await asyncio.shield(task)
+
+    def start_cycle(self):
+        """Logs dedup stats for the finished cycle and drops expired quotes."""
+        self.logger.info(
+            f"Quote service: {self.requests} requests, {self.fetched} fetched, "
+            f"{self.coalesced} coalesced, {self.snapshot_hits} from snapshot, "
+            f"{self.cache_hits} from cache ({self.hit_rate:.0%} deduplicated)."
+        )
+        now = self.clock()
+        self.snapshot = {
+            symbol: entry
+            for symbol, entry in self.snapshot.items()
+            if now - entry[0] < self.freshness
+        }
+        self.requests = self.snapshot_hits = self.coalesced = self.cache_hits = 0
+
+    async def close(self):
+        await self.finnhub.close()
@@ -0,0 +1,297 @@
+import logging
+
+import numpy as np
+
+from src.sentiment.batch_scorer import extract_headline
+from src.sentiment.vectorized_scoring import NewsBatch, VectorizedNewsScorer
+from src.universe_snapshot import SignalRules, UniverseSnapshot
+from src.volatility_forecasting import wilder_atr_series
+
+DEFAULT_MAX_HOLDING = 20  # Bars a trade may stay open before exiting at the close
+DEFAULT_NOTIONAL = 10_000  # Position value per trade without a RiskManagement
+DEFAULT_ACCOUNT_BALANCE = 100_000
+DEFAULT_ATR_WINDOW = 14
+DEFAULT_SYMBOL_CHUNK = 64  # Symbols simulated together; bounds temporary arrays
+
+
+def align_bars(bars_by_symbol, fields=("high", "low", "close")):
+    """
+    Aligns ``{symbol: {"time": ..., field: ...}}`` (e.g. ``BarArchive.load``)
+    into ``(symbols, bars)`` matrices on the union of bar times. Missing bars
+    are filled flat from the previous close; bars before a symbol's first one
+    stay NaN. Returns the times and ``{field: matrix}``.
+    """
+    times = np.unique(
+        np.concatenate([bars["time"] for bars in bars_by_symbol.values()])
+    )
+    matrices = {
+        field: np.full((len(bars_by_symbol), len(times)), np.nan) for field in fields
+    }
+    present = np.zeros((len(bars_by_symbol), len(times)), dtype=bool)
+    for row, bars in enumerate(bars_by_symbol.values()):
+        slots = np.searchsorted(times, bars["time"])
+        present[row, slots] = True
+        for field, matrix in matrices.items():
+            matrix[row, slots] = bars[field]
+
+    # Index of the latest real bar at or before each slot
+    latest = np.maximum.accumulate(np.where(present, np.arange(len(times)), 0), axis=1)
+    last_close = np.take_along_axis(matrices["close"], latest, axis=1)
+    for matrix in matrices.values():
+        matrix[~present] = last_close[~present]
+    return times, matrices
+
+
+def align_sentiment(times, symbols, news_by_symbol, cache, model_id, scorer=None):
+    """
+    Replays cached sentiment as the score each symbol had at each bar time,
+    a ``(symbols, bars)`` matrix for ``Backtester.run`` (rows follow
+    ``symbols``, e.g. the keys passed to ``align_bars``).
+
+    ``news_by_symbol`` holds dated news items and ``cache`` the SentimentCache
+    the live scorer filled under ``model_id``. A bar only sees news published
+    at or before it, scored the way ``VectorizedNewsScorer`` would have scored
+    a scan at that moment; bars without news get 0. Undated news and
+    headlines missing from the cache are skipped.
+    """
+    scorer = scorer or VectorizedNewsScorer()
+    times = np.asarray(times).astype("datetime64[us]")
+    if not len(times):
+        return np.zeros((len(symbols), 0))
+
+    dated = {
+        symbol: [
+            news
+            for news in news_by_symbol.get(symbol, ())
+            if news.get("date") and extract_headline(news)
+        ]
+        for symbol in symbols
+    }
+    headlines = {extract_headline(news) for items in dated.values() for news in items}
+    cached = cache.get_many(list(headlines), model_id)
+    scored = {
+        symbol: [news for news in items if extract_headline(news) in cached]
+        for symbol, items in dated.items()
+    }
+    skipped = sum(len(news_by_symbol.get(symbol, ())) for symbol in symbols) - sum(
+        len(items) for items in scored.values()
+    )
+    if skipped:
+        logging.getLogger(__name__).warning(
+            f"Skipped {skipped} news items without a date or a cached score."
+        )
+    batch = NewsBatch.from_news(
+        scored,
+        {
+            symbol: [cached[extract_headline(news)] for news in items]
+            for symbol, items in scored.items()
+        },
+        times[-1],
+    )
+
+    # Score every item as brand new; recency is applied per bar below
+    scores, keep = scorer.item_scores(batch, batch.timestamps)
+    rows, published, scores = (
+        batch.symbol_ids[keep],
+        batch.timestamps[keep],
+        scores[keep],
+    )
+
+    # An item scores for the bars in each whole day of its age with that day's
+    # recency: add it at the day's first bar, remove it after the last, then
+    # accumulate over the bars. Like the live scorer, it stays in the mean's
+    # count with zero weight once it is older than the decay window
+    sums = np.zeros((len(symbols), len(times) + 1))
+    counts = np.zeros_like(sums)
+    np.add.at(counts, (rows, np.searchsorted(times, published)), 1)
+    day = np.timedelta64(1, "D")
+    for age in range(scorer.time_decay_days):
+        recency = 1 - age / scorer.time_decay_days
+        first = np.searchsorted(times, published + age * day)
+        last = np.searchsorted(times, published + (age + 1) * day)
+        for bars, sign in ((first, 1), (last, -1)):
+            np.add.at(sums, (rows, bars), sign * scores * recency)
+
+    sums = np.cumsum(sums, axis=1)[:, :-1]
+    counts = np.cumsum(counts, axis=1)[:, :-1]
+    means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0.5)
+    return np.round(means, 2)
+
+
+class Backtester:
+    """
+    Replays bars and sentiment through ``SignalRules`` and, optionally,
+    ``RiskManagement`` stops and sizing, vectorized across symbols and time.
+
+    Bar ``t`` is treated as a quote: its close is the current price and its
+    high and low the day's range. A BUY signal enters at that close. The trade
+    then exits at the first later bar that touches the stop (checked first) or
+    the take-profit, or at the close after ``max_holding`` bars. Each symbol
+    holds one position at a time.
+
+    Rules and levels are evaluated for the whole ``(symbols, bars)`` grid at
+    once. Exits are found from ``(symbols, max_holding)`` windows, one pass per
+    round of trades (every symbol's next trade at once), never per bar.
+    With a ``RiskManagement`` the stop is ``close - ATR x multiplier`` and
+    shares come from its position sizing, capped at what ``account_balance``
+    buys; otherwise the signal's own stop is used with a fixed ``notional``
+    per trade.
+    """
+
+    def __init__(
+        self,
+        rules=None,
+        risk=None,
+        max_holding=DEFAULT_MAX_HOLDING,
+        notional=DEFAULT_NOTIONAL,
+        account_balance=DEFAULT_ACCOUNT_BALANCE,
+        atr_window=DEFAULT_ATR_WINDOW,
+        symbol_chunk=DEFAULT_SYMBOL_CHUNK,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.rules = rules or SignalRules()
+        self.risk = risk  # Optional RiskManagement for ATR stops and sizing
+        self.max_holding = max_holding
+        self.notional = notional
+        self.account_balance = account_balance
+        self.atr_window = atr_window
+        self.symbol_chunk = symbol_chunk
+
+    def _entries(self, high, low, close, sentiment):
+        """Returns the flat indices of BUY bars and their stops, targets and sizes."""
+        shape = close.shape
+        snapshot = UniverseSnapshot(
+            symbols=np.arange(shape[0]),
+            current=close,
+            high=high,
+            low=low,
+            sentiment=np.broadcast_to(sentiment, shape),
+            timestamps=None,
+            quote_staleness=np.broadcast_to(0.0, shape),
+            news_staleness=np.broadcast_to(0.0, shape),
+        )
+        mask = self.rules.buy_mask(snapshot)
+
+        atr = None
+        if self.risk:
+            atr = wilder_atr_series(high, low, close, self.atr_window)
+            mask &= atr > 0  # No ATR stop (or size) until ATR has warmed up
+
+        levels = self.rules.levels(snapshot, mask)
+        entry = levels["entry_low"]
+        if self.risk:
+            atr = atr[mask]
+            stop = self.risk.stop_losses(entry, atr)
+            shares = self.risk.position_sizes(
+                self.account_balance, atr, entry, self.rules.confidence(snapshot, mask)
+            )
+            # A tight stop must not size a position beyond the account itself
+            affordable = np.floor(self.account_balance / entry).astype(np.int64)
+            shares = np.minimum(shares, affordable)
+        else:
+            stop = levels["stop_loss"]
+            shares = self.notional / entry
+        return np.flatnonzero(mask), entry, stop, levels["take_profit"], shares
+
+    def _simulate(self, high, low, close, sentiment):
+        """Runs one chunk of symbols and returns its trades as arrays."""
+        symbols, bars = close.shape
+        signals, entry, stop, target, shares = self._entries(
+            high, low, close, sentiment
+        )
+        offsets = np.arange(1, self.max_holding + 1)
+        cursor = np.arange(symbols) * bars  # Next flat index each symbol may enter at
+        active = np.arange(symbols)
+        trades = []
+
+        while len(active) and len(signals):
+            # Each active symbol's next signal at or after its cursor
+            k = np.searchsorted(signals, cursor[active])
+            k_clipped = np.minimum(k, len(signals) - 1)
+            same_symbol = (k < len(signals)) & (signals[k_clipped] // bars == active)
+            active, k = active[same_symbol], k_clipped[same_symbol]
+            if not len(active):
+                break
+
+            t = signals[k] % bars
+            window = t[:, None] + offsets
+            inside = window < bars
+            window = np.minimum(window, bars - 1)
+            stopped = (low[active[:, None], window] <= stop[k, None]) & inside
+            took_profit = (high[active[:, None], window] >= target[k, None]) & inside
+            hit = stopped | took_profit
+            exited = hit.any(axis=1)
+            first = hit.argmax(axis=1)
+            rows = np.arange(len(active))
+
+            exit_t = np.where(
+                exited, t + 1 + first, np.minimum(t + self.max_holding, bars - 1)
+            )
+            exit_price = np.where(
+                stopped[rows, first],
+                stop[k],
+                np.where(exited, target[k], close[active, exit_t]),
+            )
+            trades.append((active, t, exit_t, entry[k], exit_price, shares[k]))
+            cursor[active] = active * bars + exit_t + 1
+
+        if not trades:
+            return [np.empty(0)] * 6
+        return [np.concatenate(column) for column in zip(*trades)]
+
+    def run(self, high, low, close, sentiment):
+        """
+        Backtests ``(symbols, bars)`` price matrices against sentiment scores,
+        either ``(symbols, bars)`` or ``(symbols, 1)`` for one score per
+        symbol. Returns the trades and summary statistics.
+        """
+        high, low, close = (np.asarray(a) for a in (high, low, close))
+        sentiment = np.broadcast_to(np.asarray(sentiment, dtype=float), close.shape)
+
+        columns = [[] for _ in range(6)]
+        for start in range(0, close.shape[0], self.symbol_chunk):
+            rows = slice(start, start + self.symbol_chunk)
+            chunk = self._simulate(high[rows], low[rows], close[rows], sentiment[rows])
+            chunk[0] = chunk[0] + start
+            for column, values in zip(columns, chunk):
+                column.append(values)
+        symbol, entry_bar, exit_bar, entry, exit_price, shares = (
+            np.concatenate(column) for column in columns
+        )
+
+        trades = {
+            "symbol": symbol.astype(np.int64),
+            "entry_bar": entry_bar.astype(np.int64),
+            "exit_bar": exit_bar.astype(np.int64),
+            "entry_price": entry,
+            "exit_price": exit_price,
+            "shares": shares,
+            "pnl": (exit_price - entry) * shares,
+        }
+        summary = self.summarize(trades, close.size)
+        self.logger.info(
+            f"Backtest of {close.shape[0]} symbols x {close.shape[1]} bars: "
+            f"{summary['trades']} trades, PnL {summary['pnl']:.2f}, "
+            f"hit rate {summary['hit_rate']:.1%}, "
+            f"max drawdown {summary['max_drawdown']:.2f}."
+        )
+        return trades, summary
+
+    @staticmethod
+    def summarize(trades, bar_symbols):
+        """PnL, hit rate and max drawdown of the equity curve in exit order."""
+        pnl = trades["pnl"]
+        equity = np.cumsum(pnl[np.argsort(trades["exit_bar"], kind="stable")])
+        peak = np.maximum.accumulate(np.concatenate(([0.0], equity)))[1:]
+        return {
+            "bar_symbols": bar_symbols,
+            "trades": len(pnl),
+            "pnl": float(pnl.sum()),
+            "hit_rate": float((pnl > 0).mean()) if len(pnl) else 0.0,
+            "average_return": (
+                float((trades["exit_price"] / trades["entry_price"] - 1).mean())
+                if len(pnl)
+                else 0.0
+            ),
+            "max_drawdown": float((peak - equity).max()) if len(pnl) else 0.0,
+        }
@@ -0,0 +1,292 @@
+import contextlib
+import fcntl
+import logging
+import os
+import shutil
+
+import numpy as np
+
+FIELDS = ("open", "high", "low", "close", "volume")
+DTYPES = {
+    "time": "datetime64[s]",
+    "open": np.float32,
+    "high": np.float32,
+    "low": np.float32,
+    "close": np.float32,
+    "volume": np.int64,
+}
+BASE = "base"  # Compacted partition data; appends land in delta-<n> beside it
+DELTA_PREFIX = "delta-"
+STAGING = "compacting"  # New base while compact() writes it
+REPLACED = "replaced"  # Old base while compact() swaps the new one in
+LOCK = ".lock"  # flock()ed by writers of the partition: appends and compactions
+LOAD_ATTEMPTS = 3  # Reads retried when a compaction swaps chunks underneath
+
+
+def to_seconds(value):
+    return np.datetime64(value, "s")
+
+
+def year_of(times):
+    return times.astype("datetime64[Y]").astype(int) + 1970
+
+
+def merge_chunks(chunks, fields):
+    """
+    Concatenates chunks into one time-sorted copy, keeping the last written
+    bar for each timestamp (chunks are ordered oldest write first).
+    """
+    merged = {
+        field: np.concatenate([chunk[field] for chunk in chunks])
+        for field in ("time", *fields)
+    }
+    order = np.argsort(merged["time"], kind="stable")
+    times = merged["time"][order]
+    keep = order[np.append(times[1:] != times[:-1], True)]
+    return {field: column[keep] for field, column in merged.items()}
+
+
+def identity(path):
+    """Identifies a chunk directory, so a replaced one is told apart; None if gone."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+class StaleChunkError(Exception):
+    """Raised when a chunk is replaced or removed while it is being read."""
+
+
+class Chunk(dict):
+    """
+    One chunk's columns, each memory-mapped on first access. Raises
+    StaleChunkError rather than mix columns from two versions of the chunk.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.identity = identity(path)
+
+    def __missing__(self, field):
+        try:
+            column = np.load(os.path.join(self.path, f"{field}.npy"), mmap_mode="r")
+        except FileNotFoundError as e:
+            raise StaleChunkError(self.path) from e
+        if identity(self.path) != self.identity:
+            raise StaleChunkError(self.path)
+        self[field] = column
+        return column
+
+
+class BarArchive:
+    """
+    Columnar on-disk OHLCV history, one ``.npy`` file per field.
+
+    Bars are partitioned by symbol and year under ``root/<symbol>/<year>/``.
+    Each partition has a time-sorted ``base`` chunk and, after appends, small
+    ``delta-<n>`` chunks. Reads memory-map the files, so ``load`` returns
+    NumPy views of the page cache: a range inside one compacted partition is
+    never copied, and only ranges spanning several chunks are concatenated.
+    ``compact`` folds deltas back into the base so reads stay zero-copy.
+
+    Other processes may append and compact the same archive: writers take
+    an exclusive ``flock`` on the partition's lock file, and every read
+    re-lists its partitions and only reuses memory maps of chunks that are
+    still the same directory on disk.
+    """
+
+    def __init__(self, root):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        self.chunks = {}  # Partition path -> its Chunks, base first
+
+    def _partition(self, symbol, year):
+        return os.path.join(self.root, symbol, str(year))
+
+    def symbols(self):
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(os.listdir(self.root))
+
+    def years(self, symbol):
+        path = os.path.join(self.root, symbol)
+        if not os.path.isdir(path):
+            return []
+        return sorted(int(year) for year in os.listdir(path))
+
+    def _open(self, partition):
+        """Returns the partition's chunks, base first, as lazy column mappings."""
+        entries = set(os.listdir(partition))
+        names = sorted(
+            (name for name in entries if name.startswith(DELTA_PREFIX)),
+            key=lambda name: int(name[len(DELTA_PREFIX) :]),
+        )
+        if BASE in entries:
+            names.insert(0, BASE)
+        elif REPLACED in entries:
+            # Mid-swap (or an interrupted compaction): the old base is intact
+            names.insert(0, REPLACED)
+
+        cached = {chunk.path: chunk for chunk in self.chunks.get(partition, ())}
+        chunks = []
+        for name in names:
+            path = os.path.join(partition, name)
+            chunk = cached.get(path)
+            if chunk is None or chunk.identity != identity(path):
+                chunk = Chunk(path)
+            chunks.append(chunk)
+        self.chunks[partition] = chunks
+        return chunks
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _locked(partition):
+        """Holds the partition's writer lock, across threads and processes."""
+        with open(os.path.join(partition, LOCK), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _recover(self, partition):
+        """
+        Finishes or rolls back a compaction that was interrupted in this
+        partition, so it again holds at most a base and its deltas. The deltas
+        are only removed once the new base is in place, so rolling back to
+        the old base never loses bars.
+        """
+        base = os.path.join(partition, BASE)
+        replaced = os.path.join(partition, REPLACED)
+        if os.path.isdir(replaced):
+            if os.path.isdir(base):
+                shutil.rmtree(replaced)  # The swap completed
+            else:
+                os.replace(replaced, base)  # Roll back to the old base
+            self.logger.warning(f"Recovered interrupted compaction in {partition}.")
+        shutil.rmtree(os.path.join(partition, STAGING), ignore_errors=True)
+
+    @staticmethod
+    def _write_chunk(path, columns):
+        os.makedirs(path)
+        for field, dtype in DTYPES.items():
+            np.save(os.path.join(path, f"{field}.npy"), columns[field].astype(dtype))
+
+    def append(self, symbol, bars):
+        """
+        Appends ``{"time": ..., "open": ..., ...}`` arrays of bars for one
+        symbol as a new delta chunk in each year they cover. Bars need not be
+        sorted; a bar whose time is already stored replaces it on compaction.
+        """
+        times = np.asarray(bars["time"], dtype=DTYPES["time"])
+        if not len(times):
+            return
+        order = np.argsort(times, kind="stable")
+        columns = {"time": times[order]}
+        for field in FIELDS:
+            columns[field] = np.asarray(bars[field])[order]
+
+        years = year_of(columns["time"])
+        for year in np.unique(years):
+            in_year = years == year
+            partition = self._partition(symbol, year)
+            os.makedirs(partition, exist_ok=True)
+            with self._locked(partition):
+                deltas = [
+                    int(name[len(DELTA_PREFIX) :])
+                    for name in os.listdir(partition)
+                    if name.startswith(DELTA_PREFIX)
+                ]
+                number = max(deltas, default=0) + 1
+                self._write_chunk(
+                    os.path.join(partition, f"{DELTA_PREFIX}{number}"),
+                    {field: column[in_year] for field, column in columns.items()},
+                )
+            self.chunks.pop(partition, None)
+
+    def compact(self, symbols=None):
+        """
+        Merges each partition's deltas into its base, keeping the last write
+        for duplicate timestamps. The new base is written beside the old one
+        and swapped in, so readers never see a half-written partition.
+        Returns the number of partitions compacted.
+        """
+        compacted = 0
+        for symbol in symbols or self.symbols():
+            for year in self.years(symbol):
+                partition = self._partition(symbol, year)
+                with self._locked(partition):
+                    compacted += self._compact_partition(partition)
+
+        self.logger.info(f"Compacted {compacted} partitions.")
+        return compacted
+
+    def _compact_partition(self, partition):
+        """Compacts one partition under its lock; returns 1 if it had deltas."""
+        self._recover(partition)
+        chunks = self._open(partition)
+        if not chunks or (
+            len(chunks) == 1 and os.path.isdir(os.path.join(partition, BASE))
+        ):
+            return 0
+
+        staging = os.path.join(partition, STAGING)
+        self._write_chunk(staging, merge_chunks(chunks, FIELDS))
+
+        self.chunks.pop(partition, None)
+        old = os.path.join(partition, REPLACED)
+        if os.path.isdir(os.path.join(partition, BASE)):
+            os.replace(os.path.join(partition, BASE), old)
+        os.replace(staging, os.path.join(partition, BASE))
+        shutil.rmtree(old, ignore_errors=True)
+        # Only the deltas folded into the new base: any others are still pending
+        for chunk in chunks:
+            if os.path.basename(chunk.path).startswith(DELTA_PREFIX):
+                shutil.rmtree(chunk.path)
+        return 1
+
+    def load_symbol(self, symbol, start, end, fields=FIELDS):
+        """
+        Returns ``{"time": ..., field: ...}`` for one symbol's bars in
+        ``[start, end)``. Views into the memory-mapped files when the range
+        falls in a single chunk; concatenated copies otherwise.
+        """
+        for attempt in range(LOAD_ATTEMPTS):
+            try:
+                return self._load_symbol(symbol, start, end, fields)
+            except StaleChunkError:
+                if attempt == LOAD_ATTEMPTS - 1:
+                    raise
+                # A compaction swapped chunks mid-read; re-list and read again
+                self.logger.debug(f"Chunks of {symbol} changed while loading.")
+
+    def _load_symbol(self, symbol, start, end, fields):
+        start, end = to_seconds(start), to_seconds(end)
+        first, last = year_of(start), year_of(end - np.timedelta64(1, "s"))
+        pieces = []
+        for year in self.years(symbol):
+            if not first <= year <= last:
+                continue
+            for chunk in self._open(self._partition(symbol, year)):
+                times = chunk["time"]
+                lo, hi = np.searchsorted(times, [start, end])
+                if hi > lo:
+                    pieces.append(
+                        {field: chunk[field][lo:hi] for field in ("time", *fields)}
+                    )
+
+        if len(pieces) == 1:
+            return pieces[0]
+        if not pieces:
+            return {field: np.empty(0, DTYPES[field]) for field in ("time", *fields)}
+        # Uncompacted deltas (or a multi-year range) need one merged copy
+        return merge_chunks(pieces, fields)
+
+    def load(self, symbols, start, end, fields=FIELDS):
+        """Returns ``{symbol: {"time": ..., field: ...}}`` of bars in [start, end)."""
+        return {
+            symbol: self.load_symbol(symbol, start, end, fields) for symbol in symbols
+        }
@@ -0,0 +1,82 @@
+"""Times batched and streaming Wilder ATR against a plain Python loop.
+
+Run with ``python -m src.benchmarks.atr``. Correctness is covered by
+``tests/test_atr.py``.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.volatility_forecasting import ATRTracker, wilder_atr
+
+
+def synthetic_bars(symbols, bars, seed=7):
+    """Builds reproducible ``(symbols, bars)`` high, low and close arrays."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (symbols, bars)), axis=1)
+    high = close + rng.uniform(0, 2, (symbols, bars))
+    low = close - rng.uniform(0, 2, (symbols, bars))
+    return high, low, close
+
+
+def reference_atr(high, low, close, window):
+    """Textbook per-bar Wilder ATR for one symbol, in plain Python."""
+    ranges = [high[0] - low[0]] + [
+        max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        for i in range(1, len(high))
+    ]
+    atr = sum(ranges[:window]) / window
+    for tr in ranges[window:]:
+        atr = (atr * (window - 1) + tr) / window
+    return atr
+
+
+def streamed(high, low, close, window):
+    tracker = ATRTracker(range(len(close)), window)
+    for bar in range(close.shape[1]):
+        tracker.update(high[:, bar], low[:, bar], close[:, bar])
+    return tracker.atr
+
+
+def benchmark(symbols, bars, window):
+    high, low, close = synthetic_bars(symbols, bars)
+
+    start = time.perf_counter()
+    for h, lo, c in zip(high, low, close):
+        reference_atr(h, lo, c, window)
+    reference_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    wilder_atr(high, low, close, window)
+    batched_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    streamed(high, low, close, window)
+    streaming_time = time.perf_counter() - start
+
+    tracker = ATRTracker.from_history(
+        range(symbols), high[:, :-1], low[:, :-1], close[:, :-1], window
+    )
+    start = time.perf_counter()
+    tracker.update(high[:, -1], low[:, -1], close[:, -1])
+    update_time = time.perf_counter() - start
+
+    print(
+        f"{symbols} symbols x {bars} bars, window {window}: "
+        f"reference {reference_time * 1e3:8.2f}ms | "
+        f"batched {batched_time * 1e3:7.2f}ms | "
+        f"streamed bar by bar {streaming_time * 1e3:7.2f}ms | "
+        f"one new bar {update_time * 1e6:7.1f}us"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--bars", type=int, default=256)
+    parser.add_argument("--window", type=int, default=14)
+    args = parser.parse_args()
+    for count in args.symbols:
+        benchmark(count, args.bars, args.window)
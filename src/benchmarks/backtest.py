@@ -0,0 +1,85 @@
+"""Measures Backtester throughput in bar-symbols per second on one core.
+
+Replays synthetic 1-minute bars (or a BarArchive range with ``--archive``)
+through the signal rules alone and with RiskManagement ATR stops and sizing.
+
+Run with ``python -m src.benchmarks.backtest``.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from src.backtesting import Backtester, align_bars
+from src.bar_archive import BarArchive
+from src.risk_management import RiskManagement
+
+RISK_CONFIG = {
+    "trading": {
+        "position_sizing": {"base_risk_per_trade": 0.02, "adaptive_risk": True},
+        "stop_loss_atr_multiplier": 2.0,
+    }
+}
+
+
+def synthetic_bars(symbols, bars, seed=7):
+    """Builds reproducible ``(symbols, bars)`` float32 high, low and close."""
+    rng = np.random.default_rng(seed)
+    close = (100 + np.cumsum(rng.normal(0, 0.05, (symbols, bars)), axis=1)).astype(
+        np.float32
+    )
+    return {
+        "high": close + rng.uniform(0, 0.1, (symbols, bars)).astype(np.float32),
+        "low": close - rng.uniform(0, 0.1, (symbols, bars)).astype(np.float32),
+        "close": close,
+    }
+
+
+def archive_bars(root, start, end):
+    archive = BarArchive(root)
+    _, matrices = align_bars(archive.load(archive.symbols(), start, end))
+    return matrices
+
+
+def benchmark(matrices, max_holding, seed=7):
+    symbols, bars = matrices["close"].shape
+    # Cached sentiment: one score per symbol per session-sized block of bars
+    rng = np.random.default_rng(seed)
+    blocks = rng.uniform(0, 60, (symbols, -(-bars // 390)))
+    sentiment = np.repeat(blocks, 390, axis=1)[:, :bars]
+
+    for name, risk in (
+        ("signal stops", None),
+        ("ATR stops", RiskManagement(RISK_CONFIG)),
+    ):
+        backtester = Backtester(risk=risk, max_holding=max_holding)
+        start = time.perf_counter()
+        _, summary = backtester.run(
+            matrices["high"], matrices["low"], matrices["close"], sentiment
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<12} {symbols} x {bars} bars: "
+            f"{summary['bar_symbols'] / elapsed / 1e6:6.1f}M bar-symbols/s "
+            f"({elapsed:.2f}s) | {summary['trades']} trades, "
+            f"PnL {summary['pnl']:,.0f}, hit rate {summary['hit_rate']:.1%}, "
+            f"max drawdown {summary['max_drawdown']:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=20 * 390)  # A month of minutes
+    parser.add_argument("--max-holding", type=int, default=30)
+    parser.add_argument("--archive", default=None, help="BarArchive root to replay")
+    parser.add_argument("--start", default="2024-01-01")
+    parser.add_argument("--end", default="2025-01-01")
+    args = parser.parse_args()
+
+    if args.archive:
+        matrices = archive_bars(args.archive, args.start, args.end)
+    else:
+        matrices = synthetic_bars(args.symbols, args.bars)
+    benchmark(matrices, args.max_holding)
@@ -0,0 +1,103 @@
+"""Times BarArchive writes, memory-mapped range loads, appends and compaction.
+
+Defaults to a year of 1-minute regular-session bars (252 days x 390 bars) for
+500 symbols, about 1.6GB on disk. Run with ``python -m src.benchmarks.bar_archive``.
+"""
+
+import argparse
+import tempfile
+import time
+
+import numpy as np
+
+from src.bar_archive import BarArchive
+
+SESSION_OPEN = np.timedelta64(14 * 60 + 30, "m")  # 09:30 New York in UTC
+
+
+def session_times(days, minutes, first_day="2024-01-02"):
+    """Returns 1-minute bar times for ``days`` weekdays of ``minutes`` bars each."""
+    dates = np.busday_offset(np.datetime64(first_day, "D"), np.arange(days), "forward")
+    offsets = SESSION_OPEN + np.arange(minutes).astype("timedelta64[m]")
+    return (dates[:, None] + offsets).ravel().astype("datetime64[s]")
+
+
+def synthetic_bars(times, rng):
+    close = (100 + np.cumsum(rng.normal(0, 0.05, len(times)))).astype(np.float32)
+    return {
+        "time": times,
+        "open": close,
+        "high": close + 0.02,
+        "low": close - 0.02,
+        "close": close,
+        "volume": rng.integers(100, 10_000, len(times)),
+    }
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def benchmark(root, symbol_count, days, minutes):
+    rng = np.random.default_rng(7)
+    archive = BarArchive(root)
+    symbols = [f"SYM{i}" for i in range(symbol_count)]
+    times = session_times(days + 1, minutes)
+    history, next_day = times[: days * minutes], times[days * minutes :]
+
+    start = time.perf_counter()
+    for symbol in symbols:
+        archive.append(symbol, synthetic_bars(history, rng))
+    _, compact_time = timed(archive.compact)
+    write_time = time.perf_counter() - start
+    bars = symbol_count * len(history)
+    print(
+        f"wrote {bars:,} bars in {write_time:.1f}s "
+        f"({bars / write_time / 1e6:.1f}M bars/s, compaction {compact_time:.2f}s)"
+    )
+
+    archive = BarArchive(root)  # Fresh instances: nothing memory-mapped yet
+    _, close_time = timed(archive.load, symbols, history[0], next_day[0], ("close",))
+    print(f"load full year, closes only: {close_time * 1e3:.1f}ms")
+
+    archive = BarArchive(root)
+    year, load_time = timed(archive.load, symbols, history[0], next_day[0])
+    views = all(isinstance(bars["close"], np.memmap) for bars in year.values())
+    _, scan_time = timed(lambda: sum(float(b["close"].sum()) for b in year.values()))
+    print(
+        f"load full year: {load_time * 1e3:.1f}ms for {symbol_count} symbols "
+        f"(zero-copy views: {views}), first pass over closes {scan_time:.2f}s"
+    )
+
+    last_day = history[-minutes]
+    _, day_time = timed(archive.load, symbols, last_day, next_day[0])
+    print(f"load last day: {day_time * 1e3:.1f}ms for {symbol_count} symbols")
+
+    start = time.perf_counter()
+    for symbol in symbols:
+        archive.append(symbol, synthetic_bars(next_day, rng))
+    append_time = time.perf_counter() - start
+    _, delta_time = timed(archive.load, symbols, last_day, next_day[-1] + 60)
+    _, compact_time = timed(archive.compact)
+    _, compacted_time = timed(archive.load, symbols, last_day, next_day[-1] + 60)
+    print(
+        f"append one day: {append_time:.2f}s | load across delta "
+        f"{delta_time * 1e3:.1f}ms | compaction {compact_time:.2f}s | "
+        f"load after compaction {compacted_time * 1e3:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--symbols", type=int, default=500)
+    parser.add_argument("--days", type=int, default=252)
+    parser.add_argument("--minutes", type=int, default=390)
+    parser.add_argument("--root", default=None, help="Defaults to a temp directory")
+    args = parser.parse_args()
+    if args.root:
+        benchmark(args.root, args.symbols, args.days, args.minutes)
+    else:
+        with tempfile.TemporaryDirectory() as root:
+            benchmark(root, args.symbols, args.days, args.minutes)
@@ -0,0 +1,254 @@
+"""Local stand-in for the Finnhub and Alpha Vantage endpoints the scanner uses.
+
+Serves Finnhub ``/api/v1/quote`` and ``/api/v1/company-news`` and the Alpha
+Vantage ``/query?function=NEWS_SENTIMENT`` endpoint with synthetic data, a
+configurable latency distribution and injected 429s, so scans can be load
+tested without spending API quota or depending on internet latency.
+
+Run standalone with ``python -m src.benchmarks.mock_market_server``, then point
+the clients at it with ``FinnhubClient(base_url=server.finnhub_url)`` and
+``AlphaVantageClient(base_url=server.alpha_vantage_url)``.
+"""
+
+import argparse
+import asyncio
+import datetime
+import math
+import random
+import zlib
+
+from aiohttp import web
+
+SOURCES = ["Reuters", "Bloomberg", "CNBC", "MarketWatch", "Benzinga", "Seeking Alpha"]
+EVENTS = [
+    "beats quarterly earnings estimates",
+    "shares slide after guidance cut",
+    "announces new buyback program",
+    "faces lawsuit over product defects",
+    "expands into new markets",
+    "reports record revenue growth",
+    "misses analyst expectations",
+    "wins major government contract",
+]
+SWEEP_LIMIT = 1000  # Most items Alpha Vantage returns for one request
+Z_99 = 2.326  # Standard normal 99th percentile
+
+
+class LatencyModel:
+    """
+    Log-normal response latency described by its median and p99, in seconds.
+
+    Real API latency is right-skewed: most responses are quick and a long tail
+    is not, which a log-normal captures with just these two numbers.
+    """
+
+    def __init__(self, median=0.05, p99=0.4):
+        if median <= 0 or p99 < median:
+            raise ValueError("Latency needs 0 < median <= p99")
+        self.median = median
+        self.p99 = p99
+        self.sigma = math.log(p99 / median) / Z_99
+
+    def sample(self, rng):
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+
+def symbol_seed(symbol):
+    """Stable per-symbol seed, so every request sees the same synthetic company."""
+    return zlib.crc32(symbol.encode())
+
+
+def synthetic_quote(symbol, rng):
+    """Returns a Finnhub-shaped quote whose high is fixed per symbol."""
+    high = random.Random(symbol_seed(symbol)).uniform(10, 500)
+    return {
+        "c": round(high * rng.uniform(0.9, 1.0), 2),
+        "h": round(high, 2),
+        "l": round(high * rng.uniform(0.85, 0.9), 2),
+        "o": round(high * 0.95, 2),
+        "pc": round(high * 0.95, 2),
+        "t": int(datetime.datetime.utcnow().timestamp()),
+    }
+
+
+class MockMarketServer:
+    """
+    aiohttp server answering quote and news requests with synthetic data.
+
+    Every response waits for a sample from ``latency``; ``rate_limit_ratio`` of
+    requests are answered with a 429 carrying ``Retry-After: retry_after``.
+    Symbols have ``news_per_symbol`` articles on average but, like real
+    coverage, a few names have many and plenty have none. The market-wide
+    Alpha Vantage sweep returns the latest articles across ``universe``, and a
+    multi-ticker query only matches articles tagging every ticker, as Alpha
+    Vantage does. Use as an async context manager or call ``start()``/``stop()``.
+    """
+
+    def __init__(
+        self,
+        latency=None,
+        rate_limit_ratio=0.0,
+        retry_after=1,
+        news_per_symbol=3,
+        universe=(),
+        host="127.0.0.1",
+        port=0,
+        seed=7,
+    ):
+        self.latency = latency or LatencyModel()
+        self.rate_limit_ratio = rate_limit_ratio
+        self.retry_after = retry_after
+        self.news_per_symbol = news_per_symbol
+        self.universe = list(universe)
+        self.host = host
+        self.port = port  # 0 picks a free port on start()
+        self.rng = random.Random(seed)
+        self.runner = None
+        self.stats = {"requests": 0, "rate_limited": 0}
+
+        self.app = web.Application()
+        self.app.router.add_get("/api/v1/quote", self.quote)
+        self.app.router.add_get("/api/v1/company-news", self.company_news)
+        self.app.router.add_get("/query", self.query)
+
+    @property
+    def finnhub_url(self):
+        return f"http://{self.host}:{self.port}/api/v1"
+
+    @property
+    def alpha_vantage_url(self):
+        return f"http://{self.host}:{self.port}/query"
+
+    async def start(self):
+        self.runner = web.AppRunner(self.app, access_log=None)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, self.host, self.port)
+        await site.start()
+        self.port = self.runner.addresses[0][1]
+        return self
+
+    async def stop(self):
+        if self.runner:
+            await self.runner.cleanup()
+        self.runner = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def _respond(self, payload):
+        """Waits out a sampled latency, then answers with ``payload`` or a 429."""
+        self.stats["requests"] += 1
+        await asyncio.sleep(self.latency.sample(self.rng))
+        if self.rng.random() < self.rate_limit_ratio:
+            self.stats["rate_limited"] += 1
+            return web.json_response(
+                {"error": "API limit reached"},
+                status=429,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        return web.json_response(payload)
+
+    def news_count(self, symbol):
+        """Articles one symbol has, exponentially distributed per symbol."""
+        rng = random.Random(symbol_seed(symbol) + 1)
+        return (
+            int(rng.expovariate(1 / self.news_per_symbol))
+            if self.news_per_symbol
+            else 0
+        )
+
+    def news_for(self, symbol):
+        """Returns the synthetic Alpha Vantage feed items for one symbol."""
+        rng = random.Random(symbol_seed(symbol))
+        now = datetime.datetime.utcnow()
+        items = []
+        for i in range(self.news_count(symbol)):
+            published = now - datetime.timedelta(minutes=rng.randint(1, 3 * 24 * 60))
+            items.append(
+                {
+                    "title": f"{symbol} {rng.choice(EVENTS)} ({i})",
+                    "source": rng.choice(SOURCES),
+                    "time_published": published.strftime("%Y%m%dT%H%M%S"),
+                    "ticker_sentiment": [{"ticker": symbol}],
+                }
+            )
+        return items
+
+    async def quote(self, request):
+        return await self._respond(
+            synthetic_quote(request.query.get("symbol", ""), self.rng)
+        )
+
+    async def company_news(self, request):
+        symbol = request.query.get("symbol", "")
+        return await self._respond(
+            [
+                {
+                    "headline": item["title"],
+                    "source": item["source"],
+                    "related": symbol,
+                    "datetime": int(
+                        datetime.datetime.strptime(
+                            item["time_published"], "%Y%m%dT%H%M%S"
+                        ).timestamp()
+                    ),
+                }
+                for item in self.news_for(symbol)
+            ]
+        )
+
+    async def query(self, request):
+        if request.query.get("function") != "NEWS_SENTIMENT":
+            return web.json_response({"Information": "Unsupported function"})
+
+        tickers = request.query.get("tickers")
+        if tickers:
+            tickers = set(tickers.split(","))
+            feed = [
+                item
+                for item in self.news_for(next(iter(tickers)))
+                if tickers <= {t["ticker"] for t in item["ticker_sentiment"]}
+            ]
+        else:
+            # Market-wide sweep: the latest items across the whole universe
+            limit = min(int(request.query.get("limit", 50)), SWEEP_LIMIT)
+            feed = sorted(
+                (item for symbol in self.universe for item in self.news_for(symbol)),
+                key=lambda item: item["time_published"],
+                reverse=True,
+            )[:limit]
+        return await self._respond({"items": str(len(feed)), "feed": feed})
+
+
+async def serve(args):
+    server = MockMarketServer(
+        latency=LatencyModel(args.median_latency, args.p99_latency),
+        rate_limit_ratio=args.rate_limit_ratio,
+        retry_after=args.retry_after,
+        news_per_symbol=args.news_per_symbol,
+        universe=[f"SYM{i}" for i in range(args.universe)],
+        port=args.port,
+    )
+    async with server:
+        print(f"Finnhub base_url:       {server.finnhub_url}")
+        print(f"Alpha Vantage base_url: {server.alpha_vantage_url}")
+        await asyncio.Event().wait()  # Serve until interrupted
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--median-latency", type=float, default=0.05)
+    parser.add_argument("--p99-latency", type=float, default=0.4)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--news-per-symbol", type=int, default=3)
+    parser.add_argument("--universe", type=int, default=500)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,108 @@
+"""Compares per-stock and batched CNN pattern inference across model variants.
+
+Reports per-symbol latency at each batch size for the eager, TorchScript-frozen
+and dynamically quantized models, and checks each variant's predictions and
+logits against the eager model. Without ``--model-path`` a randomly initialised
+CNN is used, which times the same operations.
+
+Run with ``python -m src.benchmarks.pattern_inference``.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from src.technical_analysis import (
+    MODEL_VARIANTS,
+    WINDOW,
+    CNNPatternRecognition,
+    load_cnn_model,
+    optimize_cnn_model,
+    predict_patterns,
+)
+
+
+def synthetic_windows(count, seed=7):
+    """Builds reproducible ``(count, 1, WINDOW)`` random-walk price windows."""
+    rng = np.random.default_rng(seed)
+    walks = 100 + np.cumsum(rng.normal(0, 1, (count, WINDOW)), axis=1)
+    return walks.astype(np.float32)[:, None, :]
+
+
+def per_stock(model, windows):
+    """The original path: one autograd-enabled forward pass per stock."""
+    return [
+        torch.argmax(model(torch.tensor(window[None])), dim=1).item()
+        for window in windows
+    ]
+
+
+def best_of(repeats, func, *args):
+    """Runs ``func`` ``repeats`` times and returns its result and fastest time."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def parity(model, reference, windows):
+    """Label agreement and max logit drift of ``model`` against ``reference``."""
+    with torch.inference_mode():
+        inputs = torch.from_numpy(windows)
+        expected, actual = reference(inputs), model(inputs)
+    agreement = (expected.argmax(dim=1) == actual.argmax(dim=1)).float().mean()
+    return float(agreement), float((expected - actual).abs().max())
+
+
+def benchmark(model_path, batch_sizes, threads, repeats):
+    eager = load_cnn_model(model_path) if model_path else CNNPatternRecognition()
+    eager.eval()
+    windows = synthetic_windows(max(batch_sizes))
+    # Freezing and dynamic quantization both build new modules from ``eager``
+    models = {variant: optimize_cnn_model(eager, variant) for variant in MODEL_VARIANTS}
+
+    for thread_count in threads:
+        torch.set_num_threads(thread_count)
+        print(f"--- {thread_count} intra-op thread(s) ---")
+        sample = windows[: min(256, len(windows))]
+        _, loop_time = best_of(repeats, per_stock, eager, sample)
+        print(
+            f"per-stock eager+autograd: {loop_time / len(sample) * 1e6:9.1f}us/symbol"
+        )
+
+        for variant, model in models.items():
+            predict_patterns(model, windows[:8])  # Warm up (JIT profiling runs)
+            agreement, drift = parity(model, eager, windows)
+            if variant != "quantized" and agreement < 1:
+                raise SystemExit(f"{variant} predictions differ from the eager model")
+            timings = []
+            for batch_size in batch_sizes:
+                _, elapsed = best_of(
+                    repeats, predict_patterns, model, windows[:batch_size], batch_size
+                )
+                timings.append(f"{batch_size}:{elapsed / batch_size * 1e6:.1f}")
+            print(
+                f"{variant:<11} agreement {agreement:6.1%} max drift {drift:.2e} | "
+                f"us/symbol by batch size {' '.join(timings)}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--model-path", default=None)
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=[1, 4, 16, 64, 256, 1024, 4096],
+    )
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, torch.get_num_threads()]
+    )
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    benchmark(args.model_path, args.batch_sizes, args.threads, args.repeats)
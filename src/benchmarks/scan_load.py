@@ -0,0 +1,201 @@
+"""End-to-end load benchmark of TradeSignalEngine.run against the mock APIs.
+
+Starts a MockMarketServer, then scans 50/500/5,000 symbols, each in a fresh
+process so caches and peak memory don't carry over between sizes, and reports
+throughput, p50/p99 per-symbol quote and news latency and peak RSS.
+
+Run with ``python -m src.benchmarks.scan_load``. ``--keyword-sentiment`` swaps
+the BERT model for a keyword scorer to isolate the I/O path.
+"""
+
+import argparse
+import asyncio
+import json
+import resource
+import sys
+import time
+
+import numpy as np
+
+from src.benchmarks.mock_market_server import LatencyModel, MockMarketServer
+
+POSITIVE_WORDS = ("beats", "record", "wins", "expands", "buyback")
+
+
+def keyword_sentiment(headlines, **kwargs):
+    """Pipeline-shaped scorer that labels headlines by keyword, without a model."""
+    return [
+        {
+            "label": (
+                "POSITIVE"
+                if any(word in headline for word in POSITIVE_WORDS)
+                else "NEGATIVE"
+            ),
+            "score": 0.9,
+        }
+        for headline in headlines
+    ]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process (ru_maxrss is KB on Linux)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def timed(func, latencies):
+    """Wraps an async call so each call's wall time is appended to ``latencies``."""
+
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    return wrapper
+
+
+def percentiles(latencies):
+    if not latencies:
+        return None, None
+    p50, p99 = np.percentile(latencies, [50, 99])
+    return float(p50), float(p99)
+
+
+async def scan_once(args):
+    """Runs one scan of ``args.symbols`` symbols and returns its measurements."""
+    from src.api.alpha_vantage_client import AlphaVantageClient
+    from src.api.finnhub_client import FinnhubClient
+    from src.sentiment.batch_scorer import BatchSentimentScorer
+    from src.trade_signal_engine import TradeSignalEngine
+    from src.utils.rate_limiter import TokenBucket
+
+    finnhub = FinnhubClient(
+        api_key="mock",
+        base_url=args.finnhub_url,
+        rate_limiter=TokenBucket.per_minute(args.rate_limit),
+    )
+    alpha_vantage = AlphaVantageClient(
+        api_key="mock",
+        base_url=args.alpha_vantage_url,
+        rate_limiter=TokenBucket.per_minute(args.rate_limit),
+    )
+    quote_latencies, news_latencies = [], []
+    finnhub.get_stock_price = timed(finnhub.get_stock_price, quote_latencies)
+    alpha_vantage._symbol_feed = timed(alpha_vantage._symbol_feed, news_latencies)
+
+    engine = TradeSignalEngine(finnhub, alpha_vantage)
+    if args.keyword_sentiment:
+        engine.sentiment_scorer = BatchSentimentScorer(
+            keyword_sentiment, deduplicator=engine.deduplicator
+        )
+    else:
+        engine.sentiment_analyzer  # Load the model before the clock starts
+
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    rss_before = peak_rss_mb()
+    start = time.perf_counter()
+    try:
+        signals = await engine.run(symbols)
+    finally:
+        elapsed = time.perf_counter() - start
+        await engine.close()
+
+    quote_p50, quote_p99 = percentiles(quote_latencies)
+    news_p50, news_p99 = percentiles(news_latencies)
+    return {
+        "symbols": args.symbols,
+        "signals": len(signals),
+        "seconds": elapsed,
+        "symbols_per_second": args.symbols / elapsed,
+        "quote_p50": quote_p50,
+        "quote_p99": quote_p99,
+        "news_requests": len(news_latencies),
+        "news_p50": news_p50,
+        "news_p99": news_p99,
+        "retries": finnhub.resilience.retried + alpha_vantage.resilience.retried,
+        "peak_rss_mb": peak_rss_mb(),
+        "rss_growth_mb": peak_rss_mb() - rss_before,
+    }
+
+
+async def run_sizes(args):
+    server = MockMarketServer(
+        latency=LatencyModel(args.median_latency, args.p99_latency),
+        rate_limit_ratio=args.rate_limit_ratio,
+        retry_after=args.retry_after,
+        news_per_symbol=args.news_per_symbol,
+        universe=[f"SYM{i}" for i in range(max(args.sizes))],
+    )
+    async with server:
+        for count in args.sizes:
+            command = [
+                sys.executable,
+                "-m",
+                "src.benchmarks.scan_load",
+                "--worker",
+                f"--symbols={count}",
+                f"--finnhub-url={server.finnhub_url}",
+                f"--alpha-vantage-url={server.alpha_vantage_url}",
+                f"--rate-limit={args.rate_limit}",
+            ]
+            if args.keyword_sentiment:
+                command.append("--keyword-sentiment")
+            requests_before = dict(server.stats)
+            process = await asyncio.create_subprocess_exec(
+                *command, stdout=asyncio.subprocess.PIPE
+            )
+            stdout, _ = await process.communicate()
+            if process.returncode != 0:
+                raise SystemExit(f"Scan of {count} symbols failed")
+            report(
+                json.loads(stdout.decode().strip().splitlines()[-1]),
+                server.stats["requests"] - requests_before["requests"],
+                server.stats["rate_limited"] - requests_before["rate_limited"],
+            )
+
+
+def milliseconds(seconds):
+    return f"{seconds * 1e3:7.1f}" if seconds is not None else "    n/a"
+
+
+def report(result, requests, rate_limited):
+    print(
+        f"{result['symbols']:>5} symbols: {result['symbols_per_second']:8.1f} sym/s "
+        f"({result['seconds']:.2f}s, {result['signals']} signals) | "
+        f"quote p50/p99 {milliseconds(result['quote_p50'])}/"
+        f"{milliseconds(result['quote_p99'])}ms | "
+        f"news p50/p99 {milliseconds(result['news_p50'])}/"
+        f"{milliseconds(result['news_p99'])}ms ({result['news_requests']} reqs) | "
+        f"{requests} requests, {rate_limited} 429s, {result['retries']} retries | "
+        f"peak RSS {result['peak_rss_mb']:.0f}MB "
+        f"(+{result['rss_growth_mb']:.0f}MB during scan)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--median-latency", type=float, default=0.05)
+    parser.add_argument("--p99-latency", type=float, default=0.4)
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.01)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--news-per-symbol", type=int, default=3)
+    parser.add_argument(
+        "--rate-limit",
+        type=int,
+        default=60000,
+        help="Client-side requests per minute per API",
+    )
+    parser.add_argument("--keyword-sentiment", action="store_true")
+    # Internal: one scan in this process, reported as a JSON line
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--symbols", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--finnhub-url", help=argparse.SUPPRESS)
+    parser.add_argument("--alpha-vantage-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(scan_once(args))))
+    else:
+        asyncio.run(run_sizes(args))
@@ -0,0 +1,76 @@
+"""Checks parity and measures CPU latency/throughput of each sentiment backend.
+
+Run with ``python -m src.benchmarks.sentiment_backends``. Exits non-zero if a
+backend disagrees with the fp32 pipeline beyond the configured tolerances.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from src.benchmarks.sentiment_batching import synthetic_headlines
+from src.sentiment.backends import (
+    BACKENDS,
+    PARITY_CORPUS,
+    compare_backends,
+    load_sentiment_pipeline,
+)
+from src.sentiment.batch_scorer import BatchSentimentScorer
+
+
+def measure(analyzer, headlines, batch_size):
+    """Returns p50 single-headline latency (ms) and batched throughput (items/s)."""
+    latencies = []
+    for headline in headlines[:100]:
+        start = time.perf_counter()
+        analyzer(headline)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    scorer = BatchSentimentScorer(analyzer, batch_size=batch_size)
+    start = time.perf_counter()
+    scorer.score(headlines)
+    throughput = len(headlines) / (time.perf_counter() - start)
+    return float(np.percentile(latencies, 50)), throughput
+
+
+def main(args):
+    reference = load_sentiment_pipeline("pytorch")
+    headlines = synthetic_headlines(args.headlines)
+    failed = False
+
+    for backend in args.backends:
+        try:
+            analyzer = (
+                reference if backend == "pytorch" else load_sentiment_pipeline(backend)
+            )
+        except ImportError as e:
+            print(f"{backend:<10} skipped: {e}")
+            continue
+
+        analyzer(PARITY_CORPUS[:4])  # Warm up
+        parity = compare_backends(reference, analyzer)
+        p50, throughput = measure(analyzer, headlines, args.batch_size)
+        ok = (
+            parity["label_agreement"] >= args.min_agreement
+            and parity["max_score_drift"] <= args.max_drift
+        )
+        failed |= not ok
+        print(
+            f"{backend:<10} p50={p50:6.2f}ms  {throughput:8.1f} headlines/s  "
+            f"agreement={parity['label_agreement']:.0%}  "
+            f"max_drift={parity['max_score_drift']:.4f}  {'OK' if ok else 'FAIL'}"
+        )
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS))
+    parser.add_argument("--headlines", type=int, default=512)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--min-agreement", type=float, default=0.95)
+    parser.add_argument("--max-drift", type=float, default=0.05)
+    sys.exit(main(parser.parse_args()))
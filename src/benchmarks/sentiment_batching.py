@@ -0,0 +1,59 @@
+"""Compares per-headline and batched sentiment inference throughput on CPU.
+
+Run with ``python -m src.benchmarks.sentiment_batching``.
+"""
+
+import argparse
+import random
+import time
+
+from transformers import pipeline
+
+from src.sentiment.batch_scorer import BatchSentimentScorer
+
+SUBJECTS = ["Apple", "Tesla", "Nvidia", "Exxon", "JPMorgan", "Pfizer", "Boeing"]
+EVENTS = [
+    "beats quarterly earnings estimates",
+    "shares slide after guidance cut",
+    "announces new buyback program",
+    "faces lawsuit over product defects",
+    "expands into new markets",
+    "reports record revenue growth",
+    "misses analyst expectations",
+]
+
+
+def synthetic_headlines(count, seed=7):
+    """Builds a reproducible list of distinct financial headlines."""
+    rng = random.Random(seed)
+    return [f"{rng.choice(SUBJECTS)} {rng.choice(EVENTS)} ({i})" for i in range(count)]
+
+
+def benchmark(count, batch_sizes):
+    analyzer = pipeline("sentiment-analysis", device=-1)
+    headlines = synthetic_headlines(count)
+    analyzer(headlines[:8])  # Warm up weights and kernels
+
+    start = time.perf_counter()
+    for headline in headlines:
+        analyzer(headline)
+    baseline = time.perf_counter() - start
+    print(f"per-headline: {count / baseline:8.1f} headlines/s ({baseline:.2f}s)")
+
+    for batch_size in batch_sizes:
+        scorer = BatchSentimentScorer(analyzer, batch_size=batch_size)
+        start = time.perf_counter()
+        scorer.score(headlines)
+        elapsed = time.perf_counter() - start
+        print(
+            f"batch={batch_size:<4}: {count / elapsed:8.1f} headlines/s "
+            f"({elapsed:.2f}s, {baseline / elapsed:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--headlines", type=int, default=512)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 32, 64])
+    args = parser.parse_args()
+    benchmark(args.headlines, args.batch_sizes)
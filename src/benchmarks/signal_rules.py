@@ -0,0 +1,85 @@
+"""Compares per-stock and vectorized BUY rule evaluation across universe sizes.
+
+Run with ``python -m src.benchmarks.signal_rules``.
+"""
+
+import argparse
+import random
+import time
+
+from src.trade_signal_engine import evaluate_signal
+from src.universe_snapshot import SignalRules, UniverseSnapshot
+
+
+def synthetic_universe(count, seed=7):
+    """Builds reproducible quotes and sentiment scores for ``count`` symbols."""
+    rng = random.Random(seed)
+    market_data, sentiment_scores = [], {}
+    for i in range(count):
+        symbol = f"SYM{i}"
+        high = rng.uniform(10, 500)
+        market_data.append(
+            {
+                "symbol": symbol,
+                "current_price": high * rng.uniform(0.9, 1.0),
+                "high_price": high,
+                "low_price": high * rng.uniform(0.85, 0.95),
+            }
+        )
+        sentiment_scores[symbol] = round(rng.uniform(0, 80), 2)
+    return market_data, sentiment_scores
+
+
+def best_of(repeats, func, *args):
+    """Runs ``func`` ``repeats`` times and returns its result and fastest time."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def per_stock(market_data, sentiment_scores):
+    signals = []
+    for stock in market_data:
+        signal = evaluate_signal(stock, sentiment_scores.get(stock["symbol"], 0))
+        if signal:
+            signals.append(signal)
+    return signals
+
+
+def vectorized(market_data, sentiment_scores, rules):
+    snapshot = UniverseSnapshot.from_market_data(market_data, sentiment_scores)
+    return rules.evaluate(snapshot)
+
+
+def benchmark(sizes, repeats):
+    rules = SignalRules()
+    for count in sizes:
+        market_data, sentiment_scores = synthetic_universe(count)
+        expected, loop_time = best_of(repeats, per_stock, market_data, sentiment_scores)
+        actual, vector_time = best_of(
+            repeats, vectorized, market_data, sentiment_scores, rules
+        )
+        snapshot = UniverseSnapshot.from_market_data(market_data, sentiment_scores)
+        _, rules_time = best_of(repeats, rules.evaluate, snapshot)
+        _, mask_time = best_of(repeats, rules.buy_mask, snapshot)
+
+        if actual != expected:
+            raise SystemExit(f"Signal mismatch at {count} symbols")
+        print(
+            f"{count:>6} symbols, {len(expected):>5} signals: "
+            f"per-stock {loop_time * 1e3:7.3f}ms | "
+            f"snapshot+rules {vector_time * 1e3:7.3f}ms | "
+            f"rules only {rules_time * 1e3:7.3f}ms | "
+            f"mask only {mask_time * 1e3:7.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    benchmark(args.sizes, args.repeats)
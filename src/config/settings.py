@@ -59,6 +59,28 @@ MARKET_HOURS = {
     "POST_MARKET": (16, 20),  # 4:00 PM - 8:00 PM EST
 }
 
+# ✅ Continuous Scan Cadence (seconds between scan starts, by market phase)
+SCAN_SCHEDULE = {
+    "TIMEZONE": "America/New_York",
+    "OPEN_CLOSE_WINDOW_MINUTES": 30,  # ✅ First/last 30 min of the session poll densely
+    "OPEN_CLOSE_INTERVAL": 60,  # ✅ Every minute around the open and close
+    "REGULAR_INTERVAL": 300,  # ✅ Every 5 minutes mid-session
+    "EXTENDED_INTERVAL": 900,  # ✅ Every 15 minutes pre/post-market
+    # ✅ NYSE full-day closures; no scans run on these dates
+    "HOLIDAYS": [
+        "2026-01-01",
+        "2026-01-19",
+        "2026-02-16",
+        "2026-04-03",
+        "2026-05-25",
+        "2026-06-19",
+        "2026-07-03",
+        "2026-09-07",
+        "2026-11-26",
+        "2026-12-25",
+    ],
+}
+
 # ✅ AI Learning Settings (Future Update)
 AI_LEARNING = {
     "ENABLE_TRADE_LOGGING": True,  # ✅ Store trade history for improvement
@@ -0,0 +1,137 @@
+import logging
+
+import numpy as np
+
+FIELDS = ("open", "high", "low", "close", "volume")
+DEFAULT_CAPACITY = 256  # Bars of history kept per symbol
+
+
+class FeatureStore:
+    """
+    Rolling OHLCV history for a fixed universe in preallocated ring buffers.
+
+    Each field is one ``(symbols, 2 * capacity)`` array and every bar is written
+    twice, at ``slot`` and ``slot + capacity``, so the latest ``length <=
+    capacity`` bars of every symbol are always one contiguous slice. Windows
+    are views into the buffers, never copies, and memory is fixed at
+    ``len(fields) x symbols x 2 x capacity x itemsize`` bytes no matter how
+    long the store runs.
+
+    All symbols share one cursor: ``append`` adds the next bar for the whole
+    universe, and symbols without a bar get NaN, which downstream rules
+    treat as missing. Windows are only valid until ``capacity`` more bars
+    have been appended, so use them right away or copy them.
+    """
+
+    def __init__(self, symbols, capacity=DEFAULT_CAPACITY, dtype=np.float32):
+        self.logger = logging.getLogger(__name__)
+        self.symbols = list(symbols)
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self.capacity = capacity
+        # float32 is what the CNN consumes and halves the footprint of float64
+        self.buffers = {
+            field: np.full((len(self.symbols), 2 * capacity), np.nan, dtype=dtype)
+            for field in FIELDS
+        }
+        self.times = np.full(2 * capacity, np.datetime64("NaT"), "datetime64[s]")
+        self.cursor = 0  # Bars appended since creation
+
+    def __len__(self):
+        """Bars of history currently available (at most ``capacity``)."""
+        return min(self.cursor, self.capacity)
+
+    @property
+    def nbytes(self):
+        return (
+            sum(buffer.nbytes for buffer in self.buffers.values()) + self.times.nbytes
+        )
+
+    def append_arrays(self, timestamp=None, **columns):
+        """
+        Appends one bar for every symbol from arrays aligned with ``symbols``;
+        fields left out are stored as NaN.
+        """
+        slot = self.cursor % self.capacity
+        for field, buffer in self.buffers.items():
+            values = columns.get(field, np.nan)
+            buffer[:, slot] = values
+            buffer[:, slot + self.capacity] = values
+        self.times[[slot, slot + self.capacity]] = np.datetime64(
+            "NaT" if timestamp is None else timestamp, "s"
+        )
+        self.cursor += 1
+
+    def append(self, bars, timestamp=None):
+        """Appends one bar from ``{symbol: {field: value}}``, e.g. candles."""
+        columns = {field: np.full(len(self.symbols), np.nan) for field in self.buffers}
+        unknown = 0
+        for symbol, bar in bars.items():
+            row = self.index.get(symbol)
+            if row is None:
+                unknown += 1
+                continue
+            for field, column in columns.items():
+                value = bar.get(field)
+                if value is not None:
+                    column[row] = value
+        if unknown:
+            self.logger.debug(f"Ignored bars for {unknown} symbols outside the store.")
+        self.append_arrays(timestamp, **columns)
+
+    def _span(self, length):
+        length = min(length or self.capacity, len(self))
+        end = (self.cursor - 1) % self.capacity + self.capacity + 1
+        return slice(end - length, end)
+
+    def window(self, field, length=None):
+        """Returns a ``(symbols, length)`` view of the latest bars, oldest first."""
+        return self.buffers[field][:, self._span(length)]
+
+    def timestamps(self, length=None):
+        return self.times[self._span(length)]
+
+    def history(self, symbol, length=None):
+        """Returns ``{field: 1-D view}`` of one symbol's latest bars."""
+        row = self.index[symbol]
+        span = self._span(length)
+        return {field: buffer[row, span] for field, buffer in self.buffers.items()}
+
+    def complete(self, length, fields=("close",)):
+        """Boolean mask of symbols with no missing bars in the latest ``length``."""
+        if len(self) < length:
+            return np.zeros(len(self.symbols), dtype=bool)
+        mask = np.ones(len(self.symbols), dtype=bool)
+        for field in fields:
+            mask &= ~np.isnan(self.window(field, length)).any(axis=1)
+        return mask
+
+    @classmethod
+    def from_archive(cls, archive, symbols, start, end, capacity=DEFAULT_CAPACITY):
+        """
+        Builds a store holding the latest ``capacity`` bar times in a
+        BarArchive's ``[start, end)`` range, aligned across symbols; symbols
+        without a bar at one of those times get NaN there.
+        """
+        store = cls(symbols, capacity)
+        bars = archive.load(store.symbols, start, end)
+        if not bars:
+            return store
+        times = np.unique(np.concatenate([b["time"] for b in bars.values()]))
+        times = times[-capacity:]
+        count = len(times)
+        if not count:
+            return store
+
+        for row, symbol in enumerate(store.symbols):
+            symbol_times = bars[symbol]["time"]
+            slots = np.minimum(np.searchsorted(times, symbol_times), count - 1)
+            present = times[slots] == symbol_times
+            slots = slots[present]
+            for field, buffer in store.buffers.items():
+                values = bars[symbol][field][present]
+                buffer[row, slots] = values
+                buffer[row, slots + capacity] = values
+        store.times[:count] = times
+        store.times[capacity : capacity + count] = times
+        store.cursor = count
+        return store
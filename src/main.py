@@ -7,9 +7,16 @@ from dotenv import load_dotenv
 from src.alerts.alert_manager import AlertManager
 from src.api.alpha_vantage_client import AlphaVantageClient
 from src.api.finnhub_client import FinnhubClient
+from src.api.quote_service import QuoteService
 from src.database.db_connector import DatabaseConnector
+from src.sentiment.cache import SentimentCache
 from src.trade_signal_engine import TradeSignalEngine
 from src.utils.async_requests import RequestScheduler
+from src.utils.caching import DEFAULT_REDIS_URL, TieredCache
+from src.utils.inference_executor import get_inference_executor
+from src.utils.model_registry import SENTIMENT_MODEL, model_registry
+from src.utils.rate_limiter import build_rate_limiters
+from src.utils.scan_scheduler import ScanScheduler
 
 # Load environment variables
 load_dotenv()
@@ -27,20 +34,32 @@ ALPHA_VANTAGE_API_KEY = os.getenv("ALPHA_VANTAGE_API_KEY")
 if not FINNHUB_API_KEY or not ALPHA_VANTAGE_API_KEY:
     raise ValueError("Missing API keys! Check your .env file.")
 
-# Initialize API Clients with the correct API keys
-finnhub_client = FinnhubClient(api_key=FINNHUB_API_KEY)
-alpha_vantage_client = AlphaVantageClient()
-
 # Define API rate limits
 rate_limits = {
     "finnhub": 150,  # Finnhub rate limit per minute
     "alpha_vantage": 75,  # Alpha Vantage rate limit per minute
 }
 
+# One token bucket per API, shared by every component that calls it
+rate_limiters = build_rate_limiters(rate_limits)
+
+# Initialize API Clients with the correct API keys
+finnhub_client = FinnhubClient(
+    api_key=FINNHUB_API_KEY, rate_limiter=rate_limiters["finnhub"]
+)
+# Quotes and news are cached in-process and in Redis, shared across processes
+api_cache = TieredCache(url=os.getenv("REDIS_URL", DEFAULT_REDIS_URL))
+alpha_vantage_client = AlphaVantageClient(
+    rate_limiter=rate_limiters["alpha_vantage"], cache=api_cache
+)
+# Every quote consumer shares one coalescing quote snapshot
+quote_service = QuoteService(finnhub_client, cache=api_cache)
+
 # Initialize components
-request_scheduler = RequestScheduler(rate_limits)
+request_scheduler = RequestScheduler(rate_limits, limiters=rate_limiters)
+sentiment_cache = SentimentCache()  # Headline scores persist across runs
 trade_signal_engine = TradeSignalEngine(
-    finnhub_client, alpha_vantage_client
+    quote_service, alpha_vantage_client, sentiment_cache=sentiment_cache
 )
 alert_manager = AlertManager()
 db_connector = DatabaseConnector()
@@ -55,24 +74,44 @@ stock_list = [
 ]  # ✅ Increased to top 50 US stocks
 
 
+async def scan_universe():
+    """Fetch market data & analyze trades for one scan cycle."""
+    quote_service.start_cycle()
+    trade_signals = await trade_signal_engine.run(stock_list)
+    if scan_scheduler.cycles == 0:
+        model_registry.report()  # Load stats are only interesting once
+    return trade_signals
+
+
+# Re-scans on a market-hours cadence, reusing clients, caches and models
+scan_scheduler = ScanScheduler(scan_universe, rate_limiters=rate_limiters)
+
+
 async def main():
     logging.info("Starting trading bot...")
 
-    # Fetch market data & analyze trades
-    await trade_signal_engine.run(stock_list)
+    # Load the sentiment model in the background while the first quotes download
+    model_registry.prewarm(SENTIMENT_MODEL)
 
-    # Monitor alerts
-    await alert_manager.monitor_alerts()
+    try:
+        # Scan continuously & monitor alerts side by side
+        await asyncio.gather(scan_scheduler.run(), alert_manager.monitor_alerts())
+    finally:
+        await shutdown()  # Close pooled sessions on the loop that opened them
 
 
 async def shutdown():
     """Cleanup function to close async sessions before exiting."""
+    await finnhub_client.close()
+    await alpha_vantage_client.close()
     await request_scheduler.close()
+    logging.info(f"API cache stats: {api_cache.stats()}")
+    await api_cache.close()
+    logging.info(f"Sentiment cache hit rate: {sentiment_cache.hit_rate:.0%}")
+    get_inference_executor().shutdown()
+    sentiment_cache.close()
 
 
 if __name__ == "__main__":
-    try:
-        asyncio.run(main())
-    finally:
-        asyncio.run(shutdown())  # Ensure the session is properly closed
+    asyncio.run(main())
 
@@ -1,7 +1,10 @@
 import datetime
 import logging
-import numpy as np
-from transformers import pipeline
+
+from src.sentiment.batch_scorer import DEFAULT_BATCH_SIZE, BatchSentimentScorer
+from src.sentiment.dedup import HeadlineDeduplicator
+from src.sentiment.vectorized_scoring import VectorizedNewsScorer
+from src.utils.model_registry import SENTIMENT_MODEL, configure_sentiment_model
 
 
 class NewsRanking:
@@ -9,7 +12,6 @@ class NewsRanking:
 
     def __init__(self, config):
         self.logger = logging.getLogger(__name__)
-        self.sentiment_analyzer = pipeline("sentiment-analysis")
         self.time_decay_days = 7  # More recent news holds more weight
         self.high_risk_terms = [
             "SEC investigation",
@@ -18,44 +20,49 @@ class NewsRanking:
             "regulatory action",
         ]
         self.credible_sources = {"Reuters", "Bloomberg", "CNBC", "WSJ"}
+        # Syndicated copies collapse to their most credible source
+        self.deduplicator = HeadlineDeduplicator(credible_sources=self.credible_sources)
+        if config.get("ai", {}).get("sentiment_backend"):
+            configure_sentiment_model(config)  # Overrides SENTIMENT_BACKEND
+        self.sentiment_scorer = BatchSentimentScorer(
+            SENTIMENT_MODEL,  # Shared with TradeSignalEngine via the model registry
+            batch_size=config.get("news_ranking", {}).get(
+                "batch_size", DEFAULT_BATCH_SIZE
+            ),
+            deduplicator=self.deduplicator,
+        )
+        # Time decay, source credibility, historical impact and high-risk event
+        # filtering, computed as array operations over whole batches
+        self.news_scorer = VectorizedNewsScorer(
+            credible_sources=self.credible_sources,
+            time_decay_days=self.time_decay_days,
+            high_risk_terms=self.high_risk_terms,
+        )
+
+    @property
+    def sentiment_analyzer(self):
+        return self.sentiment_scorer.analyzer
 
-    def calculate_trade_influence_score(self, news_data):
+    def calculate_trade_influence_score(self, news_data, sentiments=None):
         """Assigns a 0-100% Trade Influence Score based on sentiment, credibility, and historical impact."""
         if not news_data:
             return 0  # No news = No influence
 
-        sentiment_scores = []
-        for news in news_data:
-            # AI Sentiment Analysis
-            sentiment = self.sentiment_analyzer(news["headline"])[0]
-            sentiment_strength = sentiment["score"]
-
-            # Time Decay Function
-            news_age = (datetime.datetime.utcnow() - news["date"]).days
-            recency_weight = max(0, 1 - (news_age / self.time_decay_days))
-
-            # Source Credibility
-            credibility_weight = 1.0 if news["source"] in self.credible_sources else 0.5
-
-            # Historical Impact
-            historical_impact = 0.8 if "earnings" in news["headline"].lower() else 0.5
-
-            # High-Risk Event Filtering
-            if any(term in news["headline"].lower() for term in self.high_risk_terms):
-                self.logger.warning(f"Filtered high-risk news: {news['headline']}")
-                continue  # Skip risky news items
-
-            # Compute Trade Influence Score
-            trade_score = (
-                sentiment_strength
-                * recency_weight
-                * credibility_weight
-                * historical_impact
-                * 100
+        if sentiments is None:
+            news_data = self.deduplicator.collapse({None: news_data})[None]
+            # AI Sentiment Analysis, one batched pass for all headlines
+            sentiments = self.sentiment_scorer.score(
+                [news["headline"] for news in news_data]
             )
-            sentiment_scores.append(trade_score)
 
-        return round(np.mean(sentiment_scores), 2) if sentiment_scores else 0
+        return self.news_scorer.score({None: news_data}, {None: sentiments})[None]
+
+    def score_universe(self, news_by_symbol):
+        """Scores the news of every symbol with shared batched inference."""
+        news_by_symbol = self.deduplicator.collapse(news_by_symbol)
+        sentiments = self.sentiment_scorer.score_by_symbol(news_by_symbol)
+        self.logger.info(f"Headline dedup: {self.deduplicator.last_stats}")
+        return self.news_scorer.score(news_by_symbol, sentiments)
 
 
 # Usage Example:
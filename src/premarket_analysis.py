@@ -1,13 +1,18 @@
 import asyncio
 import logging
 from src.api.finnhub_client import FinnhubClient
+from src.api.quote_service import QuoteService
 
 
 class PreMarketAnalysis:
     """Monitors early trends in pre-market trading to detect momentum shifts before market open."""
 
     def __init__(self, finnhub: FinnhubClient):
-        self.finnhub = finnhub
+        # Quotes go through a coalescing service, shared with other components
+        # when one is passed in
+        self.finnhub = (
+            finnhub if isinstance(finnhub, QuoteService) else QuoteService(finnhub)
+        )
         self.logger = logging.getLogger(__name__)
 
     async def fetch_premarket_data(self, stock_list):
@@ -1,15 +1,19 @@
 import logging
 
+import numpy as np
+
 
 class RiskManagement:
     """Handles ATR-based stop-loss, position sizing, and adaptive risk allocation."""
 
-    def __init__(self, config):
+    def __init__(self, config, atr_tracker=None):
         self.base_risk_per_trade = config["trading"]["position_sizing"][
             "base_risk_per_trade"
         ]
         self.atr_multiplier = config["trading"]["stop_loss_atr_multiplier"]
         self.adaptive_risk = config["trading"]["position_sizing"]["adaptive_risk"]
+        # Optional ATRTracker, so stops and sizes use each symbol's live ATR
+        self.atr_tracker = atr_tracker
         self.logger = logging.getLogger(__name__)
 
     def calculate_stop_loss(self, atr, current_price):
@@ -30,6 +34,56 @@ class RiskManagement:
         position_size = (account_balance * risk_allocation) / risk_per_share
         return max(1, int(position_size))  # Minimum position size is 1 share
 
+    def _tracked_atr(self, symbol):
+        """The symbol's tracked ATR, or None while it is missing or not positive."""
+        atr = self.atr_tracker.get(symbol) if self.atr_tracker else None
+        if atr is None or atr <= 0:
+            self.logger.warning(f"No ATR available for {symbol} yet.")
+            return None
+        return atr
+
+    def stop_loss_for(self, symbol, current_price):
+        """Stop-loss from the symbol's tracked ATR, or None while it warms up."""
+        atr = self._tracked_atr(symbol)
+        if atr is None:
+            return None
+        return self.calculate_stop_loss(atr, current_price)
+
+    def position_size_for(self, symbol, account_balance, stock_price, confidence_score):
+        """Position size from the symbol's tracked ATR, or None while it warms up."""
+        atr = self._tracked_atr(symbol)
+        if atr is None:
+            return None
+        return self.calculate_position_size(
+            account_balance, atr, stock_price, confidence_score
+        )
+
+    def stop_losses(self, current_prices, atr=None):
+        """
+        Array version of ``calculate_stop_loss``. ``atr`` defaults to the
+        tracker's, aligned with its symbols; NaN where ATR is still warming up.
+        """
+        atr = self.atr_tracker.atr if atr is None else atr
+        stops = np.round(
+            np.asarray(current_prices, dtype=float) - atr * self.atr_multiplier, 2
+        )
+        return np.maximum(0, stops)
+
+    def position_sizes(self, account_balance, atr, stock_prices, confidence_scores):
+        """
+        Array version of ``calculate_position_size``, in whole shares. Symbols
+        whose ATR is missing (NaN) or not positive get 0 shares.
+        """
+        risk_allocation = self.base_risk_per_trade
+        if self.adaptive_risk:
+            risk_allocation = risk_allocation * np.asarray(confidence_scores) / 100
+
+        atr = np.asarray(atr, dtype=float)
+        usable = atr > 0  # False for NaN too
+        risk_per_share = np.where(usable, atr, np.nan) * self.atr_multiplier
+        position_sizes = np.floor(account_balance * risk_allocation / risk_per_share)
+        return np.where(usable, np.maximum(1, position_sizes), 0).astype(np.int64)
+
     def apply_trailing_stop(self, current_price, entry_price, atr):
         """Implements ATR-based trailing stop-loss strategy."""
         trailing_stop = round(entry_price + (atr * 1.5), 2)  # 1.5x ATR trailing stop
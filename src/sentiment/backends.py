@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import torch
+from dotenv import load_dotenv
+from transformers import AutoTokenizer, pipeline
+
+load_dotenv()
+
+# Default checkpoint behind pipeline("sentiment-analysis")
+DEFAULT_MODEL_NAME = "distilbert/distilbert-base-uncased-finetuned-sst-2-english"
+BACKENDS = ("pytorch", "quantized", "onnx")
+# Used when the config doesn't set ``ai.sentiment_backend``
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "pytorch")
+
+# Fixed headline corpus used to check a backend against the fp32 pipeline
+PARITY_CORPUS = [
+    "Apple beats quarterly earnings estimates on strong iPhone sales",
+    "Tesla shares slide after deliveries miss expectations",
+    "Nvidia announces record data center revenue",
+    "SEC investigation launched into accounting at Company Y",
+    "Exxon raises dividend as oil prices climb",
+    "Pfizer cuts full-year guidance amid weaker vaccine demand",
+    "JPMorgan reports steady loan growth in the second quarter",
+    "Boeing faces new lawsuit over delivery delays",
+    "Microsoft expands cloud partnership with major retailer",
+    "Amazon warns of slowing growth in its retail business",
+    "Intel to lay off thousands as turnaround stalls",
+    "Netflix subscriber growth tops forecasts",
+    "Coca-Cola volumes flat as price increases stick",
+    "AMD unveils new chips, shares rise in early trading",
+    "Walmart sees holiday sales ahead of plan",
+    "Meta fined by regulators over data transfers",
+    "Goldman Sachs trading revenue falls short",
+    "Caterpillar sees strong demand for mining equipment",
+    "Disney streaming losses narrow more than expected",
+    "Visa volumes steady despite cooling consumer spending",
+]
+
+
+def sentiment_backend(config=None):
+    """
+    Returns the backend named by ``config["ai"]["sentiment_backend"]``,
+    falling back to the ``SENTIMENT_BACKEND`` environment variable.
+    """
+    return ((config or {}).get("ai") or {}).get("sentiment_backend", SENTIMENT_BACKEND)
+
+
+def load_sentiment_pipeline(backend=None, model_name=DEFAULT_MODEL_NAME):
+    """
+    Builds a sentiment-analysis pipeline on the requested CPU backend, or on
+    ``SENTIMENT_BACKEND`` when none is given.
+
+    ``pytorch`` is the fp32 reference, ``quantized`` applies dynamic int8
+    quantization to the model's Linear layers, and ``onnx`` runs an exported
+    ONNX graph through ONNX Runtime (requires ``optimum[onnxruntime]``).
+    """
+    backend = backend or SENTIMENT_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown sentiment backend '{backend}', use one of {BACKENDS}"
+        )
+
+    if backend == "onnx":
+        try:
+            from optimum.onnxruntime import ORTModelForSequenceClassification
+        except ImportError as e:
+            raise ImportError(
+                "The onnx sentiment backend requires 'optimum[onnxruntime]'"
+            ) from e
+
+        model = ORTModelForSequenceClassification.from_pretrained(
+            model_name, export=True
+        )
+        analyzer = pipeline(
+            "sentiment-analysis",
+            model=model,
+            tokenizer=AutoTokenizer.from_pretrained(model_name),
+        )
+    else:
+        analyzer = pipeline("sentiment-analysis", model=model_name, device=-1)
+        if backend == "quantized":
+            analyzer.model = torch.ao.quantization.quantize_dynamic(
+                analyzer.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+    # Cached scores are keyed by this, so backends never share cache entries
+    analyzer.sentiment_model_id = f"{model_name}@{backend}"
+    return analyzer
+
+
+def signed_scores(results):
+    """Maps pipeline outputs to signed scores in [-1, 1] for drift comparisons."""
+    return np.array(
+        [r["score"] if r["label"] == "POSITIVE" else -r["score"] for r in results]
+    )
+
+
+def compare_backends(reference, candidate, corpus=PARITY_CORPUS):
+    """Reports label agreement and score drift of ``candidate`` vs ``reference``."""
+    expected = reference(corpus)
+    actual = candidate(corpus)
+
+    agreement = np.mean([e["label"] == a["label"] for e, a in zip(expected, actual)])
+    drift = np.abs(signed_scores(expected) - signed_scores(actual))
+    return {
+        "label_agreement": float(agreement),
+        "max_score_drift": float(drift.max()),
+        "mean_score_drift": float(drift.mean()),
+    }
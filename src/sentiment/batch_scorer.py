@@ -0,0 +1,138 @@
+import logging
+import time
+
+from src.utils.model_registry import model_registry
+
+DEFAULT_BATCH_SIZE = 32  # Headlines per forward pass
+DEFAULT_MAX_LENGTH = 512  # Longer inputs are truncated to the model limit
+
+
+def extract_headline(news):
+    """Returns the headline of a news item, falling back to its title."""
+    return news.get("headline") or news.get("title")
+
+
+class BatchSentimentScorer:
+    """
+    Runs a Hugging Face sentiment pipeline over many headlines in batched passes.
+
+    ``analyzer`` is either a pipeline or the name of a model in the shared
+    ``model_registry``; named models are only resolved on first use.
+    """
+
+    def __init__(
+        self,
+        analyzer,
+        batch_size=DEFAULT_BATCH_SIZE,
+        max_length=DEFAULT_MAX_LENGTH,
+        cache=None,
+        deduplicator=None,
+    ):
+        self._analyzer = analyzer
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.cache = cache  # Optional SentimentCache in front of the model
+        # Optional HeadlineDeduplicator: near-duplicates share one inference
+        self.deduplicator = deduplicator
+        self.inferred = 0  # Headlines actually run through the model
+        self.inference_seconds = 0.0
+        self.near_duplicates_skipped = 0
+        self.logger = logging.getLogger(__name__)
+
+    @property
+    def analyzer(self):
+        if isinstance(self._analyzer, str):
+            self._analyzer = model_registry.get(self._analyzer)
+        return self._analyzer
+
+    @property
+    def seconds_per_inference(self):
+        """Average model time per headline observed so far."""
+        return self.inference_seconds / self.inferred if self.inferred else 0.0
+
+    @property
+    def model_id(self):
+        """Identifies the underlying model so cached scores never cross models."""
+        analyzer = self.analyzer
+        model_id = getattr(analyzer, "sentiment_model_id", None)
+        if model_id:
+            return model_id
+        return getattr(
+            getattr(analyzer, "model", None), "name_or_path", type(analyzer).__name__
+        )
+
+    def score(self, headlines):
+        """
+        Scores a list of headlines and returns one ``{"label", "score"}`` result
+        per headline, in order. Repeated headlines are only run through the
+        model once, and cached headlines are not run through it at all.
+        """
+        unique = list(dict.fromkeys(headlines))
+        results = self.cache.get_many(unique, self.model_id) if self.cache else {}
+        pending = [headline for headline in unique if headline not in results]
+        representatives = (
+            self.deduplicator.representatives(pending)
+            if self.deduplicator and len(pending) > 1
+            else pending
+        )
+        to_run = list(dict.fromkeys(representatives))
+        self.near_duplicates_skipped += len(pending) - len(to_run)
+        outputs_by_headline = {}
+
+        start = time.perf_counter()
+        for i in range(0, len(to_run), self.batch_size):
+            chunk = to_run[i : i + self.batch_size]
+            outputs = self.analyzer(
+                chunk,
+                batch_size=self.batch_size,
+                padding=True,
+                truncation=True,
+                max_length=self.max_length,
+            )
+            outputs_by_headline.update(zip(chunk, outputs))
+        if to_run:
+            self.inference_seconds += time.perf_counter() - start
+            self.inferred += len(to_run)
+
+        scored = {
+            headline: outputs_by_headline[representative]
+            for headline, representative in zip(pending, representatives)
+        }
+
+        if self.cache and to_run:
+            # Only model outputs are cached under a headline's exact text; a
+            # near-duplicate borrowing its representative's result is not
+            self.cache.set_many(
+                {headline: outputs_by_headline[headline] for headline in to_run},
+                self.model_id,
+            )
+        results.update(scored)
+        return [results[headline] for headline in headlines]
+
+    def score_items(self, news_data):
+        """Scores a list of news items; items without a headline map to None."""
+        return self.score_by_symbol({None: news_data})[None]
+
+    def score_by_symbol(self, news_by_symbol):
+        """
+        Scores every headline for every symbol in shared batches and maps the
+        results back to ``{symbol: [result or None per news item]}``.
+        """
+        headlines = []
+        for news_data in news_by_symbol.values():
+            for news in news_data:
+                headline = extract_headline(news)
+                if headline:
+                    headlines.append(headline)
+
+        scored = iter(self.score(headlines))
+        self.logger.debug(
+            f"Scored {len(headlines)} headlines for {len(news_by_symbol)} symbols."
+        )
+
+        return {
+            symbol: [
+                next(scored) if extract_headline(news) else None for news in news_data
+            ]
+            for symbol, news_data in news_by_symbol.items()
+        }
@@ -0,0 +1,154 @@
+import hashlib
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+DEFAULT_CACHE_PATH = "data/sentiment_cache.sqlite3"
+DEFAULT_MEMORY_SIZE = 20000  # Entries kept in the in-process LRU
+DEFAULT_MAX_ENTRIES = 1000000  # Rows kept on disk before the oldest are evicted
+DEFAULT_MAX_AGE_DAYS = 30  # Rows older than this are evicted
+EVICTION_INTERVAL = 5000  # Writes between on-disk eviction passes
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_headline(headline):
+    """Normalizes unicode, case and whitespace so trivially different copies match."""
+    headline = unicodedata.normalize("NFKC", headline)
+    return _WHITESPACE.sub(" ", headline).strip().lower()
+
+
+def headline_key(headline, model_id):
+    """Hashes a normalized headline together with the model that scored it."""
+    payload = f"{model_id}\0{normalize_headline(headline)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SentimentCache:
+    """
+    Memoizes sentiment model outputs by headline content.
+
+    Lookups go through an in-memory LRU first and an on-disk SQLite store
+    second, so results survive restarts. The disk store is bounded by entry
+    count and age; both limits are enforced periodically on write.
+    """
+
+    def __init__(
+        self,
+        path=DEFAULT_CACHE_PATH,
+        memory_size=DEFAULT_MEMORY_SIZE,
+        max_entries=DEFAULT_MAX_ENTRIES,
+        max_age_days=DEFAULT_MAX_AGE_DAYS,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.memory_size = memory_size
+        self.max_entries = max_entries
+        self.max_age_seconds = max_age_days * 86400
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()  # Scoring may run on worker threads
+        self.hits = 0
+        self.misses = 0
+        self.writes_since_eviction = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS sentiment ("
+            "key TEXT PRIMARY KEY, label TEXT NOT NULL, score REAL NOT NULL, "
+            "created_at REAL NOT NULL)"
+        )
+        self.conn.execute(
+            "CREATE INDEX IF NOT EXISTS sentiment_created_at ON sentiment (created_at)"
+        )
+        self.conn.commit()
+        self.evict()
+
+    def _remember(self, key, result):
+        self.memory[key] = result
+        self.memory.move_to_end(key)
+        if len(self.memory) > self.memory_size:
+            self.memory.popitem(last=False)
+
+    def get_many(self, headlines, model_id):
+        """Returns ``{headline: result}`` for every headline already scored."""
+        keys = {headline_key(headline, model_id): headline for headline in headlines}
+        found = {}
+
+        with self.lock:
+            missing = []
+            for key, headline in keys.items():
+                if key in self.memory:
+                    self.memory.move_to_end(key)
+                    found[headline] = self.memory[key]
+                else:
+                    missing.append(key)
+
+            cutoff = time.time() - self.max_age_seconds
+            for i in range(0, len(missing), 500):  # Stay under SQLite's variable limit
+                chunk = missing[i : i + 500]
+                rows = self.conn.execute(
+                    "SELECT key, label, score FROM sentiment "
+                    f"WHERE key IN ({','.join('?' * len(chunk))}) AND created_at >= ?",
+                    (*chunk, cutoff),
+                ).fetchall()
+                for key, label, score in rows:
+                    result = {"label": label, "score": score}
+                    self._remember(key, result)
+                    found[keys[key]] = result
+
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+
+        return found
+
+    def set_many(self, results, model_id):
+        """Stores ``{headline: result}`` model outputs."""
+        now = time.time()
+        rows = []
+        with self.lock:
+            for headline, result in results.items():
+                key = headline_key(headline, model_id)
+                self._remember(key, result)
+                rows.append((key, result["label"], float(result["score"]), now))
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO sentiment VALUES (?, ?, ?, ?)", rows
+            )
+            self.conn.commit()
+            self.writes_since_eviction += len(rows)
+
+        if self.writes_since_eviction >= EVICTION_INTERVAL:
+            self.evict()
+
+    def evict(self):
+        """Drops on-disk entries that are too old or beyond the size limit."""
+        with self.lock:
+            self.conn.execute(
+                "DELETE FROM sentiment WHERE created_at < ?",
+                (time.time() - self.max_age_seconds,),
+            )
+            self.conn.execute(
+                "DELETE FROM sentiment WHERE key IN (SELECT key FROM sentiment "
+                "ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self.conn.commit()
+            self.writes_since_eviction = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def close(self):
+        """Closes the on-disk store."""
+        with self.lock:
+            self.conn.close()
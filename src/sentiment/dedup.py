@@ -0,0 +1,170 @@
+import logging
+import re
+import zlib
+
+import numpy as np
+
+from src.sentiment.batch_scorer import extract_headline
+from src.sentiment.cache import normalize_headline
+from src.sentiment.vectorized_scoring import DEFAULT_CREDIBLE_SOURCES
+
+DEFAULT_THRESHOLD = 0.8  # Min Jaccard similarity of two near-duplicate headlines
+NUM_PERMUTATIONS = 64  # MinHash signature length
+NUM_BANDS = 16  # LSH bands; 4 rows each, catching pairs above ~0.5 similarity
+_PRIME = np.uint64(4294967291)  # Largest prime below 2**32
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_rng = np.random.default_rng(20240101)  # Fixed seed keeps clustering reproducible
+_A = _rng.integers(1, int(_PRIME), NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.integers(0, int(_PRIME), NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(headline):
+    """Splits a headline into its set of normalized words."""
+    return set(_TOKEN.findall(normalize_headline(headline))) or {""}
+
+
+def minhash(headlines):
+    """Returns a ``(len(headlines), NUM_PERMUTATIONS)`` MinHash signature matrix."""
+    hashes, lengths = [], []
+    for headline in headlines:
+        words = shingles(headline)
+        lengths.append(len(words))
+        # CRC32 is stable across processes (the builtin str hash is salted
+        # per process) and far cheaper than a cryptographic digest
+        hashes.extend(zlib.crc32(word.encode()) for word in words)
+
+    # Universal hashing (a*h + b) mod p stands in for each permutation; with
+    # 32-bit a, b, h and p the product stays inside uint64 without overflow
+    permuted = (np.array(hashes, dtype=np.uint64)[:, None] * _A + _B) % _PRIME
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1])).astype(np.int64)
+    return np.minimum.reduceat(permuted, starts, axis=0)
+
+
+def is_copy(tokens, other, threshold):
+    """
+    True if one headline's words appear unchanged and in order inside the
+    other's, making up at least ``threshold`` of its distinct words, as when a
+    syndicated copy adds a source tag. A changed word (say "rise" for "fall")
+    never counts as a copy, however similar the rest.
+    """
+    short, long = sorted((tokens, other), key=len)
+    if not short or len(set(short)) < threshold * len(set(long)):
+        return False
+    return f" {' '.join(short)} " in f" {' '.join(long)} "
+
+
+class HeadlineDeduplicator:
+    """
+    Clusters near-duplicate headlines with MinHash signatures and an LSH index.
+
+    Signatures are split into bands; headlines whose band hashes collide are
+    compared by the fraction of matching signature entries (an estimate of
+    their word-set Jaccard similarity). Pairs reaching ``threshold`` are
+    confirmed with ``is_copy``, so only syndicated copies of one story merge,
+    not differently worded stories that share most words. Clusters form
+    around one headline that every member was confirmed against directly;
+    similarity is never chained through intermediate headlines.
+    """
+
+    def __init__(
+        self,
+        threshold=DEFAULT_THRESHOLD,
+        credible_sources=DEFAULT_CREDIBLE_SOURCES,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.threshold = threshold
+        self.credible_sources = set(credible_sources)
+        self.last_stats = {"items": 0, "kept": 0, "ratio": 0.0}
+
+    def cluster(self, headlines):
+        """Returns an array assigning each headline an id shared by its cluster."""
+        if len(headlines) < 2:
+            return np.arange(len(headlines))
+
+        # Exact copies (after normalization) are merged up front
+        normalized = [normalize_headline(headline) for headline in headlines]
+        unique, first = np.unique(
+            np.array(normalized, dtype=object), return_inverse=True
+        )
+        signatures = minhash(list(unique))
+        tokens = [_TOKEN.findall(headline) for headline in unique]
+        copies = [[] for _ in range(len(unique))]
+
+        rows = NUM_PERMUTATIONS // NUM_BANDS
+        for band in range(NUM_BANDS):
+            block = np.ascontiguousarray(signatures[:, band * rows : (band + 1) * rows])
+            _, buckets = np.unique(
+                block.view(np.dtype((np.void, block.dtype.itemsize * rows))).ravel(),
+                return_inverse=True,
+            )
+            order = np.argsort(buckets, kind="stable")
+            sorted_buckets = buckets[order]
+            is_first = np.concatenate(
+                ([True], sorted_buckets[1:] != sorted_buckets[:-1])
+            )
+            # Compare each member to its bucket's first entry: linear in bucket
+            # size, and the other bands pick up the remaining pairs
+            heads = order[np.flatnonzero(is_first)[np.cumsum(is_first) - 1]]
+            members = ~is_first
+            similarity = (
+                signatures[order[members]] == signatures[heads[members]]
+            ).mean(axis=1)
+            matched = similarity >= self.threshold
+            for member, head in zip(order[members][matched], heads[members][matched]):
+                if is_copy(tokens[member], tokens[head], self.threshold):
+                    copies[member].append(head)
+                    copies[head].append(member)
+
+        labels = np.full(len(unique), -1)
+        for i in range(len(unique)):
+            if labels[i] < 0:
+                labels[i] = i
+                for j in copies[i]:
+                    if labels[j] < 0:
+                        labels[j] = i
+        return labels[first]
+
+    def _rank(self, news, position):
+        """Sort key preferring credible sources, then the earliest copy."""
+        return (news.get("source", "") not in self.credible_sources, position)
+
+    def collapse(self, news_by_symbol):
+        """
+        Keeps one item per near-duplicate cluster for each symbol, preferring the
+        most credible source, and returns the reduced ``{symbol: [news]}``.
+        """
+        flat = [
+            (symbol, position, news)
+            for symbol, news_data in news_by_symbol.items()
+            for position, news in enumerate(news_data)
+            if extract_headline(news)
+        ]
+        labels = self.cluster([extract_headline(news) for _, _, news in flat])
+
+        best = {}
+        for (symbol, position, news), label in zip(flat, labels):
+            key = (symbol, label)
+            if key not in best or self._rank(news, position) < self._rank(*best[key]):
+                best[key] = (news, position)
+
+        collapsed = {symbol: [] for symbol in news_by_symbol}
+        for (symbol, _), (news, position) in sorted(
+            best.items(), key=lambda entry: entry[1][1]
+        ):
+            collapsed[symbol].append(news)
+
+        self.last_stats = {
+            "items": len(flat),
+            "kept": len(best),
+            "ratio": 1 - len(best) / len(flat) if flat else 0.0,
+        }
+        return collapsed
+
+    def representatives(self, headlines):
+        """Maps each headline to the first headline of its near-duplicate cluster."""
+        labels = self.cluster(headlines)
+        first = {}
+        for headline, label in zip(headlines, labels):
+            first.setdefault(label, headline)
+        return [first[label] for label in labels]
@@ -0,0 +1,188 @@
+import asyncio
+import logging
+import math
+import multiprocessing
+import multiprocessing.util
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from src.utils.rate_limiter import build_rate_limiters
+
+DEFAULT_RATE_LIMITS = {
+    "finnhub": 150,  # Requests per minute, shared by every shard on every host
+    "alpha_vantage": 75,
+}
+
+_worker_engine = None  # One engine per worker process, reused across scans
+# The engine's sessions, limiters and refresh tasks are bound to the loop they
+# were first used on, so every scan in a worker runs on this same loop
+_worker_loop = None
+
+
+def shard_of(symbol, shard_count):
+    """Stable shard index for ``symbol``; identical on every host and run."""
+    return zlib.crc32(symbol.encode()) % shard_count
+
+
+def partition(stock_list, shard_count):
+    """Splits ``stock_list`` into ``shard_count`` lists, keeping input order."""
+    shards = [[] for _ in range(shard_count)]
+    for symbol in stock_list:
+        shards[shard_of(symbol, shard_count)].append(symbol)
+    return shards
+
+
+def shard_rate_limits(rate_limits, shard_count):
+    """Divides each per-minute API quota evenly between ``shard_count`` shards."""
+    shares = {api: limit / shard_count for api, limit in rate_limits.items()}
+    starved = [api for api, share in shares.items() if share < 1]
+    if starved:
+        raise ValueError(
+            f"{shard_count} shards leave less than one request per minute "
+            f"each for {starved}"
+        )
+    return shares
+
+
+def default_engine_factory(rate_limiters):
+    """Builds a TradeSignalEngine whose clients use the shard's rate limiters."""
+    from src.api.alpha_vantage_client import AlphaVantageClient
+    from src.api.finnhub_client import FinnhubClient
+    from src.sentiment.cache import SentimentCache
+    from src.trade_signal_engine import TradeSignalEngine
+
+    return TradeSignalEngine(
+        FinnhubClient(rate_limiter=rate_limiters["finnhub"]),
+        AlphaVantageClient(rate_limiter=rate_limiters["alpha_vantage"]),
+        sentiment_cache=SentimentCache(),  # WAL mode lets processes share it
+    )
+
+
+def _close_worker():
+    """Closes the worker's sessions on the loop that opened them."""
+    try:
+        _worker_loop.run_until_complete(_worker_engine.close())
+    finally:
+        _worker_loop.close()
+
+
+def scan_shard(engine_factory, shard_limits, symbols):
+    """
+    Worker-process entry point: scans one shard with an engine built once per
+    process by ``engine_factory(rate_limiters)`` and returns its signals and
+    scan stats. The engine and its event loop live until the process exits.
+    """
+    global _worker_engine, _worker_loop
+    if _worker_engine is None:
+        logging.basicConfig(
+            level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+        )
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+        _worker_engine = engine_factory(build_rate_limiters(shard_limits))
+        # Pool workers exit without running atexit hooks; finalizers still run
+        multiprocessing.util.Finalize(None, _close_worker, exitpriority=10)
+
+    signals = _worker_loop.run_until_complete(_worker_engine.run(symbols))
+    return signals, _worker_engine.last_scan_stats
+
+
+class ShardedScanner:
+    """
+    Scans a universe across worker processes, and optionally across hosts.
+
+    Symbols are assigned to ``host_count * workers`` global shards by a stable
+    hash; this host runs the ``workers`` shards at ``host_index``. Each shard
+    gets an equal slice of every API quota, so the fleet as a whole stays
+    within ``rate_limits``; ``workers`` is capped so every shard keeps at
+    least one request per minute of each quota. Workers build their engines once with
+    ``engine_factory`` (a picklable callable taking ``{api: TokenBucket}``),
+    which is also where mock providers plug in for tests.
+    """
+
+    def __init__(
+        self,
+        workers=None,
+        engine_factory=default_engine_factory,
+        rate_limits=DEFAULT_RATE_LIMITS,
+        host_index=0,
+        host_count=1,
+    ):
+        if not 0 <= host_index < host_count:
+            raise ValueError("host_index must lie in [0, host_count)")
+
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers or multiprocessing.cpu_count()
+        quota_workers = max(1, math.floor(min(rate_limits.values()) / host_count))
+        if self.workers > quota_workers:
+            self.logger.warning(
+                f"Capping {self.workers} workers at {quota_workers}: more shards "
+                f"would each get less than one request per minute."
+            )
+            self.workers = quota_workers
+        self.engine_factory = engine_factory
+        self.host_index = host_index
+        self.host_count = host_count
+        self.shard_count = self.workers * host_count
+        self.shard_limits = shard_rate_limits(rate_limits, self.shard_count)
+        self.pool = None  # Started on first scan
+        self.last_shard_stats = []
+
+    def _get_pool(self):
+        if self.pool is None:
+            # Spawned rather than forked: torch and open sockets don't survive fork
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self.pool
+
+    def local_shards(self, stock_list):
+        """Returns the shards of ``stock_list`` that this host is responsible for."""
+        shards = partition(stock_list, self.shard_count)
+        first = self.host_index * self.workers
+        return shards[first : first + self.workers]
+
+    async def scan(self, stock_list):
+        """Scans this host's shards in parallel and returns their merged signals."""
+        started = time.perf_counter()
+        shards = [shard for shard in self.local_shards(stock_list) if shard]
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    pool, scan_shard, self.engine_factory, self.shard_limits, shard
+                )
+                for shard in shards
+            ),
+            return_exceptions=True,
+        )
+
+        signals, self.last_shard_stats = [], []
+        for shard, result in zip(shards, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Shard of {len(shard)} symbols failed: {result}")
+                continue
+            shard_signals, stats = result
+            signals.extend(shard_signals)
+            self.last_shard_stats.append(stats)
+
+        # Merge back into universe order so output doesn't depend on sharding
+        position = {symbol: i for i, symbol in enumerate(stock_list)}
+        signals.sort(key=lambda signal: position[signal["symbol"]])
+
+        self.logger.info(
+            f"Host {self.host_index + 1}/{self.host_count} scanned "
+            f"{sum(len(shard) for shard in shards)} symbols in {len(shards)} shards: "
+            f"{len(signals)} signals in {time.perf_counter() - started:.2f}s."
+        )
+        return signals
+
+    def close(self):
+        """Stops the worker processes."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
@@ -3,6 +3,7 @@ import logging
 import numpy as np
 from src.api.alpha_vantage_client import AlphaVantageClient
 from src.api.finnhub_client import FinnhubClient
+from src.api.quote_service import QuoteService
 from src.database.db_connector import DatabaseConnector
 
 
@@ -16,7 +17,11 @@ class StockSelection:
         database: DatabaseConnector,
         config,
     ):
-        self.finnhub = finnhub
+        # Quotes go through a coalescing service, shared with other components
+        # when one is passed in
+        self.finnhub = (
+            finnhub if isinstance(finnhub, QuoteService) else QuoteService(finnhub)
+        )
         self.alpha_vantage = alpha_vantage
         self.database = database
         self.config = config["stock_selection"]
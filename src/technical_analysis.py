@@ -4,6 +4,17 @@ import numpy as np
 import torch
 import torch.nn as nn
 
+from src.utils.inference_executor import get_inference_executor
+from src.utils.model_registry import model_registry
+
+WINDOW = 50  # Bars per pattern window, fixed by fc1's input size
+PATTERNS = ["Bullish", "Neutral", "Bearish"]
+INSUFFICIENT_DATA = "Insufficient Data"
+DEFAULT_PATTERN_BATCH_SIZE = 512  # Windows per forward pass in analyze_universe
+# eager is the reference; torchscript freezes the graph and folds constants;
+# quantized runs the Linear layers (most of the weights) in dynamic int8
+MODEL_VARIANTS = ("eager", "torchscript", "quantized")
+
 
 class CNNPatternRecognition(nn.Module):
     """CNN model for recognizing candlestick patterns in stock charts."""
@@ -28,33 +39,152 @@ class CNNPatternRecognition(nn.Module):
         return x
 
 
+def load_cnn_model(model_path):
+    """Loads trained CNN weights and puts the model in evaluation mode."""
+    model = CNNPatternRecognition()
+    model.load_state_dict(torch.load(model_path))  # Load trained model
+    model.eval()
+    return model
+
+
+def optimize_cnn_model(model, variant="eager"):
+    """Returns an inference-only copy of an eval-mode CNN for ``variant``."""
+    if variant not in MODEL_VARIANTS:
+        raise ValueError(
+            f"Unknown CNN model variant '{variant}', use one of {MODEL_VARIANTS}"
+        )
+    if variant == "torchscript":
+        return torch.jit.freeze(torch.jit.script(model.eval()))
+    if variant == "quantized":
+        return torch.ao.quantization.quantize_dynamic(
+            model, {nn.Linear}, dtype=torch.qint8
+        )
+    return model
+
+
+def cnn_model_name(model_path, variant="eager"):
+    """Registry name for the CNN weights stored at ``model_path``."""
+    name = f"cnn-pattern:{model_path}"
+    return name if variant == "eager" else f"{name}@{variant}"
+
+
+def stack_windows(series_by_symbol):
+    """
+    Stacks the latest ``WINDOW`` bars of every long-enough series into one
+    ``(N, 1, WINDOW)`` float32 array. Returns the symbols in row order and the
+    symbols skipped for having too little history.
+    """
+    symbols, skipped, windows = [], [], []
+    for symbol, series in series_by_symbol.items():
+        if len(series) < WINDOW:
+            skipped.append(symbol)
+            continue
+        symbols.append(symbol)
+        windows.append(np.asarray(series[-WINDOW:], dtype=np.float32))
+    stacked = np.stack(windows) if windows else np.empty((0, WINDOW), np.float32)
+    return symbols, skipped, stacked[:, None, :]
+
+
+def predict_patterns(model, windows, batch_size=DEFAULT_PATTERN_BATCH_SIZE):
+    """Returns each window's pattern index, running ``batch_size`` rows per pass."""
+    predictions = np.empty(len(windows), dtype=np.int64)
+    # No autograd graph or version counters: nothing here is ever trained
+    with torch.inference_mode():
+        for start in range(0, len(windows), batch_size):
+            batch = torch.from_numpy(windows[start : start + batch_size])
+            predictions[start : start + len(batch)] = model(batch).argmax(dim=1).numpy()
+    return predictions
+
+
 class TechnicalAnalysis:
     """Uses AI for candlestick pattern recognition and trend prediction."""
 
-    def __init__(self, config):
+    def __init__(
+        self,
+        config,
+        inference_executor=None,
+        batch_size=DEFAULT_PATTERN_BATCH_SIZE,
+    ):
         self.logger = logging.getLogger(__name__)
-        self.model = CNNPatternRecognition()
-        self.model.load_state_dict(
-            torch.load(config["ai"]["model_path"])
-        )  # Load trained model
-        self.model.eval()
+        self.inference_executor = inference_executor or get_inference_executor()
+        self.batch_size = batch_size
+        model_path = config["ai"]["model_path"]
+        # Shared process-wide so every consumer of the same weights reuses one copy
+        self.model = model_registry.get(
+            cnn_model_name(model_path), lambda: load_cnn_model(model_path)
+        )
+        # Universe scans may run an optimized copy; single-stock calls stay eager
+        variant = config["ai"].get("model_variant", "eager")
+        self.universe_model = model_registry.get(
+            cnn_model_name(model_path, variant),
+            lambda: optimize_cnn_model(load_cnn_model(model_path), variant),
+        )
 
     def predict_pattern(self, historical_data):
         """Predicts if a stock is in a bullish, neutral, or bearish pattern."""
         data_tensor = (
             torch.tensor(historical_data, dtype=torch.float32).unsqueeze(0).unsqueeze(0)
         )  # Reshape for CNN
-        output = self.model(data_tensor)
+        with torch.inference_mode():
+            output = self.model(data_tensor)
         prediction = torch.argmax(output, dim=1).item()
-        return ["Bullish", "Neutral", "Bearish"][prediction]
+        return PATTERNS[prediction]
 
     def analyze_stock(self, stock_data):
         """Runs AI-based pattern recognition on stock price history."""
-        if len(stock_data) < 50:
+        if len(stock_data) < WINDOW:
             self.logger.warning("Not enough data for pattern recognition.")
-            return "Insufficient Data"
+            return INSUFFICIENT_DATA
+
+        return self.predict_pattern(stock_data[-WINDOW:])
+
+    async def analyze_stock_async(self, stock_data):
+        """Runs ``analyze_stock`` on the inference executor, off the event loop."""
+        return await self.inference_executor.run(self.analyze_stock, stock_data)
 
-        return self.predict_pattern(stock_data)
+    def analyze_universe(self, series_by_symbol):
+        """
+        Classifies the latest ``WINDOW`` bars of every symbol in batched forward
+        passes and returns ``{symbol: pattern}``, in input order.
+        """
+        symbols, skipped, windows = stack_windows(series_by_symbol)
+        if skipped:
+            self.logger.warning(
+                f"Not enough data for pattern recognition on {len(skipped)} stocks."
+            )
+
+        predictions = predict_patterns(self.universe_model, windows, self.batch_size)
+        patterns = dict(zip(symbols, (PATTERNS[p] for p in predictions)))
+        return {
+            symbol: patterns.get(symbol, INSUFFICIENT_DATA)
+            for symbol in series_by_symbol
+        }
+
+    def analyze_store(self, store):
+        """
+        Classifies the latest ``WINDOW`` closes of every symbol in a
+        FeatureStore, reading its ring buffer in place rather than copying
+        histories. Returns ``{symbol: pattern}`` in store order.
+        """
+        complete = store.complete(WINDOW)
+        if not complete.any():
+            return dict.fromkeys(store.symbols, INSUFFICIENT_DATA)
+
+        # Rows with gaps run too (NaN in, NaN out) so the view is never copied
+        windows = np.asarray(store.window("close", WINDOW), dtype=np.float32)
+        predictions = predict_patterns(
+            self.universe_model, windows[:, None, :], self.batch_size
+        )
+        return {
+            symbol: PATTERNS[prediction] if ok else INSUFFICIENT_DATA
+            for symbol, prediction, ok in zip(store.symbols, predictions, complete)
+        }
+
+    async def analyze_universe_async(self, series_by_symbol):
+        """Runs ``analyze_universe`` on the inference executor, off the event loop."""
+        return await self.inference_executor.run(
+            self.analyze_universe, series_by_symbol
+        )
 
 
 # Usage Example:
@@ -1,46 +1,146 @@
 import asyncio
-import datetime
 import logging
-import numpy as np
-from transformers import pipeline  # Hugging Face BERT for sentiment analysis
+import time
 from src.api.alpha_vantage_client import AlphaVantageClient
 from src.api.finnhub_client import FinnhubClient
+from src.api.quote_service import QuoteService
+from src.sentiment.batch_scorer import DEFAULT_BATCH_SIZE, BatchSentimentScorer
+from src.sentiment.dedup import HeadlineDeduplicator
+from src.sentiment.vectorized_scoring import VectorizedNewsScorer
+from src.universe_snapshot import (
+    ENTRY_HIGH_MULTIPLIER,
+    NEWS_STALENESS_HALF_LIFE,
+    PRICE_TO_HIGH_RATIO,
+    QUOTE_STALENESS_HALF_LIFE,
+    SENTIMENT_THRESHOLD,
+    STOP_LOSS_MULTIPLIER,
+    TAKE_PROFIT_MULTIPLIER,
+    SignalRules,
+    UniverseSnapshot,
+)
+from src.utils.adaptive_concurrency import AdaptiveConcurrency
+from src.utils.inference_executor import get_inference_executor
+from src.utils.model_registry import SENTIMENT_MODEL
+from src.utils.stale_while_revalidate import staleness_discount, staleness_of
+
+STREAM_FETCH_WORKERS = 10  # Concurrent quote and news requests per stage
+STREAM_QUEUE_SIZE = 64  # Bounds each stage's backlog between stages
+STREAM_BATCH_WAIT = 0.05  # Seconds to gather more headlines into one batch
+
+_DONE = object()  # Marks the end of a pipeline stage's output
+
+
+def price_confirms(stock):
+    """Checks the price half of the signal rule: trading near the day's high."""
+    return stock["current_price"] > stock["high_price"] * PRICE_TO_HIGH_RATIO
+
+
+def evaluate_signal(stock, sentiment_score, news_staleness=0.0):
+    """
+    Applies the BUY rule to one stock, returning its trade signal or None.
+    Whole universes go through ``SignalRules`` instead, which matches this.
+    """
+    if not price_confirms(stock) or sentiment_score <= SENTIMENT_THRESHOLD:
+        return None
+
+    return {
+        "symbol": stock["symbol"],
+        "action": "BUY",
+        "entry_range": (
+            stock["current_price"],
+            stock["high_price"] * ENTRY_HIGH_MULTIPLIER,
+        ),
+        "stop_loss": stock["low_price"] * STOP_LOSS_MULTIPLIER,
+        "take_profit": stock["current_price"] * TAKE_PROFIT_MULTIPLIER,
+        # Stale quotes or news served during a provider outage count for less
+        "confidence": sentiment_score
+        * staleness_discount(staleness_of(stock), QUOTE_STALENESS_HALF_LIFE)
+        * staleness_discount(news_staleness, NEWS_STALENESS_HALF_LIFE),
+    }
 
 
 class TradeSignalEngine:
     """Processes stock data, news sentiment, and AI analysis to generate high-confidence trade signals."""
 
-    def __init__(self, finnhub: FinnhubClient, alpha_vantage: AlphaVantageClient):
-        self.finnhub = finnhub
+    def __init__(
+        self,
+        finnhub: FinnhubClient,
+        alpha_vantage: AlphaVantageClient,
+        sentiment_batch_size=DEFAULT_BATCH_SIZE,
+        sentiment_cache=None,
+        inference_executor=None,
+        deduplicate_news=True,
+    ):
+        # Quotes go through a coalescing service, shared with other components
+        # when one is passed in
+        self.finnhub = (
+            finnhub if isinstance(finnhub, QuoteService) else QuoteService(finnhub)
+        )
         self.alpha_vantage = alpha_vantage
         self.logger = logging.getLogger(__name__)
-        self.sentiment_analyzer = pipeline("sentiment-analysis")  # Using BERT NLP model
+        # Syndicated near-duplicate stories are collapsed before inference
+        self.deduplicator = HeadlineDeduplicator() if deduplicate_news else None
+        # Using BERT NLP model, shared process-wide and loaded on first use
+        self.sentiment_scorer = BatchSentimentScorer(
+            SENTIMENT_MODEL,
+            batch_size=sentiment_batch_size,
+            cache=sentiment_cache,
+            deduplicator=self.deduplicator,
+        )
+        # Recency decays over a week; Reuters/Bloomberg/CNBC count as credible
+        self.news_scorer = VectorizedNewsScorer()
+        # Model inference runs on worker threads so network I/O keeps flowing
+        self.inference_executor = inference_executor or get_inference_executor()
+        # Quote requests in flight adapt to provider latency and 429s, and the
+        # learned limit carries over from one scan to the next
+        self.fetch_concurrency = AdaptiveConcurrency()
+        self.signal_rules = SignalRules()
+        self.last_snapshot = None  # Columnar view of the latest scan, for reuse
+        self.last_scan_stats = None  # Timing of the most recent run()/run_streaming()
 
-    async def fetch_market_data(self, stock_list):
-        """Fetch real-time stock data in batches to avoid rate limits."""
-        batch_size = 10
-        market_data = []
+    @property
+    def sentiment_analyzer(self):
+        return self.sentiment_scorer.analyzer
 
-        for i in range(0, len(stock_list), batch_size):
-            batch = stock_list[i : i + batch_size]
-            self.logger.info(f"Fetching market data for batch {i // batch_size + 1} of {len(stock_list) // batch_size + 1}...")
+    async def close(self):
+        """Closes the API clients' pooled sessions."""
+        await self.finnhub.close()
+        await self.alpha_vantage.close()
 
-            tasks = [self.finnhub.get_stock_price(stock) for stock in batch]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+    async def fetch_market_data(self, stock_list):
+        """Fetch real-time stock data, adapting how many requests are in flight."""
+        await self.finnhub.prefetch(stock_list)
+        quotes = {}
+        missing = []
+        for symbol in stock_list:
+            quote = self.finnhub.peek(symbol)
+            if quote:
+                quotes[symbol] = quote
+            else:
+                missing.append(symbol)
 
-            for stock, result in zip(batch, results):
-                if isinstance(result, Exception):
-                    self.logger.warning(f"Error fetching data for {stock}: {result}")
-                else:
-                    market_data.append(result)
+        # Only real provider calls go through the controller, so instant
+        # snapshot hits don't skew its latency baseline
+        async for stock, result in self.fetch_concurrency.map(
+            self.finnhub.get_stock_price, missing
+        ):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Error fetching data for {stock}: {result}")
+            else:
+                quotes[stock] = result
 
-        self.logger.info(f"Fetched market data for {len(market_data)} stocks.")
+        market_data = [quotes[symbol] for symbol in stock_list if symbol in quotes]
+        self.logger.info(
+            f"Fetched market data for {len(market_data)} stocks, "
+            f"{len(stock_list) - len(missing)} from the quote snapshot "
+            f"(concurrency limit now {self.fetch_concurrency.window})."
+        )
         return market_data
 
     async def fetch_news_sentiment(self, stock_list):
         """Fetch sentiment analysis for news related to the given stock list."""
         self.logger.info(f"Fetching news sentiment for {len(stock_list)} stocks...")
-        news_sentiment = self.alpha_vantage.get_news_sentiment(stock_list)
+        news_sentiment = await self.alpha_vantage.get_news_sentiment(stock_list)
 
         if not news_sentiment:
             self.logger.warning("No news sentiment data returned.")
@@ -48,98 +148,303 @@ class TradeSignalEngine:
         self.logger.info(f"Fetched sentiment for {len(news_sentiment)} stocks.")
         return news_sentiment
 
-    def calculate_trade_influence_score(self, news_data):
-        """Assigns a 0-100% Trade Influence Score based on sentiment, credibility, recency, and historical impact."""
-        score = 0
+    def calculate_trade_influence_score(self, news_data, sentiments=None):
+        """
+        Assigns a 0-100% Trade Influence Score based on sentiment, credibility,
+        recency, and historical impact.
+
+        ``sentiments`` holds precomputed model outputs aligned with ``news_data``;
+        when omitted, the headlines are scored here in one batch.
+        """
         if not news_data:
-            return score  # No impact if no news is available
+            return 0  # No impact if no news is available
 
-        sentiment_scores = []
-        for news in news_data:
-            headline = news.get("headline") or news.get("title")  # ✅ Use "title" if "headline" is missing
-            if not headline:
-                self.logger.warning(f"Skipping news entry without headline/title: {news}")
-                continue
+        if sentiments is None:
+            sentiments = self.sentiment_scorer.score_items(news_data)
 
-            sentiment = self.sentiment_analyzer(headline)[0]
-            sentiment_strength = sentiment["score"]
-            recency_weight = max(
-                0,
-                1 - ((datetime.datetime.utcnow() - news.get("date", datetime.datetime.utcnow())).days / 7),
-            )  # Decay over a week
-            credibility_weight = (
-                1.0 if news.get("source", "") in ["Reuters", "Bloomberg", "CNBC"] else 0.5
-            )
-            historical_impact = (
-                0.8 if "earnings" in headline.lower() else 0.5
-            )  # Higher impact for earnings
-
-            trade_score = (
-                sentiment_strength
-                * recency_weight
-                * credibility_weight
-                * historical_impact
-                * 100
-            )
-            sentiment_scores.append(trade_score)
+        return self.news_scorer.score({None: news_data}, {None: sentiments})[None]
 
-        return round(np.mean(sentiment_scores), 2) if sentiment_scores else 0
+    def score_news_sentiment(self, news_sentiment):
+        """
+        Scores every headline for every symbol in shared batches and returns
+        each symbol's Trade Influence Score.
+        """
+        if not self.deduplicator:
+            sentiments = self.sentiment_scorer.score_by_symbol(news_sentiment)
+            return self.news_scorer.score(news_sentiment, sentiments)
 
-    def generate_trade_signals(self, market_data, news_sentiment):
-        """Generates trade signals based on price trends, sentiment, and AI-based pattern detection."""
-        trade_signals = []
+        skipped_before = self.sentiment_scorer.near_duplicates_skipped
+        news_sentiment = self.deduplicator.collapse(news_sentiment)
+        sentiments = self.sentiment_scorer.score_by_symbol(news_sentiment)
 
-        for stock in market_data:
-            if not stock:
-                continue  # Skip invalid data
+        stats = self.deduplicator.last_stats
+        saved = stats["items"] - stats["kept"]
+        saved += self.sentiment_scorer.near_duplicates_skipped - skipped_before
+        self.logger.info(
+            f"Dedup kept {stats['kept']} of {stats['items']} headlines "
+            f"({stats['ratio']:.0%} collapsed), skipping {saved} inferences "
+            f"(~{saved * self.sentiment_scorer.seconds_per_inference:.2f}s saved)."
+        )
+        return self.news_scorer.score(news_sentiment, sentiments)
 
-            sentiment_score = self.calculate_trade_influence_score(
-                news_sentiment.get(stock["symbol"], [])
-            )
+    async def fetch_and_score_news(self, stock_list):
+        """Fetches news and scores it on the inference executor once it arrives."""
+        news_sentiment = await self.fetch_news_sentiment(stock_list)
+        sentiment_scores = await self.inference_executor.run(
+            self.score_news_sentiment, news_sentiment
+        )
+        return news_sentiment, sentiment_scores
 
-            # ✅ Log stock prices and sentiment for debugging
-            self.logger.info(
-                f"Stock: {stock['symbol']}, Price: {stock['current_price']}, High: {stock['high_price']}, Sentiment: {sentiment_score}"
+    def generate_trade_signals(
+        self, market_data, news_sentiment, sentiment_scores=None
+    ):
+        """Generates trade signals based on price trends, sentiment, and AI-based pattern detection."""
+        if sentiment_scores is None:
+            sentiment_scores = self.score_news_sentiment(
+                {
+                    stock["symbol"]: news_sentiment.get(stock["symbol"], [])
+                    for stock in market_data
+                    if stock
+                }
             )
 
-            # ✅ Applied both improvements:
-            # - Lowered Sentiment Threshold to 25 (was 60)
-            # - Increased Market Price Flexibility to 95% of high price (was 98%)
-            if (
-                stock["current_price"] > stock["high_price"] * 0.95
-                and sentiment_score > 25
-            ):
-                trade_signals.append(
-                    {
-                        "symbol": stock["symbol"],
-                        "action": "BUY",
-                        "entry_range": (
-                            stock["current_price"],
-                            stock["high_price"] * 1.02,
-                        ),
-                        "stop_loss": stock["low_price"] * 0.98,
-                        "take_profit": stock["current_price"] * 1.03,
-                        "confidence": sentiment_score,
-                    }
+        # One columnar snapshot per scan, evaluated in a single vectorized pass
+        snapshot = UniverseSnapshot.from_market_data(
+            market_data,
+            sentiment_scores,
+            news_staleness={
+                symbol: staleness_of(items) for symbol, items in news_sentiment.items()
+            },
+        )
+        self.last_snapshot = snapshot
+
+        # ✅ Log stock prices and sentiment for debugging
+        if self.logger.isEnabledFor(logging.DEBUG):
+            for i, symbol in enumerate(snapshot.symbols):
+                self.logger.debug(
+                    f"Stock: {symbol}, Price: {snapshot.current[i]}, "
+                    f"High: {snapshot.high[i]}, Sentiment: {snapshot.sentiment[i]}"
                 )
 
+        trade_signals = self.signal_rules.evaluate(snapshot)
+
         self.logger.info(f"Generated {len(trade_signals)} trade signals.")
         return trade_signals
 
+    def _record_scan(self, mode, symbols, signals, started, first_signal_at):
+        """Stores and logs timing for a finished scan so modes can be compared."""
+        total = time.perf_counter() - started
+        self.last_scan_stats = {
+            "mode": mode,
+            "symbols": symbols,
+            "signals": signals,
+            "time_to_first_signal": (
+                first_signal_at - started if first_signal_at else None
+            ),
+            "total_seconds": total,
+        }
+        first = self.last_scan_stats["time_to_first_signal"]
+        first_text = f"{first:.2f}s" if first is not None else "n/a"
+        self.logger.info(
+            f"{mode.capitalize()} scan of {symbols} stocks: {signals} signals in "
+            f"{total:.2f}s, first signal after {first_text}."
+        )
+
     async def run(self, stock_list):
         """Runs the TradeSignalEngine to fetch data, analyze sentiment, and generate trade signals."""
-        self.logger.info(f"Fetching market data for {len(stock_list)} stocks...")
-        market_data = await self.fetch_market_data(stock_list)
-
-        self.logger.info(f"Fetching news sentiment for {len(stock_list)} stocks...")
-        news_sentiment = await self.fetch_news_sentiment(stock_list)
+        started = time.perf_counter()
+        self.logger.info(
+            f"Fetching market data and news sentiment for {len(stock_list)} stocks..."
+        )
+        # Quotes and news come from different APIs, so fetch them concurrently;
+        # sentiment inference overlaps with any quotes still in flight
+        market_data, (news_sentiment, sentiment_scores) = await asyncio.gather(
+            self.fetch_market_data(stock_list), self.fetch_and_score_news(stock_list)
+        )
 
         self.logger.info(f"Fetched {len(market_data)} market data entries.")
         self.logger.info(f"Fetched sentiment for {len(news_sentiment)} stocks.")
 
         self.logger.info("Generating trade signals...")
-        trade_signals = self.generate_trade_signals(market_data, news_sentiment)
+        trade_signals = self.generate_trade_signals(
+            market_data, news_sentiment, sentiment_scores
+        )
 
-        self.logger.info(f"Generated {len(trade_signals)} trade signals.")
+        # Batch mode only has signals once every stage has finished
+        self._record_scan(
+            "batch",
+            len(stock_list),
+            len(trade_signals),
+            started,
+            time.perf_counter() if trade_signals else None,
+        )
         return trade_signals
 
+    async def _run_stage(self, handler, inbox, outbox, workers):
+        """Feeds ``inbox`` items through ``handler`` on ``workers`` tasks."""
+
+        async def worker():
+            while True:
+                item = await inbox.get()
+                if item is _DONE:
+                    await inbox.put(_DONE)  # Let sibling workers see it too
+                    return
+                result = await handler(item)
+                if result is not None:
+                    await outbox.put(result)
+
+        await asyncio.gather(*(worker() for _ in range(workers)))
+        await outbox.put(_DONE)
+
+    async def _stream_quote(self, symbol):
+        """Fetches one quote, dropping stocks that can't pass the price rule."""
+        try:
+            stock = await self.finnhub.get_stock_price(symbol)
+        except Exception as e:
+            self.logger.warning(f"Error fetching data for {symbol}: {e}")
+            return None
+
+        # Sentiment can't rescue a stock trading too far below its high, so its
+        # news isn't worth an Alpha Vantage request
+        if not stock or not price_confirms(stock):
+            return None
+        return stock
+
+    async def _stream_news(self, stock, sweep):
+        """
+        Looks up the news for a stock that passed the price rule in the shared
+        sweep, fetching it on its own only if the sweep missed it, exactly as
+        ``get_news_sentiment`` does for ``run()``.
+        """
+        symbol = stock["symbol"]
+        news, missing = await sweep
+        if symbol not in missing:
+            return stock, news[symbol]
+        try:
+            return stock, await self.alpha_vantage.get_symbol_news(symbol)
+        except Exception as e:
+            self.logger.warning(f"Error fetching news for {symbol}: {e}")
+            return stock, news[symbol]
+
+    async def _stream_sentiment(self, inbox, outbox, max_wait):
+        """
+        Scores stocks in micro-batches: waits for one stock, then gathers more
+        for up to ``max_wait`` seconds or until a model batch is full.
+        """
+        done = False
+        while not done:
+            item = await inbox.get()
+            if item is _DONE:
+                break
+            batch = [item]
+            headlines = len(item[1])
+            deadline = asyncio.get_running_loop().time() + max_wait
+
+            while headlines < self.sentiment_scorer.batch_size:
+                remaining = deadline - asyncio.get_running_loop().time()
+                # asyncio.wait rather than wait_for: before Python 3.12
+                # wait_for can swallow a cancellation that races a queue item
+                getter = asyncio.ensure_future(inbox.get())
+                try:
+                    ready, _ = await asyncio.wait({getter}, timeout=max(remaining, 0))
+                finally:
+                    if not getter.done():
+                        getter.cancel()
+                if not ready:
+                    break  # Window closed with nothing more to add
+                item = getter.result()
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+                headlines += len(item[1])
+
+            news = {stock["symbol"]: items for stock, items in batch}
+            try:
+                scores = await self.inference_executor.run(
+                    self.score_news_sentiment, news
+                )
+            except Exception as e:
+                self.logger.warning(f"Error scoring news for {list(news)}: {e}")
+                continue
+
+            for stock, items in batch:
+                signal = evaluate_signal(
+                    stock, scores.get(stock["symbol"], 0), staleness_of(items)
+                )
+                if signal:
+                    await outbox.put(signal)
+
+        await outbox.put(_DONE)
+
+    async def run_streaming(
+        self,
+        stock_list,
+        workers=STREAM_FETCH_WORKERS,
+        queue_size=STREAM_QUEUE_SIZE,
+        batch_wait=STREAM_BATCH_WAIT,
+    ):
+        """
+        Scans ``stock_list`` as a pipeline, yielding each trade signal as soon
+        as its stock clears every stage.
+
+        Quote fetch, news lookup and sentiment scoring run as concurrent
+        stages joined by bounded queues, so one stock's headlines are scored
+        while other quotes are still arriving. News comes from the same
+        market-wide sweep ``run()`` uses, which starts with the scan; only
+        stocks that pass the price rule and that the sweep missed get their
+        own news request. Given the same quotes and news, signals match
+        ``run()``'s, in completion order. Timing lands in ``last_scan_stats``.
+        """
+        started = time.perf_counter()
+        first_signal_at = None
+        signal_count = 0
+
+        symbols = asyncio.Queue()
+        for symbol in stock_list:
+            symbols.put_nowait(symbol)
+        symbols.put_nowait(_DONE)
+        quotes = asyncio.Queue(queue_size)
+        news = asyncio.Queue(queue_size)
+        signals = asyncio.Queue()
+        sweep = asyncio.ensure_future(self.alpha_vantage.sweep_news(stock_list))
+
+        async def stream_news(stock):
+            return await self._stream_news(stock, sweep)
+
+        tasks = [
+            sweep,
+            asyncio.create_task(
+                self._run_stage(self._stream_quote, symbols, quotes, workers)
+            ),
+            asyncio.create_task(self._run_stage(stream_news, quotes, news, workers)),
+            asyncio.create_task(self._stream_sentiment(news, signals, batch_wait)),
+        ]
+
+        def surface_failure(task):
+            # A crashed stage would otherwise leave the consumer waiting forever
+            if not task.cancelled() and task.exception():
+                signals.put_nowait(task.exception())
+
+        for task in tasks:
+            task.add_done_callback(surface_failure)
+
+        try:
+            while True:
+                signal = await signals.get()
+                if signal is _DONE:
+                    break
+                if isinstance(signal, Exception):
+                    raise signal
+                if first_signal_at is None:
+                    first_signal_at = time.perf_counter()
+                signal_count += 1
+                yield signal
+        finally:
+            # Stops the stages if the consumer leaves early
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._record_scan(
+                "streaming", len(stock_list), signal_count, started, first_signal_at
+            )
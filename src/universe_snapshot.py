@@ -0,0 +1,185 @@
+import datetime
+
+import numpy as np
+
+from src.utils.stale_while_revalidate import staleness_discount, staleness_of
+
+# ✅ Lowered Sentiment Threshold to 25 (was 60) and increased Market Price
+# Flexibility to 95% of high price (was 98%)
+PRICE_TO_HIGH_RATIO = 0.95
+SENTIMENT_THRESHOLD = 25
+ENTRY_HIGH_MULTIPLIER = 1.02  # Top of the entry range, above the day's high
+STOP_LOSS_MULTIPLIER = 0.98  # Stop just under the day's low
+TAKE_PROFIT_MULTIPLIER = 1.03
+# Confidence halves for every half-life of staleness served during an outage
+QUOTE_STALENESS_HALF_LIFE = 60
+NEWS_STALENESS_HALF_LIFE = 30 * 60
+
+
+class UniverseSnapshot:
+    """
+    Struct-of-arrays view of one scan's quotes and sentiment.
+
+    Every array has one entry per stock with a quote; ``symbols`` maps
+    ``symbol_ids`` back to tickers. Missing prices are stored as NaN, so they
+    simply fail every rule instead of raising mid-scan.
+    """
+
+    def __init__(
+        self,
+        symbols,
+        current,
+        high,
+        low,
+        sentiment,
+        timestamps,
+        quote_staleness=None,
+        news_staleness=None,
+    ):
+        self.symbols = symbols
+        self.symbol_ids = np.arange(len(symbols))
+        self.current = current
+        self.high = high
+        self.low = low
+        self.sentiment = sentiment
+        self.timestamps = timestamps  # When each quote was taken
+        # Seconds each input was past its soft TTL when served (0 when fresh)
+        self.quote_staleness = (
+            np.zeros(len(symbols)) if quote_staleness is None else quote_staleness
+        )
+        self.news_staleness = (
+            np.zeros(len(symbols)) if news_staleness is None else news_staleness
+        )
+
+    def __len__(self):
+        return len(self.symbols)
+
+    @classmethod
+    def from_market_data(
+        cls, market_data, sentiment_scores=None, taken_at=None, news_staleness=0.0
+    ):
+        """
+        Builds a snapshot from ``get_stock_price`` dicts and ``{symbol: score}``.
+
+        Quotes without a ``timestamp`` (epoch seconds) are stamped ``taken_at``,
+        which defaults to now. ``news_staleness`` is the staleness of the news
+        the scores came from, either one value or ``{symbol: seconds}``.
+        """
+        sentiment_scores = sentiment_scores or {}
+        stocks = [stock for stock in market_data if stock]
+        taken_at = np.datetime64(taken_at or datetime.datetime.utcnow(), "us")
+
+        def column(key):
+            # dtype=float turns missing (None) prices into NaN
+            return np.array([stock.get(key) for stock in stocks], dtype=float)
+
+        symbols = [stock["symbol"] for stock in stocks]
+        quote_times = column("timestamp")
+        timestamps = np.where(
+            np.isnan(quote_times),
+            taken_at,
+            (np.nan_to_num(quote_times) * 1e6).astype("datetime64[us]"),
+        )
+
+        return cls(
+            symbols=symbols,
+            current=column("current_price"),
+            high=column("high_price"),
+            low=column("low_price"),
+            sentiment=np.array(
+                [sentiment_scores.get(symbol, 0) for symbol in symbols], dtype=float
+            ),
+            timestamps=timestamps,
+            quote_staleness=np.array([staleness_of(stock) for stock in stocks]),
+            news_staleness=np.array(
+                [
+                    (
+                        news_staleness.get(symbol, 0.0)
+                        if isinstance(news_staleness, dict)
+                        else news_staleness
+                    )
+                    for symbol in symbols
+                ],
+                dtype=float,
+            ),
+        )
+
+
+class SignalRules:
+    """
+    Vectorized BUY rule: price within ``price_to_high`` of the day's high and
+    sentiment above ``sentiment_threshold``, with the same entry range, stop,
+    target and confidence as ``evaluate_signal`` computes one stock at a time.
+    """
+
+    def __init__(
+        self,
+        price_to_high=PRICE_TO_HIGH_RATIO,
+        sentiment_threshold=SENTIMENT_THRESHOLD,
+    ):
+        self.price_to_high = price_to_high
+        self.sentiment_threshold = sentiment_threshold
+
+    def price_mask(self, snapshot):
+        """Marks stocks trading close enough to their high to qualify."""
+        return snapshot.current > snapshot.high * self.price_to_high
+
+    def buy_mask(self, snapshot):
+        """Marks stocks that pass both the price and the sentiment rule."""
+        return self.price_mask(snapshot) & (
+            snapshot.sentiment > self.sentiment_threshold
+        )
+
+    def levels(self, snapshot, mask=None):
+        """Returns entry, stop and target arrays, optionally only for ``mask``."""
+        current, high, low = snapshot.current, snapshot.high, snapshot.low
+        if mask is not None:
+            current, high, low = current[mask], high[mask], low[mask]
+        return {
+            "entry_low": current,
+            "entry_high": high * ENTRY_HIGH_MULTIPLIER,
+            "stop_loss": low * STOP_LOSS_MULTIPLIER,
+            "take_profit": current * TAKE_PROFIT_MULTIPLIER,
+        }
+
+    def confidence(self, snapshot, mask=None):
+        """Sentiment discounted for stale quotes and news (unchanged when fresh)."""
+        sentiment = snapshot.sentiment
+        quote_staleness = snapshot.quote_staleness
+        news_staleness = snapshot.news_staleness
+        if mask is not None:
+            sentiment = sentiment[mask]
+            quote_staleness = quote_staleness[mask]
+            news_staleness = news_staleness[mask]
+        return (
+            sentiment
+            * staleness_discount(quote_staleness, QUOTE_STALENESS_HALF_LIFE)
+            * staleness_discount(news_staleness, NEWS_STALENESS_HALF_LIFE)
+        )
+
+    def evaluate(self, snapshot):
+        """Returns the BUY signal dicts of every qualifying stock, in snapshot order."""
+        mask = self.buy_mask(snapshot)
+        indices = np.flatnonzero(mask)
+        levels = {
+            key: values.tolist() for key, values in self.levels(snapshot, mask).items()
+        }
+
+        return [
+            {
+                "symbol": snapshot.symbols[i],
+                "action": "BUY",
+                "entry_range": (entry_low, entry_high),
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "confidence": confidence,
+            }
+            for i, entry_low, entry_high, stop_loss, take_profit, confidence in zip(
+                indices,
+                levels["entry_low"],
+                levels["entry_high"],
+                levels["stop_loss"],
+                levels["take_profit"],
+                self.confidence(snapshot, mask).tolist(),
+            )
+        ]
@@ -0,0 +1,192 @@
+import asyncio
+import logging
+import time
+
+from src.utils.error_handling import RateLimitError
+
+DEFAULT_INITIAL_LIMIT = 10
+DEFAULT_MIN_LIMIT = 1
+DEFAULT_MAX_LIMIT = 64
+LATENCY_TOLERANCE = 2.0  # Latency above this multiple of the baseline is congestion
+LATENCY_BACKOFF = 0.9  # Gentle decrease when latency climbs
+RATE_LIMIT_BACKOFF = 0.5  # Sharp decrease on a 429
+DEFAULT_RATE_LIMIT_PAUSE = 1.0  # Seconds to pause when a 429 has no Retry-After
+MAX_RATE_LIMIT_RETRIES = 2  # Re-queues per item before its 429 is reported
+EWMA_WEIGHT = 0.2  # Weight of each new latency sample
+MIN_LATENCY_SAMPLE = 0.001  # Faster calls were served from a cache, not the provider
+BASELINE_DRIFT = 1.01  # Lets the baseline follow a provider that got slower for good
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD controller for how many requests to keep in flight.
+
+    Every success grows the limit by ``1 / limit`` (one extra slot per
+    window of completed requests). A rate-limit error halves it and pauses new
+    requests for the Retry-After interval. Smoothed latency climbing well
+    above its recent baseline trims it by 10%. Decreases happen at most once
+    per smoothed latency interval, so a burst of failures from one window
+    counts as a single congestion signal. ``clock`` and ``sleep`` can be swapped for
+    fakes in tests.
+    """
+
+    def __init__(
+        self,
+        initial=DEFAULT_INITIAL_LIMIT,
+        min_limit=DEFAULT_MIN_LIMIT,
+        max_limit=DEFAULT_MAX_LIMIT,
+        latency_tolerance=LATENCY_TOLERANCE,
+        clock=time.monotonic,
+        sleep=None,
+    ):
+        if not min_limit <= initial <= max_limit:
+            raise ValueError("initial must lie between min_limit and max_limit")
+
+        self.logger = logging.getLogger(__name__)
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.clock = clock
+        self.sleep = sleep or asyncio.sleep
+        self.baseline_latency = None  # Lowest recent smoothed latency
+        self.smoothed_latency = None
+        self.last_decrease = float("-inf")
+        self.resume_at = float("-inf")  # No new requests before this time
+        self.rate_limited = 0  # 429s observed since creation
+
+    @property
+    def window(self):
+        """Number of requests that may be in flight right now."""
+        return max(self.min_limit, int(self.limit))
+
+    def _decrease(self, factor, now):
+        interval = self.smoothed_latency or 0.0
+        if now - self.last_decrease < interval:
+            return  # Same congestion window as the last decrease
+        self.limit = max(self.min_limit, self.limit * factor)
+        self.last_decrease = now
+
+    def on_success(self, latency):
+        """Records a completed request and adjusts the limit from its latency."""
+        now = self.clock()
+        if self.smoothed_latency is None:
+            self.smoothed_latency = self.baseline_latency = latency
+        else:
+            self.smoothed_latency += EWMA_WEIGHT * (latency - self.smoothed_latency)
+            self.baseline_latency = min(
+                self.smoothed_latency, self.baseline_latency * BASELINE_DRIFT
+            )
+
+        if self.smoothed_latency > self.baseline_latency * self.latency_tolerance:
+            self._decrease(LATENCY_BACKOFF, now)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def on_rate_limited(self, retry_after=None):
+        """Records a 429: halves the limit and pauses new requests."""
+        now = self.clock()
+        self.rate_limited += 1
+        self._decrease(RATE_LIMIT_BACKOFF, now)
+        pause = DEFAULT_RATE_LIMIT_PAUSE if retry_after is None else retry_after
+        self.resume_at = max(self.resume_at, now + pause)
+
+    async def _timed(self, func, item):
+        started = self.clock()
+        try:
+            result = await func(item)
+        except RateLimitError as e:
+            self.on_rate_limited(e.retry_after)
+            raise
+        # Other failures say nothing about provider capacity and leave it as is
+        latency = self.clock() - started
+        if latency >= MIN_LATENCY_SAMPLE:
+            self.on_success(latency)
+        return result
+
+    async def map(self, func, items, max_retries=MAX_RATE_LIMIT_RETRIES):
+        """
+        Calls ``func(item)`` for every item with at most ``window`` calls in
+        flight, yielding ``(item, result)`` pairs as each call completes.
+
+        A call that raises yields ``(item, exception)``; rate-limited items are
+        re-queued up to ``max_retries`` times first. A new call starts as soon
+        as any in-flight call finishes, so one slow request never holds back
+        the rest. Calls still in flight are cancelled if the consumer stops
+        iterating early.
+        """
+        queue = [(item, 0) for item in reversed(list(items))]
+        pending = {}
+
+        try:
+            while queue or pending:
+                wait = self.resume_at - self.clock()
+                if wait > 0 and not pending:
+                    await self.sleep(wait)
+                    continue
+
+                while queue and len(pending) < self.window and wait <= 0:
+                    item, attempt = queue.pop()
+                    task = asyncio.ensure_future(self._timed(func, item))
+                    pending[task] = (item, attempt)
+
+                if not pending:
+                    continue
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=wait if wait > 0 else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    item, attempt = pending.pop(task)
+                    error = task.exception()
+                    if isinstance(error, RateLimitError) and attempt < max_retries:
+                        queue.append((item, attempt + 1))
+                        continue
+                    yield item, (error if error else task.result())
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self):
+        """Summarizes the controller's state for logging."""
+        return {
+            "limit": round(self.limit, 2),
+            "smoothed_latency": self.smoothed_latency,
+            "baseline_latency": self.baseline_latency,
+            "rate_limited": self.rate_limited,
+        }
+
+
+# Usage Example:
+if __name__ == "__main__":
+    import random
+
+    class FakeProvider:
+        """Answers in ~50ms until more than 20 requests overlap, then 429s."""
+
+        def __init__(self):
+            self.in_flight = 0
+
+        async def __call__(self, item):
+            self.in_flight += 1
+            try:
+                if self.in_flight > 20:
+                    raise RateLimitError("Too many requests", retry_after=0.1)
+                await asyncio.sleep(random.uniform(0.04, 0.06))
+                return item
+            finally:
+                self.in_flight -= 1
+
+    async def demo():
+        controller = AdaptiveConcurrency()
+        started = time.monotonic()
+        completed = 0
+        async for _, result in controller.map(FakeProvider(), range(1000)):
+            completed += not isinstance(result, Exception)
+        print(
+            f"{completed} requests in {time.monotonic() - started:.2f}s, "
+            f"controller: {controller.stats()}"
+        )
+
+    asyncio.run(demo())
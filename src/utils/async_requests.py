@@ -1,20 +1,20 @@
-import asyncio
 import logging
 
-import aiohttp
+from src.utils.http_session import create_session
+from src.utils.rate_limiter import build_rate_limiters
 
 
 class RequestScheduler:
-    def __init__(self, rate_limits):
+    def __init__(self, rate_limits, limiters=None):
         """
         Initializes the RequestScheduler with rate limits for each API.
 
         :param rate_limits: Dictionary containing rate limits for different APIs.
+        :param limiters: Optional ``{api_name: TokenBucket}`` shared with API clients.
         """
         self.rate_limits = rate_limits
         self.session = None  # Delay session creation until needed
-        self.request_queues = {api: asyncio.Queue() for api in rate_limits}
-        self.lock = asyncio.Lock()
+        self.limiters = limiters or build_rate_limiters(rate_limits)
 
     async def fetch(self, url, api_name, params=None):
         """
@@ -24,15 +24,14 @@ class RequestScheduler:
         :param api_name: API name for rate limiting
         :param params: Optional query parameters
         """
-        if api_name not in self.rate_limits:
+        if api_name not in self.limiters:
             raise ValueError(f"Unknown API: {api_name}")
 
-        if not self.session:
-            self.session = aiohttp.ClientSession()  # Lazy initialization
+        if not self.session or self.session.closed:
+            self.session = create_session()  # Lazy, pooled initialization
 
-        async with self.lock:
-            # Enforce rate limiting
-            await asyncio.sleep(60 / self.rate_limits[api_name])
+        # Enforce rate limiting per API; other APIs are never blocked
+        await self.limiters[api_name].acquire()
 
         try:
             async with self.session.get(url, params=params) as response:
@@ -43,6 +42,6 @@ class RequestScheduler:
 
     async def close(self):
         """Closes the session if it's open."""
-        if self.session:
+        if self.session and not self.session.closed:
             await self.session.close()
 
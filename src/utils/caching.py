@@ -1,7 +1,37 @@
+import asyncio
 import json
 import logging
+import time
+from collections import OrderedDict
 
-import redis
+try:
+    import redis
+except ImportError:
+    redis = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis-py < 4.2, or not installed
+    aioredis = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+# Per-namespace TTLs in seconds: quotes move by the second, news by the minute
+CACHE_TTLS = {
+    "quote": 15,
+    "news": 10 * 60,
+    "fundamentals": 24 * 60 * 60,
+}
+DEFAULT_TTL = 60 * 60
+DEFAULT_MEMORY_SIZE = 10000  # Entries kept in the in-process layer
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+REMOTE_RETRY_SECONDS = 30  # How long to skip Redis after a connection error
+WRITE_BEHIND_DELAY = 0.01  # Seconds to gather deferred writes into one pipeline
+
+_MISSING = object()
 
 
 class RedisCache:
@@ -24,7 +54,7 @@ class RedisCache:
         if self.redis_client:
             try:
                 self.redis_client.setex(key, self.expiration_time, json.dumps(data))
-                self.logger.info(f"Cached data for {key}")
+                self.logger.debug(f"Cached data for {key}")
             except Exception as e:
                 self.logger.error(f"Failed to cache data for {key}: {e}")
 
@@ -58,6 +88,264 @@ class RedisCache:
                 self.logger.error(f"Failed to clear Redis cache: {e}")
 
 
+def encode(value):
+    """Serializes a value compactly, tagging the format in the first byte."""
+    if msgpack is not None:
+        return b"m" + msgpack.packb(value, use_bin_type=True)
+    return b"j" + json.dumps(value, separators=(",", ":")).encode()
+
+
+def decode(data):
+    """Inverse of ``encode``; reads either format regardless of what's installed."""
+    if data[:1] == b"m":
+        if msgpack is None:
+            raise ValueError("Cached value is msgpack-encoded but msgpack is missing")
+        return msgpack.unpackb(data[1:], raw=False)
+    return json.loads(data[1:])
+
+
+class LRUCache:
+    """Bounded in-process cache with a TTL per entry."""
+
+    def __init__(self, max_size=DEFAULT_MEMORY_SIZE, clock=time.monotonic):
+        self.max_size = max_size
+        self.clock = clock
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+
+    def get_entry(self, key):
+        """Returns ``(expires_at, value)`` for a live entry, or None."""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry
+
+    def get(self, key, default=_MISSING):
+        entry = self.get_entry(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key, value, ttl):
+        self.entries[key] = (self.clock() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class TieredCache:
+    """
+    Two-tier cache: a bounded in-process LRU in front of asynchronous Redis.
+
+    Keys live in namespaces (``quote``, ``news``, ``fundamentals``) that each
+    carry their own TTL. Bulk reads and writes cost one pipelined Redis round
+    trip, values are msgpack-encoded when available (JSON otherwise), and
+    entries pulled from Redis are kept locally only for their remaining TTL.
+    If Redis is missing or unreachable, the cache keeps working in-process
+    and retries the connection every ``REMOTE_RETRY_SECONDS``.
+
+    Every entry is written with its namespace TTL, so its age follows from the
+    TTL it has left; ``mget_with_age`` reports it, letting callers that cache
+    on top (e.g. stale-while-revalidate) keep counting from the original fetch.
+    """
+
+    def __init__(
+        self,
+        url=DEFAULT_REDIS_URL,
+        memory_size=DEFAULT_MEMORY_SIZE,
+        ttls=None,
+        redis_client=None,
+        clock=time.monotonic,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.url = url
+        self.ttls = {**CACHE_TTLS, **(ttls or {})}
+        self.clock = clock
+        self.local = LRUCache(memory_size, clock=clock)
+        self.redis_client = redis_client
+        self.remote_retry_at = 0.0
+        self.pending_writes = {}  # namespace -> {key: value} awaiting flush
+        self.flush_task = None
+
+        if redis_client is None and aioredis is None:
+            self.logger.warning("redis.asyncio unavailable; caching in-process only.")
+            self.remote_retry_at = float("inf")
+
+        self.local_hits = 0
+        self.remote_hits = 0
+        self.misses = 0
+        self.remote_calls = 0
+        self.remote_errors = 0
+        self.remote_seconds = 0.0
+
+    def ttl(self, namespace):
+        return self.ttls.get(namespace, DEFAULT_TTL)
+
+    def _remote(self):
+        """Returns the Redis client, or None while Redis is unavailable."""
+        if self.clock() < self.remote_retry_at:
+            return None
+        if self.redis_client is None:
+            self.redis_client = aioredis.from_url(self.url)
+        return self.redis_client
+
+    async def _pipeline(self, build):
+        """Runs one pipelined round trip; returns its results or None on failure."""
+        client = self._remote()
+        if client is None:
+            return None
+
+        started = time.perf_counter()
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                build(pipe)
+                return await pipe.execute()
+        except Exception as e:
+            self.remote_errors += 1
+            self.remote_retry_at = self.clock() + REMOTE_RETRY_SECONDS
+            self.logger.warning(
+                f"Redis unavailable ({e}); caching in-process for "
+                f"{REMOTE_RETRY_SECONDS}s."
+            )
+            return None
+        finally:
+            self.remote_calls += 1
+            self.remote_seconds += time.perf_counter() - started
+
+    async def mget_with_age(self, namespace, keys):
+        """
+        Returns ``{key: (value, age)}`` for every key found in either tier,
+        where ``age`` is the seconds since the value was written.
+        """
+        ttl = self.ttl(namespace)
+        found, remote_keys = {}, []
+        for key in dict.fromkeys(keys):
+            entry = self.local.get_entry(f"{namespace}:{key}")
+            if entry is None:
+                remote_keys.append(key)
+            else:
+                expires_at, value = entry
+                found[key] = (value, max(0.0, ttl - (expires_at - self.clock())))
+        self.local_hits += len(found)
+
+        if remote_keys:
+            full_keys = [f"{namespace}:{key}" for key in remote_keys]
+
+            def build(pipe):
+                pipe.mget(full_keys)
+                for full_key in full_keys:
+                    pipe.pttl(full_key)
+
+            results = await self._pipeline(build)
+            if results:
+                values, ttls = results[0], results[1:]
+                for key, full_key, data, ttl_ms in zip(
+                    remote_keys, full_keys, values, ttls
+                ):
+                    if data is None:
+                        continue
+                    try:
+                        value = decode(data)
+                    except ValueError as e:
+                        self.logger.warning(f"Undecodable cache entry {full_key}: {e}")
+                        continue
+                    self.remote_hits += 1
+                    # Remember it locally only for as long as Redis will
+                    remaining = ttl_ms / 1000 if ttl_ms > 0 else ttl
+                    self.local.set(full_key, value, remaining)
+                    found[key] = (value, max(0.0, ttl - remaining))
+
+        self.misses += len(set(keys)) - len(found)
+        return found
+
+    async def mget(self, namespace, keys):
+        """Returns ``{key: value}`` for every key found in either tier."""
+        found = await self.mget_with_age(namespace, keys)
+        return {key: value for key, (value, _) in found.items()}
+
+    async def get(self, namespace, key, default=None):
+        return (await self.mget(namespace, [key])).get(key, default)
+
+    async def get_with_age(self, namespace, key):
+        """Returns ``(value, age)`` for one key, or None if it isn't cached."""
+        return (await self.mget_with_age(namespace, [key])).get(key)
+
+    async def mset(self, namespace, mapping):
+        """Stores every ``{key: value}`` in both tiers with the namespace TTL."""
+        if not mapping:
+            return
+        ttl = self.ttl(namespace)
+        for key, value in mapping.items():
+            self.local.set(f"{namespace}:{key}", value, ttl)
+
+        def build(pipe):
+            for key, value in mapping.items():
+                pipe.set(f"{namespace}:{key}", encode(value), px=int(ttl * 1000))
+
+        await self._pipeline(build)
+
+    async def set(self, namespace, key, value):
+        await self.mset(namespace, {key: value})
+
+    def set_deferred(self, namespace, key, value):
+        """
+        Stores a value locally now and in Redis shortly after, batching the
+        writes of many concurrent callers into one pipeline.
+        """
+        self.local.set(f"{namespace}:{key}", value, self.ttl(namespace))
+        self.pending_writes.setdefault(namespace, {})[key] = value
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.ensure_future(self._flush_soon())
+
+    async def _flush_soon(self):
+        await asyncio.sleep(WRITE_BEHIND_DELAY)
+        await self.flush()
+
+    async def flush(self):
+        """Writes any deferred values to Redis."""
+        pending, self.pending_writes = self.pending_writes, {}
+        for namespace, mapping in pending.items():
+            await self.mset(namespace, mapping)
+
+    @property
+    def hit_rate(self):
+        lookups = self.local_hits + self.remote_hits + self.misses
+        return (self.local_hits + self.remote_hits) / lookups if lookups else 0.0
+
+    def stats(self):
+        """Summarizes hit, miss and Redis latency counters for logging."""
+        return {
+            "local_hits": self.local_hits,
+            "remote_hits": self.remote_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hit_rate, 3),
+            "remote_calls": self.remote_calls,
+            "remote_errors": self.remote_errors,
+            "remote_ms_avg": (
+                round(self.remote_seconds / self.remote_calls * 1000, 2)
+                if self.remote_calls
+                else 0.0
+            ),
+        }
+
+    async def close(self):
+        """Flushes deferred writes and closes the Redis connection pool."""
+        if self.flush_task and not self.flush_task.done():
+            await self.flush_task
+        await self.flush()
+        if self.redis_client is not None:
+            # aclose() replaced close() in redis-py 5
+            close = (
+                getattr(self.redis_client, "aclose", None) or self.redis_client.close
+            )
+            await close()
+            self.redis_client = None
+
+
 # Usage Example:
 if __name__ == "__main__":
     cache = RedisCache(expiration_time=600)  # Cache expires after 10 minutes
@@ -5,6 +5,30 @@ import traceback
 import requests
 
 
+class RateLimitError(Exception):
+    """Raised when an API rejects a request for exceeding its rate limit (HTTP 429)."""
+
+    def __init__(self, message, retry_after=None):
+        super().__init__(message)
+        self.retry_after = retry_after  # Seconds the API asked us to wait, if any
+
+
+class ClientError(Exception):
+    """Raised when an API rejects a request itself (HTTP 4xx other than 429)."""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status  # HTTP status, e.g. 401 or 403
+
+
+def parse_retry_after(value):
+    """Parses a Retry-After header given in seconds; returns None otherwise."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
 class ErrorHandling:
     """Handles system errors, API failures, and fallback mechanisms."""
 
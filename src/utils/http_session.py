@@ -0,0 +1,33 @@
+import aiohttp
+
+# Connection pool defaults shared by every async API client
+DEFAULT_TIMEOUT = 10  # Total seconds allowed per request
+DEFAULT_CONNECT_TIMEOUT = 5  # Seconds allowed for TCP+TLS setup
+DEFAULT_POOL_LIMIT = 100  # Open connections across all hosts
+DEFAULT_LIMIT_PER_HOST = 20  # Open connections to a single API host
+DEFAULT_DNS_CACHE_TTL = 300  # Seconds to cache resolved API hostnames
+
+
+def create_session(
+    timeout=DEFAULT_TIMEOUT,
+    connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+    limit=DEFAULT_POOL_LIMIT,
+    limit_per_host=DEFAULT_LIMIT_PER_HOST,
+    ttl_dns_cache=DEFAULT_DNS_CACHE_TTL,
+):
+    """
+    Creates a long-lived, connection-pooled aiohttp session.
+
+    Must be called from inside a running event loop. Keep-alive connections are
+    reused across requests, so each host only pays TCP+TLS setup once per pooled
+    connection instead of once per request.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        ttl_dns_cache=ttl_dns_cache,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        timeout=aiohttp.ClientTimeout(total=timeout, connect=connect_timeout),
+    )
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_INFERENCE_WORKERS = 1  # One worker keeps torch's intra-op pool saturated
+
+
+class InferenceExecutor:
+    """
+    Runs CPU-bound model inference on worker threads, off the event loop.
+
+    PyTorch releases the GIL inside its kernels, so a small thread pool lets
+    quote fetching and alerting continue while a batch is scored. Intra-op
+    threads are split between workers so concurrent batches don't oversubscribe
+    the CPU.
+    """
+
+    def __init__(
+        self, scorer=None, max_workers=DEFAULT_INFERENCE_WORKERS, intra_op_threads=None
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.scorer = scorer  # Default BatchSentimentScorer for score_batch()
+        self.max_workers = max_workers
+        self.intra_op_threads = intra_op_threads or max(
+            1, (os.cpu_count() or 1) // max_workers
+        )
+        try:
+            # Imported here so the engine loads without torch (e.g. with a
+            # keyword scorer); only model inference needs it
+            import torch
+        except ImportError:
+            self.logger.debug("torch is not installed; intra-op threads unset.")
+        else:
+            torch.set_num_threads(self.intra_op_threads)  # Process-wide setting
+        self.pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="inference"
+        )
+        self.logger.info(
+            f"Inference executor: {max_workers} worker(s) x "
+            f"{self.intra_op_threads} intra-op thread(s)"
+        )
+
+    async def run(self, func, *args):
+        """Runs ``func(*args)`` on the inference pool and awaits its result."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, func, *args)
+
+    async def score_batch(self, headlines, scorer=None):
+        """Scores headlines with a BatchSentimentScorer without blocking the loop."""
+        return await self.run((scorer or self.scorer).score, headlines)
+
+    def shutdown(self, wait=True):
+        self.pool.shutdown(wait=wait)
+
+
+_default_executor = None
+_default_lock = threading.Lock()
+
+
+def get_inference_executor():
+    """Returns the process-wide inference executor, creating it on first use."""
+    global _default_executor
+    with _default_lock:
+        if _default_executor is None:
+            _default_executor = InferenceExecutor()
+    return _default_executor
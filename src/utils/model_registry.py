@@ -0,0 +1,130 @@
+import logging
+import resource
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+SENTIMENT_MODEL = "sentiment-analysis"
+
+
+def _rss_mb():
+    """Returns the current resident set size of this process in MB."""
+    try:
+        with open("/proc/self/statm") as statm:
+            pages = int(statm.read().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:  # Not Linux: fall back to peak RSS, reported in KB
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _parameter_mb(model):
+    """Returns the size of a torch model's parameters in MB, if it has any."""
+    module = getattr(model, "model", model)  # Unwrap Hugging Face pipelines
+    parameters = getattr(module, "parameters", None)
+    if not callable(parameters):
+        return None
+    return round(sum(p.numel() * p.element_size() for p in parameters()) / 2**20, 1)
+
+
+class ModelRegistry:
+    """
+    Process-wide registry that loads each model once and shares it.
+
+    Models are registered by name with a zero-argument loader and loaded on
+    first use. ``prewarm`` starts loads on a background thread so they overlap
+    with network I/O; a consumer that asks for a model still loading simply
+    waits for that load instead of starting a second one.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self.loaders = {}
+        self.models = {}
+        self.stats = {}
+        self.locks = {}
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def register(self, name, loader, replace=False):
+        """
+        Registers a loader for ``name`` unless one is already registered.
+        With ``replace``, swaps in the new loader if the model isn't loaded yet.
+        """
+        with self.lock:
+            if replace and name in self.models:
+                self.logger.warning(
+                    f"Model '{name}' is already loaded; ignoring the new loader."
+                )
+            elif replace:
+                self.loaders[name] = loader
+            else:
+                self.loaders.setdefault(name, loader)
+            self.locks.setdefault(name, threading.Lock())
+
+    def get(self, name, loader=None):
+        """Returns the shared model for ``name``, loading it on first use."""
+        if name in self.models:
+            return self.models[name]
+
+        if loader is not None:
+            self.register(name, loader)
+        if name not in self.loaders:
+            raise KeyError(f"No model registered under '{name}'")
+
+        with self.locks[name]:
+            if name not in self.models:  # Another thread may have loaded it
+                self.models[name] = self._load(name)
+        return self.models[name]
+
+    def _load(self, name):
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+        model = self.loaders[name]()
+        load_seconds = time.perf_counter() - start
+
+        self.stats[name] = {
+            "load_seconds": round(load_seconds, 2),
+            "rss_delta_mb": round(_rss_mb() - rss_before, 1),
+            "parameter_mb": _parameter_mb(model),
+        }
+        self.logger.info(f"Loaded model '{name}': {self.stats[name]}")
+        return model
+
+    def prewarm(self, *names):
+        """Starts loading models in the background and returns their futures."""
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="model-prewarm"
+                )
+        return [self.executor.submit(self.get, name) for name in names]
+
+    def is_loaded(self, name):
+        return name in self.models
+
+    def report(self):
+        """Logs load time and memory for every loaded model."""
+        for name, stats in self.stats.items():
+            self.logger.info(f"Model '{name}': {stats}")
+        return dict(self.stats)
+
+
+def _load_sentiment_pipeline(config=None):
+    # Imported lazily: transformers is slow to import and only needed on first use
+    from src.sentiment.backends import load_sentiment_pipeline, sentiment_backend
+
+    return load_sentiment_pipeline(sentiment_backend(config))
+
+
+def configure_sentiment_model(config):
+    """
+    Loads the shared sentiment model on ``config["ai"]["sentiment_backend"]``
+    instead of the ``SENTIMENT_BACKEND`` default. Call before its first use.
+    """
+    model_registry.register(
+        SENTIMENT_MODEL, lambda: _load_sentiment_pipeline(config), replace=True
+    )
+
+
+model_registry = ModelRegistry()
+model_registry.register(SENTIMENT_MODEL, _load_sentiment_pipeline)
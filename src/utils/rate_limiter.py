@@ -0,0 +1,108 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for a single API.
+
+    Holds up to ``capacity`` tokens and refills at ``refill_rate`` tokens per
+    second. Callers reserve tokens up front, so concurrent requests are admitted
+    in arrival order and run in parallel as long as the bucket has tokens; only
+    callers that exceed the budget wait, and none of them hold a lock while they
+    sleep. ``clock`` and ``sleep`` can be swapped for fakes in tests.
+    """
+
+    def __init__(self, capacity, refill_rate, clock=time.monotonic, sleep=None):
+        if capacity <= 0 or refill_rate <= 0:
+            raise ValueError("capacity and refill_rate must be positive")
+
+        self.capacity = capacity
+        self.refill_rate = refill_rate
+        self.clock = clock
+        self.sleep = sleep or asyncio.sleep
+        self.tokens = float(capacity)  # Start with a full burst available
+        self.updated_at = clock()
+        self.acquired_total = 0  # Tokens handed out since creation
+
+    @classmethod
+    def per_minute(cls, limit, burst=None, **kwargs):
+        """Builds a bucket from a requests-per-minute quota."""
+        return cls(capacity=burst or limit, refill_rate=limit / 60, **kwargs)
+
+    def _refill(self):
+        now = self.clock()
+        elapsed = max(0.0, now - self.updated_at)
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_rate)
+        self.updated_at = now
+
+    def reserve(self, n=1):
+        """
+        Takes ``n`` tokens immediately and returns how many seconds the caller
+        must wait before using them (0 if they were already available).
+        """
+        if n > self.capacity:
+            raise ValueError(
+                f"Cannot acquire {n} tokens from a bucket of {self.capacity}"
+            )
+
+        self._refill()
+        self.tokens -= n  # May go negative: later callers queue behind this one
+        self.acquired_total += n
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.refill_rate
+
+    def refund(self, n=1):
+        """Returns ``n`` reserved tokens that were never used."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens + n)
+        self.acquired_total -= n
+
+    async def acquire(self, n=1):
+        """Waits until ``n`` tokens are available, then consumes them."""
+        delay = self.reserve(n)
+        if delay > 0:
+            try:
+                await self.sleep(delay)
+            except asyncio.CancelledError:
+                # The request will never be sent, so don't charge for it
+                self.refund(n)
+                raise
+
+    @property
+    def available(self):
+        """Tokens that can be taken right now without waiting."""
+        self._refill()
+        return max(0.0, self.tokens)
+
+
+def build_rate_limiters(rate_limits, **kwargs):
+    """Creates one token bucket per API from a ``{api_name: per_minute}`` dict."""
+    return {
+        api: TokenBucket.per_minute(limit, **kwargs)
+        for api, limit in rate_limits.items()
+    }
+
+
+# Usage Example:
+if __name__ == "__main__":
+
+    class FakeClock:
+        def __init__(self):
+            self.now = 0.0
+
+        def __call__(self):
+            return self.now
+
+        async def sleep(self, seconds):
+            self.now += seconds
+
+    async def demo():
+        clock = FakeClock()
+        bucket = TokenBucket.per_minute(150, clock=clock, sleep=clock.sleep)
+        for _ in range(200):
+            await bucket.acquire()
+        print(f"200 requests admitted after {clock.now:.1f}s of simulated time")
+
+    asyncio.run(demo())
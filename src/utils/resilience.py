@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import random
+import time
+
+from src.utils.error_handling import ClientError, RateLimitError
+
+DEFAULT_RETRIES = 3
+DEFAULT_BASE_DELAY = 0.5  # Seconds; backoff caps double from here
+DEFAULT_MAX_DELAY = 8.0
+DEFAULT_FAILURE_THRESHOLD = 5  # Consecutive failures that open a circuit
+DEFAULT_RESET_TIMEOUT = 30.0  # Seconds an open circuit fails fast before a trial call
+DEFAULT_RATE_LIMIT_RETRIES = 2  # 429s waited out before the error is raised
+DEFAULT_MAX_RATE_LIMIT_WAIT = 60.0  # Longer Retry-After waits are left to the caller
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+    def __init__(self, endpoint, retry_in):
+        super().__init__(f"Circuit for {endpoint} is open; retry in {retry_in:.1f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Fails fast for an endpoint after ``failure_threshold`` consecutive failures.
+
+    Once open, calls raise ``CircuitOpenError`` for ``reset_timeout`` seconds;
+    then a single trial call is let through (half-open) and its outcome closes
+    or re-opens the circuit.
+    """
+
+    def __init__(
+        self,
+        endpoint,
+        failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout=DEFAULT_RESET_TIMEOUT,
+        clock=time.monotonic,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.endpoint = endpoint
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def before_call(self):
+        """Raises CircuitOpenError unless a call may go through right now."""
+        if self.state == CLOSED:
+            return
+        retry_in = self.opened_at + self.reset_timeout - self.clock()
+        if self.state == OPEN and retry_in <= 0:
+            self.state = HALF_OPEN  # This caller makes the trial call
+            return
+        raise CircuitOpenError(self.endpoint, max(0.0, retry_in))
+
+    def record_success(self):
+        if self.state != CLOSED:
+            self.logger.info(f"Circuit for {self.endpoint} closed.")
+        self.state = CLOSED
+        self.failures = 0
+
+    def abandon_trial(self):
+        """
+        Re-opens a half-open circuit whose trial call never finished (e.g. it
+        was cancelled), so the next caller may make a new trial right away.
+        """
+        if self.state == HALF_OPEN:
+            self.state = OPEN
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.logger.warning(
+                    f"Circuit for {self.endpoint} opened after "
+                    f"{self.failures} failures."
+                )
+            self.state = OPEN
+            self.opened_at = self.clock()
+
+
+def backoff_delay(attempt, base_delay, max_delay, rng=random.random):
+    """Full-jitter exponential backoff: uniform in [0, min(max, base * 2**attempt)]."""
+    return rng() * min(max_delay, base_delay * 2**attempt)
+
+
+async def hedged(func, *args, delay, attempts=2):
+    """
+    Calls ``func(*args)`` and, if it hasn't finished after ``delay`` seconds,
+    starts another identical call, up to ``attempts`` in total. Returns the
+    first successful result and cancels the rest; raises the last error if
+    every call fails.
+    """
+    tasks = {asyncio.ensure_future(func(*args))}
+    started = 1
+    error = None
+    try:
+        while tasks:
+            done, tasks = await asyncio.wait(
+                tasks,
+                timeout=delay if started < attempts else None,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+            if not done:  # Still slow after ``delay``: send a backup request
+                tasks.add(asyncio.ensure_future(func(*args)))
+                started += 1
+        raise error
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+class ResiliencePolicy:
+    """
+    Async retries with jittered exponential backoff, a circuit breaker per
+    endpoint and optional request hedging, shared by one API client.
+
+    429s are retried up to ``rate_limit_retries`` times after waiting out the
+    response's Retry-After (or a backoff delay without one); then, or when
+    Retry-After exceeds ``max_rate_limit_wait``, the ``RateLimitError`` is
+    raised so the caller's own concurrency control (``AdaptiveConcurrency``)
+    can back off. ``ClientError`` (401, 403, ...) is raised right away because
+    retrying can't fix it. Neither counts against the breaker, since the
+    provider answered. ``CircuitOpenError`` is never retried. ``sleep``,
+    ``clock`` and ``rng`` can be swapped for fakes in tests.
+    """
+
+    def __init__(
+        self,
+        retries=DEFAULT_RETRIES,
+        base_delay=DEFAULT_BASE_DELAY,
+        max_delay=DEFAULT_MAX_DELAY,
+        failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout=DEFAULT_RESET_TIMEOUT,
+        rate_limit_retries=DEFAULT_RATE_LIMIT_RETRIES,
+        max_rate_limit_wait=DEFAULT_MAX_RATE_LIMIT_WAIT,
+        hedge_delay=None,
+        sleep=None,
+        clock=time.monotonic,
+        rng=random.random,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.retries = retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.rate_limit_retries = rate_limit_retries
+        self.max_rate_limit_wait = max_rate_limit_wait
+        self.hedge_delay = hedge_delay  # Seconds before a backup request, or None
+        self.sleep = sleep or asyncio.sleep
+        self.clock = clock
+        self.rng = rng
+        self.breakers = {}
+        self.retried = 0
+
+    def breaker(self, endpoint):
+        if endpoint not in self.breakers:
+            self.breakers[endpoint] = CircuitBreaker(
+                endpoint, self.failure_threshold, self.reset_timeout, self.clock
+            )
+        return self.breakers[endpoint]
+
+    async def call(self, endpoint, func, *args):
+        """Calls ``func(*args)`` against ``endpoint`` with retries and breaking."""
+        breaker = self.breaker(endpoint)
+        failures = rate_limited = 0
+        while True:
+            breaker.before_call()
+            try:
+                if self.hedge_delay is None:
+                    result = await func(*args)
+                else:
+                    result = await hedged(func, *args, delay=self.hedge_delay)
+            except (RateLimitError, ClientError) as e:
+                # The provider answered, so the endpoint is up; this also
+                # settles a half-open trial call
+                breaker.record_success()
+                if (
+                    isinstance(e, ClientError)
+                    or rate_limited == self.rate_limit_retries
+                    or (e.retry_after or 0) > self.max_rate_limit_wait
+                ):
+                    raise
+                error = e
+                delay = e.retry_after
+                if delay is None:
+                    delay = backoff_delay(
+                        rate_limited, self.base_delay, self.max_delay, self.rng
+                    )
+                rate_limited += 1
+            except Exception as e:
+                breaker.record_failure()
+                if failures == self.retries:
+                    raise
+                error = e
+                delay = backoff_delay(
+                    failures, self.base_delay, self.max_delay, self.rng
+                )
+                failures += 1
+            except BaseException:
+                breaker.abandon_trial()  # Cancelled: no verdict on the endpoint
+                raise
+            else:
+                breaker.record_success()
+                return result
+
+            self.retried += 1
+            self.logger.debug(
+                f"{endpoint} attempt {failures + rate_limited} failed ({error}); "
+                f"retrying in {delay:.2f}s."
+            )
+            await self.sleep(delay)
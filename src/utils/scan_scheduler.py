@@ -0,0 +1,219 @@
+import asyncio
+import datetime
+import logging
+import time
+from zoneinfo import ZoneInfo
+
+from src.config.settings import MARKET_HOURS, SCAN_SCHEDULE
+
+CLOSED, EXTENDED, REGULAR, OPEN_CLOSE = "closed", "extended", "regular", "open_close"
+
+
+def market_sessions(market_hours=MARKET_HOURS):
+    """
+    Converts the ``MARKET_HOURS`` tuples into ``{session: (start, end)}`` times.
+
+    The settings tuples list only the fields each session needs, e.g.
+    ``(4, 9, 30)`` is 4:00-9:30 and ``(9, 30, 16)`` is 9:30-16:00.
+    """
+    pre_start, pre_end_hour, pre_end_minute = market_hours["PRE_MARKET"]
+    open_hour, open_minute, close_hour = market_hours["REGULAR_MARKET"]
+    post_start, post_end = market_hours["POST_MARKET"]
+    return {
+        "PRE_MARKET": (
+            datetime.time(pre_start),
+            datetime.time(pre_end_hour, pre_end_minute),
+        ),
+        "REGULAR_MARKET": (
+            datetime.time(open_hour, open_minute),
+            datetime.time(close_hour),
+        ),
+        "POST_MARKET": (datetime.time(post_start), datetime.time(post_end)),
+    }
+
+
+class MarketCalendar:
+    """
+    Maps a moment to its market phase and scan cadence.
+
+    Weekdays run from pre-market through post-market; weekends and the
+    exchange holidays listed in ``schedule["HOLIDAYS"]`` are closed. Session
+    times are wall-clock times in the schedule's timezone, so they follow DST.
+    """
+
+    def __init__(self, market_hours=MARKET_HOURS, schedule=SCAN_SCHEDULE):
+        self.tz = ZoneInfo(schedule["TIMEZONE"])
+        self.holidays = {
+            datetime.date.fromisoformat(day) for day in schedule.get("HOLIDAYS", ())
+        }
+        self.sessions = market_sessions(market_hours)
+        self.edge = datetime.timedelta(minutes=schedule["OPEN_CLOSE_WINDOW_MINUTES"])
+        self.intervals = {
+            OPEN_CLOSE: schedule["OPEN_CLOSE_INTERVAL"],
+            REGULAR: schedule["REGULAR_INTERVAL"],
+            EXTENDED: schedule["EXTENDED_INTERVAL"],
+        }
+
+    def now(self):
+        return datetime.datetime.now(self.tz)
+
+    def _at(self, moment, clock_time):
+        return datetime.datetime.combine(moment.date(), clock_time, tzinfo=self.tz)
+
+    def is_trading_day(self, moment):
+        return moment.weekday() < 5 and moment.date() not in self.holidays
+
+    def phase(self, moment):
+        """Returns the market phase in effect at the timezone-aware ``moment``."""
+        moment = moment.astimezone(self.tz)
+        if not self.is_trading_day(moment):
+            return CLOSED
+
+        market_open, market_close = (
+            self._at(moment, t) for t in self.sessions["REGULAR_MARKET"]
+        )
+        if market_open <= moment < market_close:
+            near_edge = (
+                moment < market_open + self.edge or moment >= market_close - self.edge
+            )
+            return OPEN_CLOSE if near_edge else REGULAR
+
+        for session in ("PRE_MARKET", "POST_MARKET"):
+            start, end = (self._at(moment, t) for t in self.sessions[session])
+            if start <= moment < end:
+                return EXTENDED
+        return CLOSED
+
+    def next_session_start(self, moment):
+        """Returns when pre-market next opens after ``moment``."""
+        moment = moment.astimezone(self.tz)
+        start = self._at(moment, self.sessions["PRE_MARKET"][0])
+        if start <= moment:
+            start += datetime.timedelta(days=1)
+        while not self.is_trading_day(start):
+            start += datetime.timedelta(days=1)
+        # Rebuild from the wall-clock time so DST changes don't shift the open
+        return self._at(start, self.sessions["PRE_MARKET"][0])
+
+    def seconds_until_next_scan(self, moment, started_at):
+        """
+        Seconds to wait after a scan that started at ``started_at``. Closed
+        markets wait for the next session; otherwise the phase's interval is
+        measured from the previous scan's start, so slow scans don't drift.
+        """
+        phase = self.phase(moment)
+        if phase == CLOSED:
+            return (self.next_session_start(moment) - moment).total_seconds()
+
+        due = started_at + datetime.timedelta(seconds=self.intervals[phase])
+        # Never sleep through a phase change, e.g. a sparse pre-market interval
+        # must not skip the dense polling right after the open
+        due = min(due, self.next_boundary(moment))
+        return max(0.0, (due - moment).total_seconds())
+
+    def next_boundary(self, moment):
+        """Returns the next time after ``moment`` at which the phase can change."""
+        moment = moment.astimezone(self.tz)
+        market_open, market_close = (
+            self._at(moment, t) for t in self.sessions["REGULAR_MARKET"]
+        )
+        boundaries = [
+            market_open,
+            market_open + self.edge,
+            market_close - self.edge,
+            market_close,
+        ]
+        for session in ("PRE_MARKET", "POST_MARKET"):
+            boundaries.extend(self._at(moment, t) for t in self.sessions[session])
+        upcoming = [boundary for boundary in boundaries if boundary > moment]
+        return min(upcoming) if upcoming else self.next_session_start(moment)
+
+
+class ScanScheduler:
+    """
+    Re-runs a scan coroutine on the market-phase cadence from ``MarketCalendar``.
+
+    Scans run one at a time: the next one starts after the previous finishes,
+    and a scan that overruns its interval is followed immediately rather than
+    stacked. The scan callable's own objects (clients, caches, concurrency
+    controllers) persist across cycles. ``rate_limiters`` are the shared token
+    buckets whose usage is reported per cycle.
+    """
+
+    def __init__(self, scan, rate_limiters=None, calendar=None):
+        self.logger = logging.getLogger(__name__)
+        self.scan = scan
+        self.rate_limiters = rate_limiters or {}
+        self.calendar = calendar or MarketCalendar()
+        self.cycles = 0
+        self.running = False
+        self.stop_requested = False
+        self.stopped = None  # asyncio.Event, created by run() inside its loop
+
+    def stop(self):
+        """Ends the loop after the current scan (or immediately if idle)."""
+        self.stop_requested = True
+        if self.stopped:
+            self.stopped.set()
+
+    async def _sleep(self, seconds):
+        """Sleeps up to ``seconds``, waking early if ``stop()`` is called."""
+        stop = asyncio.ensure_future(self.stopped.wait())
+        try:
+            await asyncio.wait({stop}, timeout=seconds)
+        finally:
+            stop.cancel()
+
+    async def run_cycle(self):
+        """Runs one scan and logs its latency and API budget use."""
+        if self.running:
+            self.logger.warning("Previous scan still running; skipping this cycle.")
+            return None
+
+        self.running = True
+        used_before = {
+            api: limiter.acquired_total for api, limiter in self.rate_limiters.items()
+        }
+        started = time.perf_counter()
+        try:
+            return await self.scan()
+        except Exception as e:
+            self.logger.error(f"Scan cycle {self.cycles + 1} failed: {e}")
+            return None
+        finally:
+            self.running = False
+            self.cycles += 1
+            budget = ", ".join(
+                f"{api}: {limiter.acquired_total - used_before[api]}"
+                for api, limiter in self.rate_limiters.items()
+            )
+            self.logger.info(
+                f"Scan cycle {self.cycles} took {time.perf_counter() - started:.2f}s"
+                + (f" (API requests used - {budget})" if budget else "")
+            )
+
+    async def run(self, max_cycles=None):
+        """Scans on schedule until ``stop()`` is called or ``max_cycles`` ran."""
+        # Created here rather than in __init__: before Python 3.10 an Event
+        # binds to the loop current when it's built, which for a module-level
+        # scheduler is not the loop asyncio.run() starts, and waits on it fail
+        self.stopped = asyncio.Event()
+        if self.stop_requested:
+            self.stopped.set()
+
+        while not self.stopped.is_set():
+            now = self.calendar.now()
+            phase = self.calendar.phase(now)
+            if phase == CLOSED:
+                wait = self.calendar.seconds_until_next_scan(now, now)
+                self.logger.info(f"Market closed; next scan in {wait / 3600:.1f}h.")
+                await self._sleep(wait)
+                continue
+
+            await self.run_cycle()
+            if max_cycles is not None and self.cycles >= max_cycles:
+                break
+
+            wait = self.calendar.seconds_until_next_scan(self.calendar.now(), now)
+            self.logger.info(f"Market phase '{phase}'; next scan in {wait:.0f}s.")
+            await self._sleep(wait)
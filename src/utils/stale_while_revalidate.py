@@ -0,0 +1,153 @@
+import asyncio
+import functools
+import logging
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 4096  # Cached responses kept per method and instance
+
+
+class StaleDict(dict):
+    """A dict response tagged with how stale and how old it is, in seconds."""
+
+    staleness = 0.0
+    age = 0.0
+
+
+class StaleList(list):
+    """A list response tagged with how stale and how old it is, in seconds."""
+
+    staleness = 0.0
+    age = 0.0
+
+
+def _tagged(value, **tags):
+    if isinstance(value, dict):
+        tagged = StaleDict(value)
+    elif isinstance(value, list):
+        tagged = StaleList(value)
+    else:
+        return value  # Nothing to hang the attributes on
+    tagged.staleness = staleness_of(value)
+    tagged.age = age_of(value)
+    for name, tag in tags.items():
+        setattr(tagged, name, tag)
+    return tagged
+
+
+def with_staleness(value, staleness):
+    """Returns a copy of a dict/list response tagged with ``staleness``."""
+    return _tagged(value, staleness=staleness)
+
+
+def with_age(value, age):
+    """
+    Returns a copy of a dict/list response tagged with ``age``: how old it
+    already was when returned, e.g. when served from a shared cache.
+    """
+    return _tagged(value, age=age)
+
+
+def staleness_of(value):
+    """Seconds a response is past its soft TTL; 0 for fresh or untagged data."""
+    return getattr(value, "staleness", 0.0)
+
+
+def age_of(value):
+    """Seconds a response had aged before it was returned; 0 for fresh data."""
+    return getattr(value, "age", 0.0)
+
+
+def staleness_discount(staleness, half_life):
+    """Confidence multiplier that halves every ``half_life`` seconds of staleness."""
+    return 0.5 ** (staleness / half_life)
+
+
+def _freeze(value):
+    """Turns call arguments into a hashable cache key."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class _Entry:
+    __slots__ = ("fetched_at", "value", "refresh")
+
+    def __init__(self, fetched_at, value):
+        self.fetched_at = fetched_at
+        self.value = value
+        self.refresh = None  # Background refresh task, if one is running
+
+
+def stale_while_revalidate(
+    soft_ttl, hard_ttl, clock=time.monotonic, max_entries=DEFAULT_MAX_ENTRIES
+):
+    """
+    Caches an async method's responses per instance and arguments, keeping
+    the ``max_entries`` most recently used.
+
+    Within ``soft_ttl`` seconds a cached response is returned as is. Between
+    the soft and ``hard_ttl`` it is still returned immediately, while one
+    background call refreshes it; if that call fails (or returns None) the
+    stale response keeps being served until the hard TTL. Past the hard TTL
+    the caller waits for the upstream call. Dict and list responses carry a
+    ``staleness`` attribute: seconds past the soft TTL, 0 while fresh.
+
+    A response tagged ``with_age`` (say, read from another cache) is treated
+    as fetched that many seconds ago, so its TTLs and staleness count from
+    the original fetch rather than from when it reached this cache.
+    """
+    if hard_ttl < soft_ttl:
+        raise ValueError("hard_ttl must not be shorter than soft_ttl")
+
+    def decorator(func):
+        async def refresh(instance, entries, key, args, kwargs):
+            try:
+                value = await func(instance, *args, **kwargs)
+            except Exception as e:
+                logger.warning(f"Background refresh of {func.__qualname__} failed: {e}")
+                return
+            if value is not None:
+                store(entries, key, value)
+
+        def store(entries, key, value):
+            entries[key] = _Entry(clock() - age_of(value), value)
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)  # Least recently used
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            entries = self.__dict__.setdefault("_swr_entries", {}).setdefault(
+                func.__name__, OrderedDict()
+            )
+            key = (_freeze(args), _freeze(kwargs))
+            entry = entries.get(key)
+
+            if entry is not None:
+                age = clock() - entry.fetched_at
+                if age < hard_ttl:
+                    entries.move_to_end(key)
+                    if age >= soft_ttl and (
+                        entry.refresh is None or entry.refresh.done()
+                    ):
+                        entry.refresh = asyncio.ensure_future(
+                            refresh(self, entries, key, args, kwargs)
+                        )
+                    return with_staleness(entry.value, max(0.0, age - soft_ttl))
+                del entries[key]  # Too old to serve even as a fallback
+
+            value = await func(self, *args, **kwargs)
+            if value is None:
+                return value  # Failed lookups aren't cached
+            store(entries, key, value)
+            age = age_of(value)
+            return with_staleness(value, age - soft_ttl) if age > soft_ttl else value
+
+        return wrapper
+
+    return decorator
@@ -2,6 +2,185 @@ import logging
 import numpy as np
 
 
+def true_range(high, low, close):
+    """
+    True range of each bar along the last axis: the largest of high - low and
+    the gaps from the previous close. The first bar has no previous close, so
+    its true range is just high - low.
+    """
+    high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+    prev_close = close[..., :-1]
+    tr = high - low
+    tr[..., 1:] = np.maximum(
+        tr[..., 1:],
+        np.maximum(
+            np.abs(high[..., 1:] - prev_close), np.abs(low[..., 1:] - prev_close)
+        ),
+    )
+    return tr
+
+
+def wilder_atr(high, low, close, window):
+    """
+    Wilder ATR at the last bar of each row of ``(symbols, bars)`` arrays.
+
+    The first ``window`` true ranges seed the average and each later bar
+    updates it as ``atr = (atr * (window - 1) + tr) / window``. That recursion
+    unrolls into fixed geometric weights, so a whole universe reduces to one
+    matrix-vector product. Rows with fewer than ``window`` bars, or with a
+    missing (NaN) bar, come back as NaN.
+    """
+    tr = np.atleast_2d(true_range(high, low, close))
+    bars = tr.shape[-1]
+    if bars < window:
+        return np.full(tr.shape[0], np.nan)
+
+    decay = (window - 1) / window
+    steps = bars - window
+    seed = tr[:, :window].mean(axis=1)
+    weights = decay ** np.arange(steps - 1, -1, -1) / window
+    return seed * decay**steps + tr[:, window:] @ weights
+
+
+def wilder_atr_series(high, low, close, window, block=64):
+    """
+    Wilder ATR at every bar of ``(symbols, bars)`` arrays, NaN while warming up.
+
+    Within a block of ``block`` bars each ATR is the carried-in ATR decayed
+    plus a lower-triangular weighting of the block's true ranges, so the
+    series is built with one small matrix product per block instead of a
+    Python step per bar. A missing (NaN) bar makes that row NaN from then on.
+    """
+    tr = np.atleast_2d(true_range(high, low, close))
+    atr = np.full(tr.shape, np.nan)
+    if tr.shape[1] < window:
+        return atr
+    # Zero-filled so a gap can't leak into earlier bars of its block through
+    # a zero weight (0 * NaN is NaN); masked out again below
+    missing = np.isnan(tr)
+    tr = np.where(missing, 0.0, tr)
+
+    decay = (window - 1) / window
+    steps = np.arange(1, block + 1)
+    lag = steps[None, :] - steps[:, None]  # Output bar minus input bar
+    weights = np.where(lag >= 0, decay ** np.maximum(lag, 0) / window, 0.0)
+    carry = decay**steps
+
+    atr[:, window - 1] = tr[:, :window].mean(axis=1)
+    for start in range(window, tr.shape[1], block):
+        end = min(start + block, tr.shape[1])
+        size = end - start
+        atr[:, start:end] = (
+            atr[:, start - 1 : start] * carry[:size]
+            + tr[:, start:end] @ weights[:size, :size]
+        )
+    atr[np.logical_or.accumulate(missing, axis=1)] = np.nan
+    return atr
+
+
+class ATRTracker:
+    """
+    Streaming Wilder ATR for a fixed universe, updated in O(1) per bar.
+
+    Holds each symbol's previous close, running ATR and bar count in arrays
+    aligned with ``symbols``. Symbols whose bar is missing (NaN) are left
+    untouched for that update. ``atr`` is NaN until a symbol has seen
+    ``window`` bars, after which it matches ``wilder_atr`` over the same bars.
+    """
+
+    def __init__(self, symbols, window):
+        self.symbols = list(symbols)
+        self.index = {symbol: row for row, symbol in enumerate(self.symbols)}
+        self.window = window
+        self.prev_close = np.full(len(self.symbols), np.nan)
+        self.atr = np.full(len(self.symbols), np.nan)
+        self.tr_sum = np.zeros(len(self.symbols))  # Seeds the first average
+        self.counts = np.zeros(len(self.symbols), dtype=np.int64)
+
+    @classmethod
+    def from_history(cls, symbols, high, low, close, window):
+        """
+        Builds a tracker already caught up on ``(symbols, bars)`` history.
+        Missing bars are skipped as ``update`` skips them: rows with a gap (or
+        history shorter than ``window``) are replayed bar by bar, the rest use
+        the batched ``wilder_atr``.
+        """
+        tracker = cls(symbols, window)
+        high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+        gapped = (np.isnan(high) | np.isnan(low) | np.isnan(close)).any(axis=1)
+        batched = ~gapped & (close.shape[1] >= window)
+        if batched.any():
+            tracker.atr[batched] = wilder_atr(
+                high[batched], low[batched], close[batched], window
+            )
+            tracker.prev_close[batched] = close[batched, -1]
+            tracker.counts[batched] = close.shape[1]
+
+        replayed = ~batched
+        if replayed.any():
+            rows = cls(np.flatnonzero(replayed), window)
+            for bar in range(close.shape[1]):
+                rows.update(
+                    high[replayed, bar], low[replayed, bar], close[replayed, bar]
+                )
+            for state in ("prev_close", "atr", "tr_sum", "counts"):
+                getattr(tracker, state)[replayed] = getattr(rows, state)
+        return tracker
+
+    @classmethod
+    def from_store(cls, store, window):
+        """Builds a tracker from a FeatureStore's buffered history."""
+        return cls.from_history(
+            store.symbols,
+            store.window("high"),
+            store.window("low"),
+            store.window("close"),
+            window,
+        )
+
+    def update(self, high, low, close):
+        """Adds one bar for every symbol from arrays aligned with ``symbols``."""
+        high, low, close = (np.asarray(a, dtype=np.float64) for a in (high, low, close))
+        present = ~(np.isnan(high) | np.isnan(low) | np.isnan(close))
+        tr = high - low
+        has_prev_close = ~np.isnan(self.prev_close)
+        tr[has_prev_close] = np.maximum(
+            tr[has_prev_close],
+            np.maximum(
+                np.abs(high[has_prev_close] - self.prev_close[has_prev_close]),
+                np.abs(low[has_prev_close] - self.prev_close[has_prev_close]),
+            ),
+        )
+
+        counts = self.counts + present
+        seeding = present & (counts <= self.window)
+        self.tr_sum[seeding] += tr[seeding]
+        seeded = present & (counts == self.window)
+        self.atr[seeded] = self.tr_sum[seeded] / self.window
+        smoothing = present & (counts > self.window)
+        self.atr[smoothing] = (
+            self.atr[smoothing] * (self.window - 1) + tr[smoothing]
+        ) / self.window
+
+        self.counts = counts
+        self.prev_close[present] = close[present]
+        return self.atr
+
+    def update_symbol(self, symbol, high, low, close):
+        """Adds one bar for one symbol and returns its ATR (NaN while warming up)."""
+        row = self.index[symbol]
+        bar = np.full((3, len(self.symbols)), np.nan)
+        bar[:, row] = high, low, close
+        return self.update(*bar)[row]
+
+    def get(self, symbol):
+        """Returns a symbol's current ATR, or None while it is still warming up."""
+        row = self.index.get(symbol)
+        if row is None or np.isnan(self.atr[row]):
+            return None
+        return float(self.atr[row])
+
+
 class VolatilityForecasting:
     """Predicts large stock movements based on ATR, implied volatility, and pre-market volume anomalies."""
 
@@ -11,26 +190,31 @@ class VolatilityForecasting:
         self.iv_threshold = 0.3  # Example threshold for high implied volatility
 
     def calculate_atr(self, historical_prices):
-        """Calculates Average True Range (ATR) over the configured window."""
+        """Calculates Wilder's Average True Range (ATR) over the configured window."""
         if len(historical_prices["high"]) < self.atr_window:
             self.logger.warning("Not enough historical data for ATR calculation.")
             return None
 
-        high_low = np.abs(
-            np.array(historical_prices["high"]) - np.array(historical_prices["low"])
-        )
-        high_close = np.abs(
-            np.array(historical_prices["high"])
-            - np.array(historical_prices["close"][:-1])
-        )
-        low_close = np.abs(
-            np.array(historical_prices["low"])
-            - np.array(historical_prices["close"][:-1])
+        atr = wilder_atr(
+            historical_prices["high"],
+            historical_prices["low"],
+            historical_prices["close"],
+            self.atr_window,
+        )[0]
+        return round(float(atr), 2)
+
+    def calculate_universe_atr(self, store):
+        """Returns Wilder ATR for every symbol in a FeatureStore, NaN where short."""
+        return wilder_atr(
+            store.window("high"),
+            store.window("low"),
+            store.window("close"),
+            self.atr_window,
         )
 
-        true_range = np.maximum(high_low, np.maximum(high_close, low_close))
-        atr = np.mean(true_range[-self.atr_window :])
-        return round(atr, 2)
+    def atr_tracker(self, store):
+        """Returns a streaming ATRTracker caught up on a FeatureStore's history."""
+        return ATRTracker.from_store(store, self.atr_window)
 
     def detect_pre_market_anomaly(self, premarket_volume, avg_volume):
         """Detects abnormal pre-market volume spikes that indicate potential volatility."""
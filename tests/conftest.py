@@ -0,0 +1,11 @@
+import os
+
+# src.config.settings refuses to import without credentials; tests never use them
+for key in (
+    "FINNHUB_API_KEY",
+    "ALPHA_VANTAGE_API_KEY",
+    "DATABASE_URL",
+    "TELEGRAM_BOT_TOKEN",
+    "TELEGRAM_CHAT_ID",
+):
+    os.environ.setdefault(key, "test")
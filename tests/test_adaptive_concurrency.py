@@ -0,0 +1,51 @@
+import asyncio
+
+from src.utils.adaptive_concurrency import AdaptiveConcurrency
+from src.utils.error_handling import RateLimitError
+
+
+def test_map_yields_every_item_and_requeues_rate_limited_ones():
+    attempts = {}
+
+    async def call(item):
+        attempts[item] = attempts.get(item, 0) + 1
+        if item == 3 and attempts[item] == 1:
+            raise RateLimitError("slow down", retry_after=0)
+        await asyncio.sleep(0)
+        return item * 2
+
+    async def run():
+        controller = AdaptiveConcurrency(initial=4)
+        return {item: result async for item, result in controller.map(call, range(8))}
+
+    assert asyncio.run(run()) == {item: item * 2 for item in range(8)}
+    assert attempts[3] == 2
+
+
+def test_rate_limit_halves_the_window():
+    controller = AdaptiveConcurrency(initial=16, clock=lambda: 100.0)
+    controller.on_rate_limited(retry_after=2)
+    assert controller.window == 8
+    assert controller.resume_at == 102.0
+
+
+def test_closing_map_early_cancels_in_flight_calls():
+    cancelled = []
+
+    async def call(item):
+        try:
+            await asyncio.sleep(0 if item == 0 else 60)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+        return item
+
+    async def run():
+        results = AdaptiveConcurrency(initial=4).map(call, range(10))
+        async for item, _ in results:
+            break
+        await results.aclose()
+        await asyncio.sleep(0)  # Let the cancellations land
+        return sorted(cancelled)  # Checked before asyncio.run cancels leftovers
+
+    assert asyncio.run(run()) == [1, 2, 3]
@@ -0,0 +1,104 @@
+import asyncio
+
+from src.api.alpha_vantage_client import AlphaVantageClient
+from src.benchmarks.mock_market_server import LatencyModel, MockMarketServer
+from src.utils.error_handling import RateLimitError
+from src.utils.rate_limiter import TokenBucket
+
+
+def article(*tickers):
+    return {"ticker_sentiment": [{"ticker": ticker} for ticker in tickers]}
+
+
+def test_sparse_sweep_symbols_fall_back_to_single_ticker_requests():
+    client = AlphaVantageClient("key", min_sweep_items=2)
+    queries = []
+
+    async def query(params):
+        queries.append(params.get("tickers"))
+        if "tickers" not in params:
+            return {"feed": [article("AAPL", "MSFT"), article("AAPL")]}
+        if params["tickers"] == "TSLA":
+            raise Exception("boom")
+        return {"feed": [{"title": params["tickers"]}]}
+
+    client._query = query
+    news = asyncio.run(client.get_news_sentiment(["AAPL", "MSFT", "TSLA"]))
+
+    assert sorted(queries, key=str) == sorted([None, "MSFT", "TSLA"], key=str)
+    assert len(news["AAPL"]) == 2  # Enough sweep coverage, no extra request
+    assert news["MSFT"] == [{"title": "MSFT"}]
+    assert news["TSLA"] == []
+
+
+def test_failed_symbols_are_not_served_as_cached_empty_news():
+    client = AlphaVantageClient("key")
+    failing = {"TSLA"}
+
+    async def query(params):
+        if "tickers" not in params:
+            return {"feed": []}
+        if params["tickers"] in failing:
+            raise Exception("boom")
+        return {"feed": [{"title": params["tickers"]}]}
+
+    client._query = query
+
+    async def run():
+        first = await client.get_news_sentiment(["AAPL", "TSLA"])
+        failing.clear()
+        return first, await client.get_news_sentiment(["AAPL", "TSLA"])
+
+    first, second = asyncio.run(run())
+    assert first["TSLA"] == []
+    assert second["TSLA"] == [{"title": "TSLA"}]
+
+
+def test_rate_limited_sweep_does_not_fan_out():
+    client = AlphaVantageClient("key")
+    queries = []
+
+    async def query(params):
+        queries.append(params.get("tickers"))
+        raise RateLimitError("429")
+
+    client._query = query
+    news = asyncio.run(client.get_news_sentiment(["AAPL", "MSFT", "TSLA"]))
+
+    assert queries == [None]
+    assert news == {"AAPL": [], "MSFT": [], "TSLA": []}
+
+
+def test_fetch_slots_follow_the_running_loop():
+    client = AlphaVantageClient("key")
+
+    async def slots():
+        async with client.fetch_slots:
+            assert client.fetch_slots is client.fetch_slots
+            return client.fetch_slots
+
+    first = asyncio.run(slots())
+    assert asyncio.run(slots()) is not first  # A new loop gets its own semaphore
+
+
+def test_sweep_leaves_only_uncovered_symbols_to_single_ticker_requests():
+    universe = [f"SYM{i}" for i in range(300)]
+    server = MockMarketServer(latency=LatencyModel(0.001, 0.002), universe=universe)
+
+    async def run():
+        async with server:
+            client = AlphaVantageClient(
+                "key",
+                base_url=server.alpha_vantage_url,
+                rate_limiter=TokenBucket(1000, 1000),
+            )
+            try:
+                return await client.get_news_sentiment(universe)
+            finally:
+                await client.close()
+
+    news = asyncio.run(run())
+    quiet = [symbol for symbol in universe if not server.news_count(symbol)]
+    assert server.stats["requests"] == 1 + len(quiet)
+    assert len(quiet) < len(universe) / 2
+    assert all(len(news[s]) == server.news_count(s) for s in universe)
@@ -0,0 +1,166 @@
+import numpy as np
+import pytest
+
+from src.risk_management import RiskManagement
+from src.volatility_forecasting import ATRTracker, wilder_atr, wilder_atr_series
+
+WINDOW = 14
+
+
+def reference_atr(high, low, close, window):
+    """Textbook per-bar Wilder ATR for one symbol, NaN before ``window`` bars."""
+    ranges = [high[0] - low[0]] + [
+        max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1]))
+        for i in range(1, len(high))
+    ]
+    series = [np.nan] * len(ranges)
+    if len(ranges) < window:
+        return series
+    atr = sum(ranges[:window]) / window
+    series[window - 1] = atr
+    for i in range(window, len(ranges)):
+        atr = (atr * (window - 1) + ranges[i]) / window
+        series[i] = atr
+    return series
+
+
+def synthetic_bars(symbols, bars, seed=7):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, (symbols, bars)), axis=1)
+    high = close + rng.uniform(0, 2, (symbols, bars))
+    low = close - rng.uniform(0, 2, (symbols, bars))
+    return high, low, close
+
+
+def reference_series(high, low, close, window=WINDOW):
+    return np.array(
+        [reference_atr(h, lo, c, window) for h, lo, c in zip(high, low, close)]
+    )
+
+
+@pytest.mark.parametrize("bars", [WINDOW - 1, WINDOW, WINDOW + 1, 200])
+def test_batched_and_series_match_reference(bars):
+    high, low, close = synthetic_bars(20, bars)
+    expected = reference_series(high, low, close)
+
+    np.testing.assert_allclose(
+        wilder_atr(high, low, close, WINDOW), expected[:, -1], rtol=1e-9
+    )
+    np.testing.assert_allclose(
+        wilder_atr_series(high, low, close, WINDOW, block=16), expected, rtol=1e-9
+    )
+
+
+def test_warm_up_boundary_is_the_mean_true_range():
+    high, low, close = synthetic_bars(5, WINDOW)
+    tr = np.array(reference_series(high, low, close, window=1))
+    assert np.isnan(wilder_atr(high[:, :-1], low[:, :-1], close[:, :-1], WINDOW)).all()
+    np.testing.assert_allclose(
+        wilder_atr(high, low, close, WINDOW), tr.mean(axis=1), rtol=1e-12
+    )
+
+
+def test_streaming_and_resumed_trackers_match_reference():
+    high, low, close = synthetic_bars(20, 60)
+    expected = reference_series(high, low, close)
+
+    tracker = ATRTracker(range(20), WINDOW)
+    for bar in range(60):
+        atr = tracker.update(high[:, bar], low[:, bar], close[:, bar])
+        np.testing.assert_allclose(atr, expected[:, bar], rtol=1e-9)
+
+    for split in (WINDOW - 1, WINDOW, 30):
+        resumed = ATRTracker.from_history(
+            range(20), high[:, :split], low[:, :split], close[:, :split], WINDOW
+        )
+        for bar in range(split, 60):
+            resumed.update(high[:, bar], low[:, bar], close[:, bar])
+        np.testing.assert_allclose(resumed.atr, expected[:, -1], rtol=1e-9)
+
+
+def test_missing_bars():
+    high, low, close = synthetic_bars(3, 40)
+    gapped = [a.copy() for a in (high, low, close)]
+    for array in gapped:
+        array[1, 20] = np.nan
+
+    # Batched ATR reports NaN for a row with a gap, from the gap onwards
+    batched = wilder_atr(*gapped, WINDOW)
+    assert np.isnan(batched[1]) and not np.isnan(batched[[0, 2]]).any()
+    series = wilder_atr_series(*gapped, WINDOW, block=16)
+    assert not np.isnan(series[1, WINDOW - 1 : 20]).any()
+    assert np.isnan(series[1, 20:]).all()
+
+    # The tracker skips the missing bar, as if the symbol never had it
+    tracker = ATRTracker(range(3), WINDOW)
+    for bar in range(40):
+        tracker.update(*(array[:, bar] for array in gapped))
+    kept = np.delete(np.arange(40), 20)
+    expected = reference_atr(high[1, kept], low[1, kept], close[1, kept], WINDOW)
+    assert tracker.atr[1] == pytest.approx(expected[-1], rel=1e-9)
+    assert tracker.counts.tolist() == [40, 39, 40]
+
+
+@pytest.mark.parametrize("bars", [WINDOW - 2, 40])
+def test_resumed_tracker_skips_gaps_like_streaming(bars):
+    high, low, close = synthetic_bars(4, bars + 10)
+    for array in (high, low, close):
+        array[1, 3] = np.nan  # Gap during warm-up
+        array[2, bars - 2] = np.nan  # Gap late in the history
+    close[3, 5] = np.nan  # Only one field missing
+
+    streamed = ATRTracker(range(4), WINDOW)
+    for bar in range(bars):
+        streamed.update(high[:, bar], low[:, bar], close[:, bar])
+    resumed = ATRTracker.from_history(
+        range(4), high[:, :bars], low[:, :bars], close[:, :bars], WINDOW
+    )
+    np.testing.assert_array_equal(resumed.counts, streamed.counts)
+    np.testing.assert_allclose(resumed.atr, streamed.atr, rtol=1e-9)
+
+    for bar in range(bars, bars + 10):  # And they stay in step afterwards
+        streamed.update(high[:, bar], low[:, bar], close[:, bar])
+        resumed.update(high[:, bar], low[:, bar], close[:, bar])
+    np.testing.assert_allclose(resumed.atr, streamed.atr, rtol=1e-9)
+    assert not np.isnan(resumed.atr).any()
+
+
+def test_tracker_reports_none_while_warming_up():
+    high, low, close = synthetic_bars(1, WINDOW)
+    tracker = ATRTracker(["AAPL"], WINDOW)
+    for bar in range(WINDOW - 1):
+        tracker.update_symbol("AAPL", high[0, bar], low[0, bar], close[0, bar])
+    assert tracker.get("AAPL") is None
+    tracker.update_symbol("AAPL", high[0, -1], low[0, -1], close[0, -1])
+    assert tracker.get("AAPL") == pytest.approx(
+        reference_atr(high[0], low[0], close[0], WINDOW)[-1]
+    )
+    assert tracker.get("MSFT") is None
+
+
+@pytest.fixture
+def risk():
+    config = {
+        "trading": {
+            "position_sizing": {"base_risk_per_trade": 0.02, "adaptive_risk": True},
+            "stop_loss_atr_multiplier": 2.0,
+        }
+    }
+    tracker = ATRTracker(["FLAT", "NEW", "AAPL"], 1)
+    tracker.update([10, np.nan, 101], [10, np.nan, 99], [10, np.nan, 100])
+    return RiskManagement(config, atr_tracker=tracker)
+
+
+def test_tracked_stops_and_sizes_agree_on_unusable_atr(risk):
+    assert risk.stop_loss_for("AAPL", 100) == 96
+    assert risk.position_size_for("AAPL", 10_000, 100, 50) == 25
+    for symbol in ("FLAT", "NEW"):  # Zero and missing ATR
+        assert risk.stop_loss_for(symbol, 10) is None
+        assert risk.position_size_for(symbol, 10_000, 10, 50) is None
+
+
+def test_position_sizes_are_whole_shares_and_skip_unusable_atr(risk):
+    sizes = risk.position_sizes(10_000, [0.0, np.nan, 2.0, 1000.0], 100, 50)
+    assert sizes.dtype == np.int64
+    assert sizes.tolist() == [0, 0, 25, 1]
+    assert risk.calculate_position_size(10_000, 2.0, 100, 50) == sizes[2]
@@ -0,0 +1,101 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from src.backtesting import Backtester, align_sentiment
+from src.risk_management import RiskManagement
+from src.sentiment.cache import SentimentCache
+from src.sentiment.vectorized_scoring import VectorizedNewsScorer
+
+MODEL = "test-model"
+START = datetime.datetime(2024, 1, 2, 14, 30)
+
+
+def random_news(rng, count, hours):
+    return [
+        {
+            "headline": f"headline {rng.integers(40)}",
+            "date": START + datetime.timedelta(hours=float(rng.uniform(-48, hours))),
+            "source": str(rng.choice(["Reuters", "Blog"])),
+        }
+        for _ in range(count)
+    ]
+
+
+def test_align_sentiment_matches_the_live_scorer_at_every_bar():
+    rng = np.random.default_rng(5)
+    cache = SentimentCache(":memory:")
+    cache.set_many(
+        {f"headline {i}": {"label": "x", "score": rng.uniform()} for i in range(30)},
+        MODEL,
+    )
+    symbols = ["A", "B", "C"]
+    news = {"A": random_news(rng, 40, 24 * 12), "B": random_news(rng, 5, 24)}
+    news["B"].append({"headline": "headline 1"})  # Undated: skipped
+    times = np.datetime64(START, "s") + np.arange(0, 12 * 86400, 3 * 3600)
+
+    scorer = VectorizedNewsScorer()
+    aligned = align_sentiment(times, symbols, news, cache, MODEL, scorer)
+    assert aligned.shape == (3, len(times))
+
+    cached = cache.get_many([n["headline"] for n in news["A"] + news["B"]], MODEL)
+    for row, symbol in enumerate(symbols):
+        for bar, time in enumerate(times.astype(datetime.datetime)):
+            visible = [
+                n
+                for n in news.get(symbol, ())
+                if n.get("date") and n["headline"] in cached and n["date"] <= time
+            ]
+            expected = scorer.score(
+                {symbol: visible},
+                {symbol: [cached[n["headline"]] for n in visible]},
+                now=time,
+            )[symbol]
+            assert aligned[row, bar] == pytest.approx(expected, abs=1e-9)
+    assert not aligned[2].any()  # No news at all
+
+
+def test_expired_news_stays_in_the_mean_with_zero_weight():
+    cache = SentimentCache(":memory:")
+    outputs = {"fresh": {"label": "POSITIVE", "score": 0.9}}
+    outputs["old"] = outputs["fresh"]
+    cache.set_many(outputs, MODEL)
+    now = START + datetime.timedelta(days=10)
+    news = {
+        "A": [
+            {"headline": h, "date": date, "source": "Reuters"}
+            for h, date in (
+                ("fresh", now - datetime.timedelta(hours=1)),
+                ("old", START),
+            )
+        ]
+    }
+
+    scorer = VectorizedNewsScorer()
+    live = scorer.score(news, {"A": list(outputs.values())}, now=now)["A"]
+    times = np.array([np.datetime64(now, "s")])
+    aligned = align_sentiment(times, ["A"], news, cache, MODEL, scorer)
+    assert aligned[0, 0] == live == 22.5
+
+
+def test_risk_sizing_is_capped_at_the_account_balance():
+    risk = RiskManagement(
+        {
+            "trading": {
+                "position_sizing": {
+                    "base_risk_per_trade": 0.02,
+                    "adaptive_risk": True,
+                },
+                "stop_loss_atr_multiplier": 2.0,
+            }
+        }
+    )
+    bars = 40
+    close = np.full((1, bars), 100.0)
+    # A tiny ATR would size the position at many times the account
+    high, low = close + 0.001, close - 0.001
+    backtester = Backtester(risk=risk, account_balance=5_000, atr_window=5)
+    trades, _ = backtester.run(high, low, close, np.full((1, 1), 90.0))
+    assert len(trades["shares"])
+    assert (trades["shares"] * trades["entry_price"] <= 5_000).all()
@@ -0,0 +1,154 @@
+import multiprocessing
+import os
+
+import numpy as np
+import pytest
+
+from src.bar_archive import (
+    BASE,
+    DELTA_PREFIX,
+    LOCK,
+    REPLACED,
+    STAGING,
+    BarArchive,
+    Chunk,
+    StaleChunkError,
+)
+
+START = np.datetime64("2024-01-02T14:30", "s")
+
+
+def bars(count, close=0.0, offset=0):
+    times = START + np.arange(offset, offset + count) * np.timedelta64(60, "s")
+    values = np.full(count, close) + np.arange(count)
+    return {
+        "time": times,
+        "open": values,
+        "high": values,
+        "low": values,
+        "close": values,
+        "volume": np.arange(count),
+    }
+
+
+def load_closes(archive, symbol="X"):
+    return archive.load_symbol(symbol, START, START + 86400)["close"].tolist()
+
+
+def test_deltas_merge_and_compact_into_one_view(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    archive.append("X", bars(5))
+    archive.append("X", bars(2, close=100.0, offset=4))
+    assert load_closes(archive) == [0, 1, 2, 3, 100, 101]
+
+    assert archive.compact() == 1
+    assert archive.compact() == 0
+    loaded = archive.load_symbol("X", START, START + 86400)
+    assert isinstance(loaded["close"], np.memmap)
+    assert loaded["close"].tolist() == [0, 1, 2, 3, 100, 101]
+
+
+def test_reads_see_other_processes_appends_and_compactions(tmp_path):
+    reader, writer = BarArchive(str(tmp_path)), BarArchive(str(tmp_path))
+    writer.append("X", bars(3))
+    assert load_closes(reader) == [0, 1, 2]
+
+    writer.append("X", bars(1, close=50.0, offset=3))
+    assert load_closes(reader) == [0, 1, 2, 50]
+
+    writer.append("X", bars(1, close=60.0, offset=4))
+    writer.compact()
+    assert load_closes(reader) == [0, 1, 2, 50, 60]
+    chunks = reader.chunks[reader._partition("X", 2024)]
+    assert [os.path.basename(chunk.path) for chunk in chunks] == [BASE]
+
+
+def test_chunk_refuses_to_mix_columns_across_a_compaction(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    archive.append("X", bars(3))
+    archive.compact()
+    partition = archive._partition("X", 2024)
+    chunk = Chunk(os.path.join(partition, BASE))
+    chunk["time"]
+
+    archive.append("X", bars(1, close=9.0, offset=3))
+    archive.compact()  # Swaps in a new base directory
+    with pytest.raises(StaleChunkError):
+        chunk["close"]
+    assert load_closes(archive) == [0, 1, 2, 9]
+
+
+def test_interrupted_swap_rolls_back_to_the_old_base(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    archive.append("X", bars(3))
+    archive.compact()
+    archive.append("X", bars(1, close=9.0, offset=3))
+    partition = archive._partition("X", 2024)
+
+    # Crash after the old base was moved aside, before the new one moved in
+    archive._write_chunk(os.path.join(partition, STAGING), bars(1))
+    os.replace(os.path.join(partition, BASE), os.path.join(partition, REPLACED))
+    assert load_closes(BarArchive(str(tmp_path))) == [0, 1, 2, 9]
+
+    assert archive.compact() == 1
+    assert sorted(os.listdir(partition)) == [LOCK, BASE]
+    assert load_closes(archive) == [0, 1, 2, 9]
+
+
+def test_leftovers_of_a_finished_swap_are_cleaned_up(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    archive.append("X", bars(3))
+    archive.compact()
+    partition = archive._partition("X", 2024)
+    archive._write_chunk(os.path.join(partition, REPLACED), bars(1))
+    archive._write_chunk(os.path.join(partition, STAGING), bars(1))
+
+    assert archive.compact() == 0
+    assert sorted(os.listdir(partition)) == [LOCK, BASE]
+    assert load_closes(archive) == [0, 1, 2]
+
+
+def test_compaction_keeps_deltas_it_did_not_merge(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    archive.append("X", bars(3))
+    partition = archive._partition("X", 2024)
+    late = os.path.join(partition, f"{DELTA_PREFIX}9")
+    write_chunk = archive._write_chunk
+
+    def write_staging(path, columns):
+        write_chunk(path, columns)
+        if path.endswith(STAGING):  # Lands after the chunks were listed
+            write_chunk(late, bars(1, close=7.0, offset=3))
+
+    archive._write_chunk = write_staging
+    assert archive.compact() == 1
+    assert sorted(os.listdir(partition)) == [LOCK, BASE, f"{DELTA_PREFIX}9"]
+    assert load_closes(archive) == [0, 1, 2, 7]
+
+
+def append_and_compact(root, worker, count):
+    archive = BarArchive(root)
+    for i in range(count):
+        offset = worker * count + i
+        archive.append("X", bars(1, close=offset, offset=offset))
+        if i % 3 == 0:
+            archive.compact()
+
+
+def test_concurrent_appends_and_compactions_lose_no_bars(tmp_path):
+    workers, count = 4, 15
+    context = multiprocessing.get_context("fork")
+    processes = [
+        context.Process(target=append_and_compact, args=(str(tmp_path), w, count))
+        for w in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    assert [process.exitcode for process in processes] == [0] * workers
+
+    archive = BarArchive(str(tmp_path))
+    assert load_closes(archive) == list(range(workers * count))
+    archive.compact()
+    assert load_closes(archive) == list(range(workers * count))
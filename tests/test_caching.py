@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from src.utils.caching import TieredCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """Just the pipelined commands TieredCache uses, expiring on ``clock``."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}  # key -> (expires_at, bytes)
+        self.pipelines = 0
+
+    def _live(self, key):
+        entry = self.data.get(key)
+        if entry and entry[0] <= self.clock():
+            del self.data[key]
+            return None
+        return entry
+
+    def pipeline(self, transaction=False):
+        self.pipelines += 1
+        return FakePipeline(self)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+    def mget(self, keys):
+        self.commands.append(
+            lambda: [(self.redis._live(key) or (None, None))[1] for key in keys]
+        )
+
+    def pttl(self, key):
+        def pttl():
+            entry = self.redis._live(key)
+            return int((entry[0] - self.redis.clock()) * 1000) if entry else -2
+
+        self.commands.append(pttl)
+
+    def set(self, key, value, px):
+        def set_():
+            self.redis.data[key] = (self.redis.clock() + px / 1000, value)
+            return True
+
+        self.commands.append(set_)
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+def make_cache(clock, redis):
+    return TieredCache(redis_client=redis, clock=clock, ttls={"quote": 15})
+
+
+def test_entries_expire_after_their_namespace_ttl_in_both_tiers():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    cache = make_cache(clock, redis)
+
+    async def run():
+        await cache.mset("quote", {"AAPL": {"c": 1.0}})
+        clock.now += 14
+        hit = await cache.get("quote", "AAPL")
+        clock.now += 2
+        return hit, await cache.get("quote", "AAPL")
+
+    hit, expired = asyncio.run(run())
+    assert hit == {"c": 1.0}
+    assert expired is None
+    assert cache.misses == 1
+
+
+def test_redis_hits_are_promoted_locally_for_their_remaining_ttl():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    writer, reader = make_cache(clock, redis), make_cache(clock, redis)
+
+    async def run():
+        await writer.mset("quote", {"AAPL": {"c": 1.0}})
+        clock.now += 10
+        first = await reader.get_with_age("quote", "AAPL")
+        pipelines = redis.pipelines
+        second = await reader.get_with_age("quote", "AAPL")
+        assert redis.pipelines == pipelines  # Served by the local tier
+        clock.now += 6
+        return first, second, await reader.get("quote", "AAPL")
+
+    first, second, expired = asyncio.run(run())
+    assert first == ({"c": 1.0}, pytest.approx(10.0))  # Aged from the write
+    assert second == first
+    assert (reader.remote_hits, reader.local_hits) == (1, 1)
+    assert expired is None  # Not kept locally past the Redis TTL
+
+
+def test_deferred_writes_reach_redis_in_one_pipeline():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    cache = make_cache(clock, redis)
+
+    async def run():
+        for symbol in ("AAPL", "MSFT", "TSLA"):
+            cache.set_deferred("news", symbol, [symbol])
+        assert redis.data == {}  # Only local until the flush
+        assert await cache.get("news", "MSFT") == ["MSFT"]
+        pipelines = redis.pipelines
+        await cache.flush_task
+        return redis.pipelines - pipelines
+
+    assert asyncio.run(run()) == 1
+    assert sorted(redis.data) == ["news:AAPL", "news:MSFT", "news:TSLA"]
+
+
+def test_close_flushes_pending_writes():
+    clock = FakeClock()
+    redis = FakeRedis(clock)
+    cache = make_cache(clock, redis)
+
+    async def run():
+        cache.set_deferred("quote", "AAPL", {"c": 1.0})
+        redis.aclose = lambda: asyncio.sleep(0)
+        await cache.close()
+
+    asyncio.run(run())
+    assert list(redis.data) == ["quote:AAPL"]
@@ -0,0 +1,86 @@
+import pathlib
+import subprocess
+import sys
+
+from src.sentiment.batch_scorer import BatchSentimentScorer
+from src.sentiment.cache import SentimentCache
+from src.sentiment.dedup import HeadlineDeduplicator, minhash
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+HEADLINES = [
+    "Apple beats quarterly earnings estimates on strong iPhone sales",
+    "Apple beats quarterly earnings estimates on strong iPhone sales - Reuters",
+    "Tesla shares slide after deliveries miss expectations",
+]
+
+
+def test_signatures_are_identical_across_processes():
+    script = (
+        "from src.sentiment.dedup import minhash; "
+        f"print(minhash({HEADLINES!r}).tolist())"
+    )
+    outputs = {
+        subprocess.run(
+            [sys.executable, "-c", script],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=ROOT,
+            env={"PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert outputs == {f"{minhash(HEADLINES).tolist()}\n"}
+
+
+def test_near_duplicates_share_a_cluster():
+    labels = HeadlineDeduplicator().cluster(HEADLINES)
+    assert labels[0] == labels[1] != labels[2]
+
+
+def test_collapse_prefers_credible_sources():
+    news = {
+        "AAPL": [
+            {"headline": HEADLINES[0], "source": "Yahoo"},
+            {"headline": HEADLINES[0].upper(), "source": "Reuters"},
+        ]
+    }
+    deduplicator = HeadlineDeduplicator()
+    collapsed = deduplicator.collapse(news)
+    assert [item["source"] for item in collapsed["AAPL"]] == ["Reuters"]
+    assert deduplicator.last_stats["ratio"] == 0.5
+
+
+def test_opposite_headlines_never_share_a_cluster():
+    rise = "Tesla shares rise sharply after quarterly deliveries beat analyst forecasts"
+    fall = "Tesla shares fall sharply after quarterly deliveries beat analyst forecasts"
+    labels = HeadlineDeduplicator().cluster([rise, fall, f"{rise} - Reuters"])
+    assert labels[0] == labels[2] != labels[1]
+
+
+def test_clusters_do_not_chain_through_shared_copies():
+    story = "Nvidia unveils new data center chips at annual developer conference"
+    tagged = f"{story} Reuters"
+    prefixed = f"UPDATE {story}"
+    labels = HeadlineDeduplicator(threshold=0.5).cluster([tagged, story, prefixed])
+    # Both copies contain the story, but not each other
+    assert labels[0] == labels[1] == labels[2]
+    labels = HeadlineDeduplicator(threshold=0.5).cluster([tagged, prefixed])
+    assert labels[0] != labels[1]
+
+
+def test_only_headlines_run_through_the_model_are_cached():
+    cache = SentimentCache(":memory:")
+    calls = []
+
+    def analyzer(headlines, **kwargs):
+        calls.append(list(headlines))
+        return [{"label": "POSITIVE", "score": 0.9} for _ in headlines]
+
+    scorer = BatchSentimentScorer(
+        analyzer, cache=cache, deduplicator=HeadlineDeduplicator()
+    )
+    results = scorer.score(HEADLINES[:2])
+    assert len(calls[0]) == 1 and results[0] == results[1]
+    assert list(cache.get_many(HEADLINES[:2], scorer.model_id)) == calls[0]
@@ -0,0 +1,74 @@
+import numpy as np
+
+from src.bar_archive import BarArchive
+from src.feature_store import FeatureStore
+
+START = np.datetime64("2024-01-02T14:30", "s")
+MINUTE = np.timedelta64(60, "s")
+
+
+def filled(count, capacity=4):
+    store = FeatureStore(["A", "B"], capacity=capacity)
+    for i in range(count):
+        store.append_arrays(
+            START + i * MINUTE, close=np.array([i, 100 + i]), volume=np.array([1, 2])
+        )
+    return store
+
+
+def test_windows_are_contiguous_views_across_the_wraparound():
+    store = filled(10)
+    assert len(store) == 4
+    window = store.window("close")
+    assert window.base is not None  # A view, not a copy
+    assert window.tolist() == [[6, 7, 8, 9], [106, 107, 108, 109]]
+    assert store.window("close", 2).tolist() == [[8, 9], [108, 109]]
+    assert store.history("B", 3)["close"].tolist() == [107, 108, 109]
+    assert np.isnan(store.window("open")).all()  # Left out: missing
+
+
+def test_short_history_windows_hold_only_appended_bars():
+    store = filled(2)
+    assert store.window("close", 4).tolist() == [[0, 1], [100, 101]]
+    assert not store.complete(3).any()
+    assert store.complete(2).all()
+
+
+def test_timestamps_stay_aligned_with_the_bars():
+    store = filled(7)
+    times = store.timestamps()
+    assert (times == START + np.arange(3, 7) * MINUTE).all()
+    assert store.window("close")[0].tolist() == [3, 4, 5, 6]
+
+
+def test_epoch_zero_is_a_timestamp_not_a_missing_one():
+    store = FeatureStore(["A"], capacity=2)
+    store.append_arrays(0, close=np.array([1.0]))
+    store.append_arrays(np.datetime64(0, "s"), close=np.array([2.0]))
+    store.append_arrays(None, close=np.array([3.0]))
+    times = store.timestamps()
+    assert times[0] == np.datetime64(0, "s")
+    assert np.isnat(times[1])
+
+
+def test_from_archive_aligns_symbols_on_shared_bar_times(tmp_path):
+    archive = BarArchive(str(tmp_path))
+    for symbol, offsets in {"A": [0, 1, 2, 3, 4], "B": [1, 3, 4]}.items():
+        times = START + np.array(offsets) * MINUTE
+        values = np.array(offsets, dtype=float)
+        archive.append(
+            symbol,
+            {
+                "time": times,
+                **{f: values for f in ("open", "high", "low", "close")},
+                "volume": np.array(offsets),
+            },
+        )
+
+    store = FeatureStore.from_archive(archive, ["A", "B"], START, START + 3600, 4)
+    assert (store.timestamps() == START + np.arange(1, 5) * MINUTE).all()
+    assert store.window("close")[0].tolist() == [1, 2, 3, 4]
+    assert np.isnan(store.window("close")[1, 1])  # No B bar at minute 2
+    assert store.window("close")[1, [0, 2, 3]].tolist() == [1, 3, 4]
+    assert store.complete(2).tolist() == [True, True]
+    assert store.complete(3).tolist() == [True, False]
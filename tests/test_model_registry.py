@@ -0,0 +1,20 @@
+from src.utils.model_registry import ModelRegistry
+
+
+def test_models_load_once_and_are_shared():
+    registry = ModelRegistry()
+    loads = []
+    registry.register("model", lambda: loads.append(1) or object())
+    assert registry.get("model") is registry.get("model")
+    assert len(loads) == 1
+
+
+def test_register_keeps_the_first_loader_unless_replacing():
+    registry = ModelRegistry()
+    registry.register("model", lambda: "default")
+    registry.register("model", lambda: "ignored")
+    registry.register("model", lambda: "configured", replace=True)
+    assert registry.get("model") == "configured"
+
+    registry.register("model", lambda: "too late", replace=True)
+    assert registry.get("model") == "configured"
@@ -0,0 +1,83 @@
+import asyncio
+
+from src.api.quote_service import QuoteService
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FakeFinnhub:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_stock_price(self, symbol):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return {"symbol": symbol, "current_price": 100.0}
+
+    async def close(self):
+        pass
+
+
+class FakeCache:
+    def __init__(self, quotes):
+        self.quotes = quotes
+
+    async def mget(self, namespace, keys):
+        return {key: self.quotes[key] for key in keys if key in self.quotes}
+
+    async def get(self, namespace, key):
+        return self.quotes.get(key)
+
+    def set_deferred(self, namespace, key, value):
+        self.quotes[key] = value
+
+
+def test_concurrent_requests_are_coalesced():
+    finnhub = FakeFinnhub()
+    service = QuoteService(finnhub)
+
+    async def run():
+        return await asyncio.gather(
+            *(service.get_stock_price(symbol) for symbol in ["A", "B", "A", "A"])
+        )
+
+    quotes = asyncio.run(run())
+    assert [quote["symbol"] for quote in quotes] == ["A", "B", "A", "A"]
+    assert finnhub.calls == 2
+    assert service.coalesced == 2
+
+
+def test_fetched_quotes_carry_their_fetch_time():
+    wall = FakeClock(1_000.0)
+    cache = FakeCache({})
+    service = QuoteService(FakeFinnhub(), cache=cache, wall_clock=wall)
+    asyncio.run(service.get_stock_price("A"))
+    assert cache.quotes["A"]["timestamp"] == 1_000.0
+
+
+def test_prefetch_keeps_the_cached_quote_age():
+    clock, wall = FakeClock(500.0), FakeClock(1_000.0)
+    cache = FakeCache(
+        {
+            "OLD": {"symbol": "OLD", "timestamp": 1_000.0 - 10},
+            "NEW": {"symbol": "NEW", "timestamp": 1_000.0 - 1},
+        }
+    )
+    service = QuoteService(
+        FakeFinnhub(), freshness=15, clock=clock, cache=cache, wall_clock=wall
+    )
+    asyncio.run(service.prefetch(["OLD", "NEW", "MISSING"]))
+    assert service.peek("OLD") and service.peek("NEW")
+    assert service.peek("MISSING") is None
+
+    # Ten seconds later OLD is 20s old and expired; NEW (11s) is still fresh
+    clock.now += 10
+    wall.now += 10
+    assert service.peek("OLD") is None
+    assert service.peek("NEW")["symbol"] == "NEW"
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from src.utils.rate_limiter import TokenBucket, build_rate_limiters
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+def make_bucket(capacity=10, refill_rate=2.0):
+    clock = FakeClock()
+    return TokenBucket(capacity, refill_rate, clock=clock, sleep=clock.sleep), clock
+
+
+def test_burst_capacity_is_available_immediately():
+    bucket, _ = make_bucket(capacity=10)
+    assert [bucket.reserve() for _ in range(10)] == [0.0] * 10
+    assert bucket.reserve() > 0
+    assert bucket.acquired_total == 11
+
+
+def test_refill_rate_and_cap():
+    bucket, clock = make_bucket(capacity=10, refill_rate=2.0)
+    bucket.reserve(10)
+    clock.now += 1.5
+    assert bucket.available == pytest.approx(3.0)
+    clock.now += 60
+    assert bucket.available == 10  # Never refills beyond capacity
+
+
+def test_reserve_returns_queued_wait_times():
+    bucket, _ = make_bucket(capacity=2, refill_rate=2.0)
+    waits = [bucket.reserve() for _ in range(5)]
+    assert waits == pytest.approx([0.0, 0.0, 0.5, 1.0, 1.5])
+
+
+def test_reserve_rejects_more_than_capacity():
+    bucket, _ = make_bucket(capacity=2)
+    with pytest.raises(ValueError):
+        bucket.reserve(3)
+
+
+def test_acquire_sleeps_only_past_the_budget():
+    bucket, clock = make_bucket(capacity=5, refill_rate=5.0)
+
+    async def run():
+        for _ in range(15):
+            await bucket.acquire()
+
+    asyncio.run(run())
+    assert len(clock.slept) == 10
+    assert clock.now == pytest.approx(2.0)  # 10 extra tokens at 5/s
+
+
+def test_cancelled_acquire_refunds_its_tokens():
+    clock = FakeClock()
+    bucket = TokenBucket(1, 1.0, clock=clock)  # Real asyncio.sleep: waits block
+
+    async def run():
+        await bucket.acquire()
+        waiter = asyncio.ensure_future(bucket.acquire(1))
+        await asyncio.sleep(0)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+
+    asyncio.run(run())
+    assert bucket.acquired_total == 1
+    assert bucket.tokens == pytest.approx(0.0)
+    assert bucket.reserve() == pytest.approx(1.0)  # Not queued behind the cancel
+
+
+def test_build_rate_limiters_converts_per_minute_quotas():
+    limiters = build_rate_limiters({"finnhub": 60, "alpha_vantage": 150})
+    assert limiters["finnhub"].capacity == 60
+    assert limiters["finnhub"].refill_rate == pytest.approx(1.0)
+    assert limiters["alpha_vantage"].refill_rate == pytest.approx(2.5)
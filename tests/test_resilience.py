@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+
+from src.utils.error_handling import ClientError, RateLimitError
+from src.utils.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitOpenError,
+    ResiliencePolicy,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    async def sleep(self, seconds):
+        self.now += seconds
+
+
+def make_policy(**kwargs):
+    clock = FakeClock()
+    policy = ResiliencePolicy(sleep=clock.sleep, clock=clock, rng=lambda: 1.0, **kwargs)
+    return policy, clock
+
+
+def failing(error, times):
+    calls = []
+
+    async def call():
+        calls.append(1)
+        if len(calls) <= times:
+            raise error
+        return "ok"
+
+    return call, calls
+
+
+def test_server_errors_are_retried_with_backoff():
+    policy, clock = make_policy(retries=3)
+    call, calls = failing(Exception("502"), times=2)
+    assert asyncio.run(policy.call("api", call)) == "ok"
+    assert len(calls) == 3
+    assert clock.now == pytest.approx(0.5 + 1.0)
+
+
+def test_client_errors_are_raised_at_once():
+    policy, _ = make_policy(failure_threshold=1)
+    call, calls = failing(ClientError("403", status=403), times=10)
+    with pytest.raises(ClientError):
+        asyncio.run(policy.call("api", call))
+    assert len(calls) == 1
+    assert policy.breaker("api").state == CLOSED  # Provider answered
+
+
+def test_rate_limits_wait_out_retry_after_then_give_up():
+    policy, clock = make_policy(failure_threshold=1, rate_limit_retries=2)
+    call, calls = failing(RateLimitError("429", retry_after=5), times=1)
+    assert asyncio.run(policy.call("api", call)) == "ok"
+    assert clock.now == 5
+
+    call, calls = failing(RateLimitError("429", retry_after=5), times=10)
+    with pytest.raises(RateLimitError):
+        asyncio.run(policy.call("api", call))
+    assert len(calls) == 3
+    assert clock.now == 5 + 10
+    assert policy.breaker("api").state == CLOSED  # Provider answered
+
+
+def test_rate_limits_back_off_without_retry_after_and_skip_long_waits():
+    policy, clock = make_policy(rate_limit_retries=1, max_rate_limit_wait=60)
+    call, calls = failing(RateLimitError("429"), times=1)
+    assert asyncio.run(policy.call("api", call)) == "ok"
+    assert clock.now == pytest.approx(0.5)
+
+    call, calls = failing(RateLimitError("429", retry_after=3600), times=1)
+    with pytest.raises(RateLimitError):
+        asyncio.run(policy.call("api", call))
+    assert len(calls) == 1
+
+
+def test_breaker_opens_and_fails_fast():
+    policy, clock = make_policy(retries=0, failure_threshold=2, reset_timeout=30)
+    call, calls = failing(Exception("down"), times=10)
+    for _ in range(2):
+        with pytest.raises(Exception, match="down"):
+            asyncio.run(policy.call("api", call))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(policy.call("api", call))
+    assert len(calls) == 2
+
+    clock.now += 30
+    call, _ = failing(Exception("down"), times=0)
+    assert asyncio.run(policy.call("api", call)) == "ok"  # Trial call closes it
+    assert policy.breaker("api").state == CLOSED
+
+
+def test_cancelled_trial_call_reopens_the_circuit():
+    policy, clock = make_policy(retries=0, failure_threshold=1, reset_timeout=30)
+    breaker = policy.breaker("api")
+    breaker.record_failure()
+    clock.now += 30
+
+    async def hang():
+        await asyncio.sleep(60)
+
+    async def run():
+        task = asyncio.ensure_future(policy.call("api", hang))
+        await asyncio.sleep(0)
+        assert breaker.state == HALF_OPEN
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert breaker.state == OPEN
+    call, _ = failing(Exception("down"), times=0)
+    assert asyncio.run(policy.call("api", call)) == "ok"  # A new trial goes through
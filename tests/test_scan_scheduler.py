@@ -0,0 +1,113 @@
+import asyncio
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from src.utils.scan_scheduler import (
+    CLOSED,
+    EXTENDED,
+    OPEN_CLOSE,
+    REGULAR,
+    MarketCalendar,
+    ScanScheduler,
+)
+
+NEW_YORK = ZoneInfo("America/New_York")
+UTC = datetime.timezone.utc
+
+
+def at(*args, tz=NEW_YORK):
+    return datetime.datetime(*args, tzinfo=tz)
+
+
+@pytest.mark.parametrize(
+    "moment, phase",
+    [
+        (at(2026, 3, 4, 3, 59, 59), CLOSED),
+        (at(2026, 3, 4, 4, 0), EXTENDED),
+        (at(2026, 3, 4, 9, 29, 59), EXTENDED),
+        (at(2026, 3, 4, 9, 30), OPEN_CLOSE),
+        (at(2026, 3, 4, 9, 59, 59), OPEN_CLOSE),
+        (at(2026, 3, 4, 10, 0), REGULAR),
+        (at(2026, 3, 4, 15, 29, 59), REGULAR),
+        (at(2026, 3, 4, 15, 30), OPEN_CLOSE),
+        (at(2026, 3, 4, 16, 0), EXTENDED),
+        (at(2026, 3, 4, 20, 0), CLOSED),
+        (at(2026, 3, 7, 12, 0), CLOSED),  # Saturday
+        (at(2026, 3, 8, 12, 0), CLOSED),  # Sunday
+        (at(2026, 7, 3, 12, 0), CLOSED),  # Independence Day observed
+        (at(2026, 11, 26, 12, 0), CLOSED),  # Thanksgiving
+    ],
+)
+def test_phase_boundaries(moment, phase):
+    assert MarketCalendar().phase(moment) == phase
+
+
+def test_phases_follow_new_york_wall_clock_across_dst():
+    calendar = MarketCalendar()
+    # 13:30 UTC is 8:30 EST before the March 8 switch and 9:30 EDT after it
+    assert calendar.phase(at(2026, 3, 6, 13, 30, tz=UTC)) == EXTENDED
+    assert calendar.phase(at(2026, 3, 9, 13, 30, tz=UTC)) == OPEN_CLOSE
+    # And back in November: 14:30 UTC is 10:30 EDT, then 9:30 EST
+    assert calendar.phase(at(2026, 10, 30, 14, 30, tz=UTC)) == REGULAR
+    assert calendar.phase(at(2026, 11, 2, 14, 30, tz=UTC)) == OPEN_CLOSE
+
+
+def test_next_session_skips_weekends_holidays_and_keeps_wall_clock_over_dst():
+    calendar = MarketCalendar()
+    start = calendar.next_session_start(at(2026, 3, 6, 20, 0))
+    assert start == at(2026, 3, 9, 4, 0)
+    assert start.utcoffset() == datetime.timedelta(hours=-4)  # EDT by then
+    # Thursday July 2 -> the Friday holiday and weekend -> Monday
+    assert calendar.next_session_start(at(2026, 7, 2, 21, 0)) == at(2026, 7, 6, 4, 0)
+
+
+def test_closed_market_waits_for_the_next_session():
+    calendar = MarketCalendar()
+    friday_close = at(2026, 3, 6, 20, 0)
+    wait = calendar.seconds_until_next_scan(friday_close, friday_close)
+    assert wait == (at(2026, 3, 9, 4, 0) - friday_close).total_seconds()
+
+
+def test_interval_never_sleeps_through_the_open():
+    calendar = MarketCalendar()
+    moment = at(2026, 3, 4, 9, 25)
+    assert calendar.seconds_until_next_scan(moment, moment) == 300  # Not 900
+
+
+class ClosedCalendar(MarketCalendar):
+    """Always closed, with the next session ``wait`` seconds away."""
+
+    def __init__(self, wait):
+        super().__init__()
+        self.wait = wait
+        self.waits = 0
+
+    def phase(self, moment):
+        return CLOSED
+
+    def seconds_until_next_scan(self, moment, started_at):
+        self.waits += 1
+        return self.wait
+
+
+def test_scheduler_built_outside_the_loop_sleeps_and_stops_in_any_loop():
+    scans = []
+
+    async def scan():
+        scans.append(1)
+
+    # Like main.py: built at import time, run later inside asyncio.run()
+    calendar = ClosedCalendar(wait=60)
+    scheduler = ScanScheduler(scan, calendar=calendar)
+
+    async def run_then_stop():
+        asyncio.get_running_loop().call_later(0.05, scheduler.stop)
+        await asyncio.wait_for(scheduler.run(), timeout=1)
+
+    asyncio.run(run_then_stop())
+    scheduler.stop_requested = False
+    asyncio.run(run_then_stop())  # A second loop gets its own Event
+    assert scans == []
+    assert calendar.waits == 2  # One real sleep per run, no busy loop
@@ -0,0 +1,47 @@
+import pytest
+
+pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from src.sentiment import backends  # noqa: E402
+from src.sentiment.backends import (  # noqa: E402
+    BACKENDS,
+    compare_backends,
+    load_sentiment_pipeline,
+    sentiment_backend,
+)
+
+MIN_AGREEMENT = 0.95
+MAX_DRIFT = 0.05
+
+
+def test_config_backend_overrides_environment(monkeypatch):
+    monkeypatch.setattr(backends, "SENTIMENT_BACKEND", "quantized")
+    assert sentiment_backend() == "quantized"
+    assert sentiment_backend({"ai": {}}) == "quantized"
+    assert sentiment_backend({"ai": {"sentiment_backend": "onnx"}}) == "onnx"
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        load_sentiment_pipeline("tensorrt")
+
+
+@pytest.fixture(scope="module")
+def reference():
+    try:
+        return load_sentiment_pipeline("pytorch")
+    except OSError as e:  # Checkpoint not cached and no network
+        pytest.skip(f"Sentiment model unavailable: {e}")
+
+
+@pytest.mark.parametrize("backend", [b for b in BACKENDS if b != "pytorch"])
+def test_backend_matches_fp32_pipeline(reference, backend):
+    try:
+        candidate = load_sentiment_pipeline(backend)
+    except ImportError as e:
+        pytest.skip(str(e))
+
+    parity = compare_backends(reference, candidate)
+    assert parity["label_agreement"] >= MIN_AGREEMENT
+    assert parity["max_score_drift"] <= MAX_DRIFT
@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from src import sharded_scanner
+from src.sharded_scanner import (
+    ShardedScanner,
+    partition,
+    scan_shard,
+    shard_of,
+    shard_rate_limits,
+)
+
+
+class LoopBoundEngine:
+    """Holds a semaphore like the real clients do; using it on another loop fails."""
+
+    def __init__(self, rate_limiters):
+        self.rate_limiters = rate_limiters
+        self.slots = None
+        self.loops = []
+        self.last_scan_stats = {}
+
+    async def run(self, symbols):
+        if self.slots is None:
+            self.slots = asyncio.Semaphore(1)
+        self.loops.append(asyncio.get_running_loop())
+        async with self.slots:
+            await asyncio.sleep(0)
+        return [{"symbol": symbol} for symbol in symbols]
+
+    async def close(self):
+        pass
+
+
+def test_partition_is_stable_and_complete():
+    symbols = [f"SYM{i}" for i in range(100)]
+    shards = partition(symbols, 4)
+    assert sorted(sum(shards, [])) == sorted(symbols)
+    for index, shard in enumerate(shards):
+        assert all(shard_of(symbol, 4) == index for symbol in shard)
+
+
+def test_shard_rate_limits_split_each_quota():
+    limits = shard_rate_limits({"finnhub": 150, "alpha_vantage": 75}, 5)
+    assert limits == {"finnhub": 30, "alpha_vantage": 15}
+    with pytest.raises(ValueError):
+        shard_rate_limits({"alpha_vantage": 75}, 76)
+
+
+def test_workers_are_capped_at_the_smallest_quota():
+    scanner = ShardedScanner(
+        workers=200, rate_limits={"finnhub": 150, "alpha_vantage": 75}, host_count=2
+    )
+    assert scanner.workers == 37
+    assert min(scanner.shard_limits.values()) >= 1
+
+
+def test_worker_engine_reuses_one_event_loop(monkeypatch):
+    monkeypatch.setattr(sharded_scanner, "_worker_engine", None)
+    monkeypatch.setattr(sharded_scanner, "_worker_loop", None)
+    finalizers = []
+    monkeypatch.setattr(
+        sharded_scanner.multiprocessing.util,
+        "Finalize",
+        lambda obj, callback, **kwargs: finalizers.append(callback),
+    )
+
+    for _ in range(3):
+        signals, _ = scan_shard(LoopBoundEngine, {"finnhub": 10}, ["AAPL"])
+        assert signals == [{"symbol": "AAPL"}]
+
+    engine = sharded_scanner._worker_engine
+    assert len(set(engine.loops)) == 1
+    assert finalizers == [sharded_scanner._close_worker]
+    finalizers[0]()
+    asyncio.set_event_loop(None)
+    assert engine.loops[0].is_closed()
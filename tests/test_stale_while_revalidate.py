@@ -0,0 +1,135 @@
+import asyncio
+
+import pytest
+
+from src.utils.stale_while_revalidate import (
+    stale_while_revalidate,
+    staleness_of,
+    with_age,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+clock = FakeClock()
+
+
+class Provider:
+    def __init__(self):
+        self.calls = 0
+        self.failing = False
+
+    @stale_while_revalidate(10, 60, clock=clock, max_entries=3)
+    async def get(self, key):
+        self.calls += 1
+        if self.failing:
+            raise Exception("provider down")
+        return {"key": key, "call": self.calls}
+
+
+class SharedCacheProvider:
+    """Answers from a shared cache whose entries are already ``age`` old."""
+
+    def __init__(self, age):
+        self.age = age
+        self.calls = 0
+
+    @stale_while_revalidate(10, 60, clock=clock)
+    async def get(self, key):
+        self.calls += 1
+        return with_age({"key": key}, self.age)
+
+
+@pytest.fixture(autouse=True)
+def reset_clock():
+    clock.now = 0.0
+
+
+def test_fresh_responses_are_served_from_cache():
+    provider = Provider()
+
+    async def run():
+        first = await provider.get("A")
+        clock.now = 5
+        return first, await provider.get("A")
+
+    first, second = asyncio.run(run())
+    assert first == second == {"key": "A", "call": 1}
+    assert staleness_of(second) == 0
+    assert provider.calls == 1
+
+
+def test_stale_responses_are_served_while_refresh_fails():
+    provider = Provider()
+
+    async def run():
+        await provider.get("A")
+        provider.failing = True
+        clock.now = 25
+        stale = await provider.get("A")
+        await asyncio.sleep(0)  # Let the background refresh fail
+        clock.now = 70
+        with pytest.raises(Exception, match="provider down"):
+            await provider.get("A")  # Past the hard TTL
+        return stale
+
+    stale = asyncio.run(run())
+    assert stale["call"] == 1
+    assert staleness_of(stale) == 15
+    assert provider.calls == 3
+
+
+def test_background_refresh_replaces_stale_entry():
+    provider = Provider()
+
+    async def run():
+        await provider.get("A")
+        clock.now = 15
+        await provider.get("A")
+        await asyncio.sleep(0)
+        return await provider.get("A")
+
+    assert asyncio.run(run())["call"] == 2
+
+
+def test_entries_are_bounded_least_recently_used_first():
+    provider = Provider()
+
+    async def run():
+        for key in "ABC":
+            await provider.get(key)
+        await provider.get("A")  # A is now the most recently used
+        await provider.get("D")  # Evicts B
+        await provider.get("A")
+        await provider.get("B")
+
+    asyncio.run(run())
+    assert len(provider._swr_entries["get"]) == 3
+    assert provider.calls == 5  # A, B, C, D, then B again
+
+
+def test_aged_responses_count_from_their_original_fetch():
+    provider = SharedCacheProvider(age=8)
+
+    async def run():
+        first = await provider.get("A")
+        clock.now = 5  # 13s since the original fetch
+        second = await provider.get("A")
+        await asyncio.sleep(0)
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert staleness_of(first) == 0
+    assert staleness_of(second) == 3
+    assert provider.calls == 2  # Past the soft TTL, so refreshed in the background
+
+
+def test_responses_already_past_the_soft_ttl_are_stale_at_once():
+    provider = SharedCacheProvider(age=25)
+    assert staleness_of(asyncio.run(provider.get("A"))) == 15
@@ -0,0 +1,216 @@
+import asyncio
+import datetime
+
+from src.sentiment.batch_scorer import BatchSentimentScorer
+from src.trade_signal_engine import TradeSignalEngine
+from src.utils.inference_executor import InferenceExecutor
+
+
+def quote(symbol, current, high=100.0):
+    return {
+        "symbol": symbol,
+        "current_price": current,
+        "high_price": high,
+        "low_price": high * 0.9,
+    }
+
+
+def news(headline):
+    return {
+        "headline": headline,
+        "source": "Reuters",
+        "date": datetime.datetime.utcnow(),
+    }
+
+
+def keyword_sentiment(headlines, **kwargs):
+    return [
+        {"label": "POSITIVE", "score": 0.9 if "beats" in headline else 0.1}
+        for headline in headlines
+    ]
+
+
+class FakeFinnhub:
+    def __init__(self, quotes, delays=None):
+        self.quotes = quotes
+        self.delays = delays or {}
+        self.calls = 0
+
+    async def get_stock_price(self, symbol):
+        self.calls += 1
+        await asyncio.sleep(self.delays.get(symbol, 0))
+        return self.quotes[symbol]
+
+    async def close(self):
+        pass
+
+
+class FakeAlphaVantage:
+    """Sweep covering ``swept`` symbols; the rest need their own request."""
+
+    def __init__(self, news_by_symbol, swept=None):
+        self.news_by_symbol = news_by_symbol
+        self.swept = set(news_by_symbol if swept is None else swept)
+        self.symbol_requests = []
+
+    async def sweep_news(self, symbols):
+        news = {
+            symbol: self.news_by_symbol.get(symbol, []) if symbol in self.swept else []
+            for symbol in symbols
+        }
+        return news, set(symbols) - self.swept
+
+    async def get_symbol_news(self, symbol):
+        self.symbol_requests.append(symbol)
+        return self.news_by_symbol.get(symbol, [])
+
+    async def get_news_sentiment(self, symbols):
+        news, missing = await self.sweep_news(symbols)
+        for symbol in missing:
+            news[symbol] = await self.get_symbol_news(symbol)
+        return news
+
+    async def close(self):
+        pass
+
+
+class GatedExecutor:
+    """Inference executor that holds every batch until ``gate`` is set."""
+
+    def __init__(self):
+        self.gate = asyncio.Event()
+
+    async def run(self, func, *args):
+        await self.gate.wait()
+        return func(*args)
+
+
+def make_engine(quotes, news_by_symbol, delays=None, swept=None):
+    engine = TradeSignalEngine(
+        FakeFinnhub(quotes, delays),
+        FakeAlphaVantage(news_by_symbol, swept),
+        inference_executor=InferenceExecutor(max_workers=1),
+    )
+    engine.sentiment_scorer = BatchSentimentScorer(
+        keyword_sentiment, batch_size=2, deduplicator=engine.deduplicator
+    )
+    return engine
+
+
+async def collect(stream):
+    return [signal async for signal in stream]
+
+
+def universe(count):
+    quotes = {f"S{i}": quote(f"S{i}", 99.0 if i % 3 else 80.0) for i in range(count)}
+    news_by_symbol = {
+        symbol: [news(f"{symbol} {'beats' if i % 2 else 'misses'} estimates")]
+        for i, symbol in enumerate(quotes)
+    }
+    return quotes, news_by_symbol
+
+
+def test_batch_scan_runs_without_a_model():
+    engine = make_engine(
+        {
+            "AAA": quote("AAA", 99.0),
+            "BBB": quote("BBB", 80.0),  # Too far below its high
+            "CCC": quote("CCC", 99.0),
+        },
+        {
+            "AAA": [news("AAA beats estimates")],
+            "BBB": [news("BBB beats estimates")],
+            "CCC": [news("CCC misses estimates")],
+        },
+    )
+    try:
+        signals = asyncio.run(engine.run(["AAA", "BBB", "CCC"]))
+    finally:
+        engine.inference_executor.shutdown()
+    assert [signal["symbol"] for signal in signals] == ["AAA"]
+    assert signals[0]["action"] == "BUY"
+
+
+def test_streaming_matches_batch_and_fetches_only_missed_price_passers():
+    quotes, news_by_symbol = universe(30)
+    swept = list(quotes)[::2]
+    engine = make_engine(quotes, news_by_symbol, swept=swept)
+    symbols = list(quotes)
+    try:
+        streamed = asyncio.run(collect(engine.run_streaming(symbols, workers=3)))
+        requested = list(engine.alpha_vantage.symbol_requests)
+        batch = asyncio.run(engine.run(symbols))
+    finally:
+        engine.inference_executor.shutdown()
+
+    key = lambda signal: signal["symbol"]  # noqa: E731
+    assert sorted(streamed, key=key) == sorted(batch, key=key)
+    # Stocks below their high are dropped before their news is looked up
+    assert sorted(requested) == sorted(
+        symbol
+        for symbol in symbols
+        if symbol not in swept and quotes[symbol]["current_price"] > 90
+    )
+
+
+def test_streaming_yields_signals_in_completion_order():
+    quotes, news_by_symbol = universe(6)
+    winners = ["S5", "S1"]  # Both pass the price and sentiment rules
+    delays = {symbol: 0.2 for symbol in quotes}
+    delays.update({"S5": 0.0, "S1": 0.1})
+    engine = make_engine(quotes, news_by_symbol, delays)
+    try:
+        signals = asyncio.run(
+            collect(engine.run_streaming(list(quotes), workers=6, batch_wait=0.0))
+        )
+    finally:
+        engine.inference_executor.shutdown()
+    assert [signal["symbol"] for signal in signals] == winners
+
+
+def test_closing_the_stream_early_stops_every_stage():
+    quotes, news_by_symbol = universe(60)
+    engine = make_engine(quotes, news_by_symbol)
+
+    async def run():
+        stream = engine.run_streaming(list(quotes), workers=2, queue_size=1)
+        first = await stream.__anext__()
+        await stream.aclose()
+        await asyncio.sleep(0.05)
+        others = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        return first, others
+
+    try:
+        first, others = asyncio.run(run())
+    finally:
+        engine.inference_executor.shutdown()
+    assert first["action"] == "BUY"
+    assert others == []
+    assert engine.last_scan_stats["signals"] == 1
+    assert engine.finnhub.finnhub.calls < len(quotes)
+
+
+def test_bounded_queues_hold_back_quote_fetching():
+    quotes, news_by_symbol = universe(200)
+    engine = make_engine(quotes, news_by_symbol)
+    pool = engine.inference_executor
+
+    async def run():
+        executor = engine.inference_executor = GatedExecutor()
+        stream = engine.run_streaming(
+            list(quotes), workers=2, queue_size=1, batch_wait=0.0
+        )
+        consumer = asyncio.ensure_future(collect(stream))
+        await asyncio.sleep(0.1)  # Scoring is stuck; fetching must stall too
+        fetched = engine.finnhub.finnhub.calls
+        executor.gate.set()
+        return fetched, await consumer
+
+    try:
+        fetched, signals = asyncio.run(run())
+    finally:
+        pool.shutdown()
+    # Sentiment batch (2) + news queue and workers + quote queue and workers,
+    # plus the stocks dropped by the price rule along the way
+    assert fetched < 30
+    assert len(signals) == len([s for i, s in enumerate(quotes) if i % 3 and i % 2])
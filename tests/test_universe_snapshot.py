@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.universe_snapshot import (
+    NEWS_STALENESS_HALF_LIFE,
+    QUOTE_STALENESS_HALF_LIFE,
+    SignalRules,
+    UniverseSnapshot,
+)
+from src.utils.stale_while_revalidate import with_staleness
+
+MARKET_DATA = [
+    {"symbol": "AAPL", "current_price": 99, "high_price": 100, "low_price": 95},
+    {"symbol": "MSFT", "current_price": 80, "high_price": 100, "low_price": 75},
+    with_staleness(
+        {"symbol": "TSLA", "current_price": 200, "high_price": 201, "low_price": 190},
+        QUOTE_STALENESS_HALF_LIFE,
+    ),
+    {"symbol": "NVDA", "current_price": None, "high_price": 10, "low_price": 9},
+    None,
+]
+SENTIMENT = {"AAPL": 40, "MSFT": 90, "TSLA": 60, "NVDA": 90}
+
+
+def test_buy_mask_applies_price_and_sentiment_rules():
+    snapshot = UniverseSnapshot.from_market_data(MARKET_DATA, SENTIMENT)
+    assert snapshot.symbols == ["AAPL", "MSFT", "TSLA", "NVDA"]
+    assert SignalRules().buy_mask(snapshot).tolist() == [True, False, True, False]
+
+
+def test_confidence_is_discounted_by_staleness():
+    snapshot = UniverseSnapshot.from_market_data(
+        MARKET_DATA, SENTIMENT, news_staleness={"AAPL": NEWS_STALENESS_HALF_LIFE}
+    )
+    mask = SignalRules().buy_mask(snapshot)
+    # One half-life of stale news for AAPL, one of stale quotes for TSLA
+    assert SignalRules().confidence(snapshot, mask) == pytest.approx([20, 30])
+
+
+def test_evaluate_returns_signal_dicts():
+    snapshot = UniverseSnapshot.from_market_data(MARKET_DATA, SENTIMENT)
+    signals = SignalRules().evaluate(snapshot)
+    assert [signal["symbol"] for signal in signals] == ["AAPL", "TSLA"]
+    assert signals[0]["stop_loss"] == pytest.approx(95 * 0.98)
+    assert np.isnan(snapshot.current[3])
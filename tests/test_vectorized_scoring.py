@@ -0,0 +1,83 @@
+import datetime
+
+import numpy as np
+import pytest
+
+from src.sentiment.vectorized_scoring import VectorizedNewsScorer, match_rows
+
+NOW = datetime.datetime(2024, 6, 3, 15, 30)
+SOURCES = ["Reuters", "Bloomberg", "CNBC", "WSJ", "Yahoo", "Benzinga", ""]
+WORDS = ["shares", "rise", "fall", "guidance", "deal", "Earnings", "earnings", "up"]
+HIGH_RISK = ["SEC investigation", "lawsuit", "fraud"]
+
+
+def reference_score(news_data, sentiments, credible_sources, high_risk_terms):
+    """The per-item Trade Influence loop the vectorized scorer replaced."""
+    scores = []
+    for news, sentiment in zip(news_data, sentiments):
+        headline = news.get("headline") or news.get("title")
+        if not headline:
+            continue
+        if any(term.lower() in headline.lower() for term in high_risk_terms):
+            continue
+        age_days = (NOW - news.get("date", NOW)).days
+        recency = max(0, 1 - age_days / 7)
+        credibility = 1.0 if news.get("source", "") in credible_sources else 0.5
+        impact = 0.8 if "earnings" in headline.lower() else 0.5
+        scores.append(sentiment["score"] * recency * credibility * impact * 100)
+    return round(np.mean(scores), 2) if scores else 0
+
+
+def random_news(rng, symbols, items):
+    news_by_symbol = {symbol: [] for symbol in symbols}
+    sentiments_by_symbol = {symbol: [] for symbol in symbols}
+    for _ in range(items):
+        symbol = symbols[rng.integers(len(symbols))]
+        words = list(rng.choice(WORDS, rng.integers(1, 6)))
+        if rng.random() < 0.02:
+            words.insert(0, rng.choice(HIGH_RISK).upper())
+        news = {"source": SOURCES[rng.integers(len(SOURCES))]}
+        if rng.random() < 0.97:  # Some entries carry no headline at all
+            news["headline" if rng.random() < 0.5 else "title"] = " ".join(words)
+        if rng.random() < 0.9:  # The rest are undated and count as brand new
+            news["date"] = NOW - datetime.timedelta(
+                seconds=int(rng.integers(0, 10 * 86400))
+            )
+        news_by_symbol[symbol].append(news)
+        sentiments_by_symbol[symbol].append({"score": float(rng.random())})
+    return news_by_symbol, sentiments_by_symbol
+
+
+def test_matches_per_item_loop_on_random_news():
+    rng = np.random.default_rng(9)
+    symbols = [f"SYM{i}" for i in range(500)]
+    news_by_symbol, sentiments_by_symbol = random_news(rng, symbols, 60_000)
+    credible = {"Reuters", "Bloomberg", "CNBC"}
+    scorer = VectorizedNewsScorer(credible_sources=credible, high_risk_terms=HIGH_RISK)
+
+    actual = scorer.score(news_by_symbol, sentiments_by_symbol, now=NOW)
+    expected = {
+        symbol: reference_score(
+            news_by_symbol[symbol], sentiments_by_symbol[symbol], credible, HIGH_RISK
+        )
+        for symbol in symbols
+    }
+
+    assert actual.keys() == expected.keys()
+    # Sequential and pairwise sums may round a tie the other way: one cent at most
+    for symbol in symbols:
+        assert actual[symbol] == pytest.approx(expected[symbol], abs=0.01 + 1e-9)
+
+
+def test_symbols_without_news_score_zero():
+    scorer = VectorizedNewsScorer()
+    assert scorer.score({"AAPL": [], "MSFT": []}, {"AAPL": [], "MSFT": []}) == {
+        "AAPL": 0,
+        "MSFT": 0,
+    }
+
+
+def test_match_rows_marks_each_text_once():
+    pattern = VectorizedNewsScorer(high_risk_terms=HIGH_RISK).high_risk_pattern
+    texts = ["Fraud and lawsuit", "clean", "", "sec INVESTIGATION opened"]
+    assert match_rows(pattern, texts).tolist() == [True, False, False, True]